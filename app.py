@@ -2,13 +2,7 @@ import tkinter as tk
 from tkinter import Menu, messagebox, ttk
 from config.styles import StyleManager  
 from config.constants import Constants  
-from widgets.frames import (  
-    ProjectInfoFrame, 
-    OperationalLimitsFrame, 
-    DispatchControlFrame,
-    SystemConfigurationFrame,
-    ActionFrame
-)
+from widgets.assets import shared_assets
 
 class ScrollableFrame(ttk.Frame):
     def __init__(self, container, *args, **kwargs):
@@ -54,8 +48,13 @@ class BatteryModelerApp(tk.Tk):
         self.configure(bg=Constants.BG_COLOR)
         self.minsize(900, 600)
         StyleManager.configure_styles()
+        self.content_ready = False
         self._setup_main_window()
         self._make_responsive()
+        self._preload_images()
+        # Paint the empty shell first; the frames (and customtkinter, PIL and
+        # numpy behind them) are imported and built once it is on screen.
+        self.after_idle(lambda: self.after(Constants.DEFERRED_BUILD_MS, self._build_content))
         
     def _make_responsive(self):
         self.grid_columnconfigure(0, weight=1)
@@ -66,21 +65,40 @@ class BatteryModelerApp(tk.Tk):
         self.scroll_container.pack(fill="both", expand=True, padx=5, pady=5)
         self._create_menu()
         self._create_header()
+        self.loading_label = ttk.Label(
+            self.scroll_container.scrollable_frame, text="Loading...",
+            font=Constants.LABEL_FONT, background=Constants.SECTION_BG
+        )
+        self.loading_label.pack(padx=10, pady=20)
+
+    def _preload_images(self):
+        assets = shared_assets(self)
+        assets.preload(Constants.LOGO_IMAGE)
+        assets.preload(Constants.ICON_IMAGE, Constants.ICON_SIZE)
+        assets.preload(Constants.SUCCESS_IMAGE, Constants.SUCCESS_SIZE)
+        assets.preload(Constants.SYSTEM_IMAGE)
+
+    def _build_content(self):
+        self._create_logo()
         self._create_main_content()
+        from widgets.session import ProjectSession
+
+        self.session = ProjectSession(self)
+        self.session.attach()
+        self.loading_label.destroy()
+        self.content_ready = True
+        self.event_generate("<<ContentReady>>")
         
     def _create_header(self):
-        header_frame = ttk.Frame(self.scroll_container.scrollable_frame, style='Custom.TFrame')
-        header_frame.pack(fill='x', padx=10, pady=5)
-        
-        
-        logo_image = tk.PhotoImage(file="imgs/image.png")  
-        
-        
-        logo_image = logo_image.subsample(1, 1)  
+        self.header_frame = ttk.Frame(self.scroll_container.scrollable_frame, style='Custom.TFrame')
+        self.header_frame.pack(fill='x', padx=10, pady=5)
+
+    def _create_logo(self):
+        logo_image = shared_assets(self).photo(Constants.LOGO_IMAGE)
         
         
         logo_label = ttk.Label(
-            header_frame,
+            self.header_frame,
             image=logo_image,
             background=Constants.SECTION_BG  
         )
@@ -93,6 +111,8 @@ class BatteryModelerApp(tk.Tk):
         file_menu = Menu(menu_bar, tearoff=0)
         file_menu.add_command(label="Open", command=self._on_open)
         file_menu.add_command(label="Save", command=self._on_save)
+        file_menu.add_command(label="Save As...", command=lambda: self._on_save(save_as=True))
+        file_menu.add_command(label="Save With Results...", command=lambda: self._on_save(embed_run=True))
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit)
 
@@ -107,6 +127,13 @@ class BatteryModelerApp(tk.Tk):
         self.config(menu=menu_bar)
         
     def _create_main_content(self):
+        from widgets.frames import (
+            ProjectInfoFrame,
+            OperationalLimitsFrame,
+            DispatchControlFrame,
+            SystemConfigurationFrame,
+            ActionFrame
+        )
 
         self.action_frame = ActionFrame(self.scroll_container.scrollable_frame,padding=10)
         
@@ -124,14 +151,17 @@ class BatteryModelerApp(tk.Tk):
 
         self.action_frame.pack(fill='x', padx=10, pady=5, anchor='w')
 
+        self.action_frame.set_project_info_frame(self.project_info_frame)
         self.action_frame.set_operational_limits_frame(self.operational_limits_frame)
         self.action_frame.set_dispatch_control_frame(self.dispatch_control_frame)
         
     def _on_open(self):
-        messagebox.showinfo("Open", "Open functionality to be implemented")
+        if self.content_ready:
+            self.session.open()
     
-    def _on_save(self):
-        messagebox.showinfo("Save", "Save functionality to be implemented")
+    def _on_save(self, save_as=False, embed_run=False):
+        if self.content_ready:
+            self.session.save(save_as=save_as, embed_run=embed_run)
     
     def _show_docs(self):
         messagebox.showinfo("Documentation", "Documentation to be added")
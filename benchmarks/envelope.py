@@ -0,0 +1,49 @@
+"""Time the Pilot Viewer's data path: envelope build and per-frame window queries on a long series.
+
+Run from anywhere (no display needed): python benchmarks/envelope.py [--samples N] [--pixels P]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.envelope import Envelope
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10_000_000)
+    parser.add_argument("--pixels", type=int, default=1600)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = np.clip(50 + rng.normal(size=args.samples).cumsum() * 0.05, 0, 100)
+
+    began = time.perf_counter()
+    envelope = Envelope(values)
+    print(f"build: {(time.perf_counter() - began) * 1000:.1f} ms for {args.samples:,} samples, {len(envelope.buckets)} levels")
+
+    # A zoom/pan session: window widths spread log-uniformly from the whole run down to 100 samples.
+    widths = np.exp(rng.uniform(np.log(100), np.log(args.samples), args.frames)).astype(int)
+    starts = (rng.random(args.frames) * (args.samples - widths)).astype(int)
+    timings = []
+    points = 0
+    for start, width in zip(starts, widths):
+        began = time.perf_counter()
+        x, low, high = envelope.query(start, start + width, args.pixels)
+        timings.append(time.perf_counter() - began)
+        points = max(points, len(x))
+    timings = np.array(timings) * 1000
+    print(f"query: median {np.median(timings):.3f} ms, p99 {np.percentile(timings, 99):.3f} ms, "
+          f"at most {points} columns for {args.pixels} px")
+    print(f"three series per frame: {1000 / (3 * np.percentile(timings, 99)):,.0f} fps before drawing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Time one fleet run against the same assets simulated one at a time.
+
+Run from anywhere (no display needed): python benchmarks/fleet.py [--assets N] [--days D] [--separate K]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.fleet import Asset, Fleet, simulate_fleet
+from engine.schedule import Schedule, ScheduleRule, Window
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--separate", type=int, default=50, help="assets to time one by one (extrapolated)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    peaks = Schedule(rules=(ScheduleRule(windows=(Window("06:00 AM", "09:00 AM", 90, 300),
+                                                  Window("05:00 PM", "08:00 PM", 20, 300)),
+                                         days=("weekday",)),))
+    assets = []
+    for index in range(args.assets):
+        values = dict(min_soc=float(rng.integers(5, 20)), max_soc=float(rng.integers(80, 95)), initial_soc=50.0,
+                      capacity_kwh=float(rng.integers(500, 4000)), days=args.days)
+        if index % 3 == 1:
+            values.update(steer_enabled=True, start_time="08:00 AM", end_time="04:00 PM",
+                          soc_target=float(rng.integers(20, 90)), power_setpoint=float(rng.integers(50, 400)))
+        elif index % 3 == 2:
+            values.update(steer_enabled=True, schedule=peaks)
+        assets.append(Asset(f"site{index + 1}", DispatchConfig(**values), load_scale=float(rng.uniform(0.2, 2))))
+    fleet = Fleet(assets)
+    steps = fleet.config.steps
+    load_kw = np.outer([asset.load_scale for asset in assets], rng.normal(0, 200, steps))
+    price = rng.uniform(20, 100, steps)
+
+    began = time.perf_counter()
+    result = simulate_fleet(fleet, load_kw, price)
+    elapsed = time.perf_counter() - began
+    print(f"fleet: {elapsed:.2f} s for {args.assets} assets x {steps:,} steps")
+
+    sample = min(args.separate, args.assets)
+    began = time.perf_counter()
+    worst = 0.0
+    for index in range(sample):
+        single = simulate(assets[index].config, load_kw[index], price)
+        worst = max(worst, float(np.abs(single.soc - result.soc[index]).max()))
+    separate = (time.perf_counter() - began) / sample * args.assets
+    print(f"separate runs: {separate:.2f} s (extrapolated from {sample}), {separate / elapsed:.1f}x slower")
+    print(f"largest SoC difference: {worst:.2e} %")
+
+
+if __name__ == "__main__":
+    main()
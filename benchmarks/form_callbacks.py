@@ -0,0 +1,49 @@
+"""Count the form-state work done per keystroke in the Operational Limits entries.
+
+Run from anywhere with a display: python benchmarks/form_callbacks.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from app import BatteryModelerApp
+
+COUNTERS = ("changed", "scheduled", "flush", "parsed", "listener")
+
+
+def main():
+    app = BatteryModelerApp()
+    app.withdraw()
+    app.update()
+    form = app.action_frame.form_state
+    limits = app.operational_limits_frame
+    typed = [
+        ("Min SoC", limits.min_soc_var, "10"),
+        ("Max SoC", limits.max_soc_var, "9x0"),
+        ("Initial SoC", limits.initial_soc_var, "50.5"),
+    ]
+
+    print(f"{'field':<12}{'text':<8}" + "".join(f"{name:>11}" for name in COUNTERS))
+    keystrokes = 0
+    totals = dict.fromkeys(COUNTERS, 0)
+    for label, var, text in typed:
+        for end in range(1, len(text) + 1):
+            form.counters.clear()
+            # An Entry keystroke rewrites its textvariable; the app update runs the idle flush.
+            var.set(var.get() + text[end - 1])
+            app.update()
+            keystrokes += 1
+            counts = [form.counters[name] for name in COUNTERS]
+            for name, count in zip(COUNTERS, counts):
+                totals[name] += count
+            print(f"{label:<12}{var.get():<8}" + "".join(f"{count:>11}" for count in counts))
+
+    print(f"{'per keystroke':<20}" + "".join(f"{totals[name] / keystrokes:>11.2f}" for name in COUNTERS))
+    app.destroy()
+
+
+if __name__ == "__main__":
+    main()
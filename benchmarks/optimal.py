@@ -0,0 +1,49 @@
+"""Time a year of price-optimal dispatch with the rolling-horizon linear program.
+
+Run from anywhere (no display needed): python benchmarks/optimal.py [--days N] [--cold]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import engine.optimal as optimal
+from engine.dispatch import DispatchConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--cold", action="store_true", help="start every window from scratch, for comparison")
+    args = parser.parse_args()
+
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=args.days, optimal=True)
+    steps = np.arange(config.steps)
+    rng = np.random.default_rng(0)
+    hours = steps // 4
+    price = (50 + 30 * np.sin(hours / 24 * 2 * np.pi) + rng.normal(0, 10, hours[-1] + 1)[hours])
+
+    iterations = []
+    solve = optimal.solve_window
+
+    def counted(*args):
+        solution = solve(*args)
+        iterations.append(solution.iterations)
+        return solution
+
+    optimal.solve_window = counted
+    began = time.perf_counter()
+    result = optimal.simulate_optimal(config, price=price, warm_start=not args.cold)
+    elapsed = time.perf_counter() - began
+    print(f"optimal: {elapsed:.2f} s for {config.steps:,} steps in {len(iterations)} windows "
+          f"({np.mean(iterations):.1f} iterations per window, {'cold' if args.cold else 'warm'} starts)")
+    print(f"revenue {result.summary()['revenue']:,.2f}, {result.summary()['equivalent_cycles']:,.1f} cycles")
+
+
+if __name__ == "__main__":
+    main()
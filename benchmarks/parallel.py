@@ -0,0 +1,48 @@
+"""Time a multi-decade run on the serial engine and on the parallel-in-time engine.
+
+Run from anywhere (no display needed): python benchmarks/parallel.py [--years N] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.parallel import simulate_parallel
+from engine.schedule import Schedule, ScheduleRule, Window
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    peaks = Schedule(rules=(ScheduleRule(windows=(Window("06:00 AM", "09:00 AM", 90, 300),
+                                                  Window("05:00 PM", "08:00 PM", 20, 150)),
+                                         days=("weekday",)),))
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, steer_enabled=True, schedule=peaks,
+                            days=365 * args.years)
+    rng = np.random.default_rng(0)
+    steps = np.arange(config.steps)
+    load_kw = rng.normal(0, 60, config.steps) + 60 * np.sin(steps / 96 * 2 * np.pi)
+
+    began = time.perf_counter()
+    serial = simulate(config, load_kw)
+    elapsed = time.perf_counter() - began
+    print(f"serial: {elapsed:.2f} s for {config.steps:,} steps")
+
+    began = time.perf_counter()
+    parallel = simulate_parallel(config, load_kw, max_workers=args.workers)
+    elapsed_parallel = time.perf_counter() - began
+    print(f"parallel ({args.workers} workers): {elapsed_parallel:.2f} s, {elapsed / elapsed_parallel:.1f}x")
+    print(f"largest SoC difference: {np.abs(serial.soc - parallel.soc).max():.2e} %")
+
+
+if __name__ == "__main__":
+    main()
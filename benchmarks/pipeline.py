@@ -0,0 +1,57 @@
+"""Time the report, CSV and viewer envelopes of a stored run: one after another, then in one fan-out pass.
+
+Run from anywhere (no display needed): python benchmarks/pipeline.py [--days N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.envelope import Envelope
+from engine.export import write_csv
+from engine.pipeline import VIEWER_SERIES, export_result
+from engine.report import write_report
+from engine.store import open_result, save_result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=3650)
+    args = parser.parse_args()
+
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=args.days)
+    rng = np.random.default_rng(0)
+    load_kw = rng.normal(0, 40, config.steps)
+    price = 50 + 30 * np.sin(np.arange(config.steps) / config.steps_per_day * 2 * np.pi)
+
+    with tempfile.TemporaryDirectory() as directory:
+        save_result(simulate(config, load_kw, price), os.path.join(directory, "run"))
+        result = open_result(os.path.join(directory, "run"))
+        csv_path, report_path = os.path.join(directory, "results.csv"), os.path.join(directory, "report.txt")
+
+        began = time.perf_counter()
+        write_report(result, report_path)
+        report = time.perf_counter() - began
+        write_csv(result, csv_path)
+        csv = time.perf_counter() - began - report
+        for name in VIEWER_SERIES:
+            Envelope(getattr(result, name))
+        sequential = time.perf_counter() - began
+        print(f"one after another: {sequential:.2f} s (report {report:.2f} s, CSV {csv:.2f} s, "
+              f"envelopes {sequential - report - csv:.2f} s) for {config.steps:,} steps")
+
+        began = time.perf_counter()
+        export_result(result, csv_path, report_path, envelopes=True)
+        single = time.perf_counter() - began
+        print(f"fan-out: {single:.2f} s, {single / csv:.2f}x the CSV alone")
+
+
+if __name__ == "__main__":
+    main()
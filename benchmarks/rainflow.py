@@ -0,0 +1,39 @@
+"""Time rainflow counting and the degradation estimate on a long SoC trace.
+
+Run from anywhere (no display needed): python benchmarks/rainflow.py [--years N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.degradation import rainflow, turning_points
+from engine.dispatch import DispatchConfig, simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=365 * args.years)
+    rng = np.random.default_rng(0)
+    load_kw = rng.normal(0, 150, config.steps) + 150 * np.sin(np.arange(config.steps) / 96 * 2 * np.pi)
+    soc = simulate(config, load_kw).soc
+
+    began = time.perf_counter()
+    counted = rainflow(soc)
+    edges, cycles = counted.histogram()
+    fade = counted.capacity_fade()
+    elapsed = time.perf_counter() - began
+    print(f"rainflow: {elapsed:.3f} s for {config.steps:,} steps ({turning_points(soc).size:,} turning points)")
+    print(f"{counted.cycles:,.1f} cycles, estimated capacity fade {fade:.2f} %")
+
+
+if __name__ == "__main__":
+    main()
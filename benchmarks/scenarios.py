@@ -0,0 +1,41 @@
+"""Time a Monte Carlo scenario run and report its P10/P50/P90 figures.
+
+Run from anywhere (no display needed): python benchmarks/scenarios.py [--scenarios N] [--days D]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.dispatch import DispatchConfig
+from engine.scenarios import simulate_scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, steer_enabled=True, start_time="08:00 AM",
+                            end_time="04:00 PM", soc_target=70, power_setpoint=100, days=args.days)
+    rng = np.random.default_rng(0)
+    load_kw = rng.normal(0, 60, config.steps) + 60 * np.sin(np.arange(config.steps) / 96 * 2 * np.pi)
+    price = rng.uniform(20, 100, config.steps)
+
+    began = time.perf_counter()
+    result = simulate_scenarios(config, load_kw, price, scenarios=args.scenarios)
+    elapsed = time.perf_counter() - began
+    print(f"scenarios: {elapsed:.2f} s for {args.scenarios:,} scenarios x {config.steps:,} steps")
+    for name in ("final_soc", "energy_discharged_kwh", "revenue"):
+        low, mid, high = result.summary()[name]
+        print(f"{name}: P10 {low:,.2f}  P50 {mid:,.2f}  P90 {high:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measure cold-start time to first paint and to an interactive form, plus the import breakdown.
+
+Run from anywhere with a display: python benchmarks/startup.py [--runs N]
+
+Every run is a fresh interpreter so imports are cold each time. "First paint"
+is the first Expose of the main window; "interactive" is the app's
+<<ContentReady>> event once the frames are built and the first form flush has
+run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_once():
+    """Start the app in this process and print its timings as JSON."""
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from app import BatteryModelerApp
+
+    timings = {"import": time.perf_counter() - started}
+    app = BatteryModelerApp()
+    timings["shell"] = time.perf_counter() - started
+
+    def on_expose(event):
+        timings.setdefault("first_paint", time.perf_counter() - started)
+
+    def on_ready(event):
+        app.action_frame.form_state.flush()
+        app.update_idletasks()
+        timings["interactive"] = time.perf_counter() - started
+        app.after(0, app.destroy)
+
+    app.bind("<Expose>", on_expose, add="+")
+    app.bind("<<ContentReady>>", on_ready, add="+")
+    app.mainloop()
+    print(json.dumps(timings))
+
+
+def import_breakdown(limit):
+    """Return the ``limit`` slowest top-level packages behind the shell and the deferred frames, in microseconds."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app, widgets.frames"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    totals = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue
+        package = name.strip().split(".")[0]
+        totals[package] = max(totals.get(package, 0), int(cumulative))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="packages shown in the import breakdown")
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.once:
+        measure_once()
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--once"],
+                                   capture_output=True, text=True, check=True)
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"{'stage':<14}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for stage in ("import", "shell", "first_paint", "interactive"):
+        values = [run[stage] * 1000 for run in runs if stage in run]
+        if values:
+            print(f"{stage:<14}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+    print()
+    print(f"{'package':<24}{'import ms':>14}")
+    for package, micros in import_breakdown(args.top):
+        print(f"{package:<24}{micros / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,4 +17,31 @@ class Constants:
     TITLE_FONT = (FONT_NAME, 16, "bold")
     PAD_X = 10
     PAD_Y = 5
-    ENTRY_WIDTH = 40
\ No newline at end of file
+    ENTRY_WIDTH = 40
+
+    TIME_FORMAT = "%I:%M %p"
+    TIMESTEP_MINUTES = 15
+    STEPS_PER_DAY = 24 * 60 // TIMESTEP_MINUTES
+    SIMULATION_START = "2024-01-01"
+    SIMULATION_DAYS = 365
+    BATTERY_CAPACITY_KWH = 1000.0
+    RUNS_DIR = "runs"
+    CACHE_MEMORY_ENTRIES = 8
+    CACHE_MAX_BYTES = 2 * 1024 ** 3
+    UI_POLL_MS = 50
+    AUTOSAVE_IDLE_MS = 2000
+    DEFERRED_BUILD_MS = 10
+    ASSET_CACHE_ENTRIES = 16
+    LOGO_IMAGE = "imgs/image.png"
+    ICON_IMAGE = "imgs/ico.png"
+    SYSTEM_IMAGE = "imgs/system.png"
+    SUCCESS_IMAGE = "imgs/success.png"
+    ICON_SIZE = (50, 50)
+    SUCCESS_SIZE = (50, 50)
+    VIEWER_SIZE = "800x600"
+    VIEWER_TILE_SIZE = 256
+    VIEWER_TILE_CACHE = 256
+    VIEWER_MAX_ZOOM = 4.0
+    VIEWER_RESIZE_MS = 120
+    PILOT_SIZE = "1000x650"
+    PILOT_FRAME_MS = 33
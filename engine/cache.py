@@ -0,0 +1,147 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from .store import is_result, open_result, save_result
+
+CACHE_VERSION = 1
+HASH_BLOCK_BYTES = 1 << 20
+
+_fingerprints = {}
+
+
+def file_fingerprint(path):
+    """Return a dict identifying the contents of ``path``, or None if it does not exist.
+
+    The content hash is memoised on (path, size, mtime) so an unchanged file is
+    only read once per process.
+    """
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    memo_key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _fingerprints.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(HASH_BLOCK_BYTES), b""):
+                sha.update(block)
+        digest = _fingerprints[memo_key] = sha.hexdigest()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+
+def run_key(config, data_file=None, **extra):
+    """Return the canonical hash of everything that determines a run's output."""
+    payload = {
+        "version": CACHE_VERSION,
+        "config": config.to_dict(),
+        "data_file": file_fingerprint(data_file),
+        "extra": extra,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-tier run cache: an in-memory LRU of opened runs over a size-bounded directory of stored runs.
+
+    Disk entries are result-store directories named by their key; the mtime of
+    their metadata file records the last use and drives eviction.
+    """
+
+    def __init__(self, directory, memory_entries=8, max_bytes=2 * 1024 ** 3):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """Return the cached result for ``key`` or None."""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                return result
+
+            path = self.path_for(key)
+            if not is_result(path):
+                return None
+            try:
+                result = open_result(path)
+            except (OSError, ValueError):
+                shutil.rmtree(path, ignore_errors=True)
+                return None
+            self._touch(key)
+            self._remember(key, result)
+            return result
+
+    def put(self, key, result, extra=None):
+        """Store ``result`` under ``key`` and return its memory-mapped view."""
+        path = save_result(result, self.path_for(key), extra)
+        stored = open_result(path)
+        with self._lock:
+            self._remember(key, stored)
+            self._evict(keep=key)
+        return stored
+
+    def adopt(self, key):
+        """Take in a run that another process saved to ``path_for(key)`` and return its memory-mapped view."""
+        stored = open_result(self.path_for(key))
+        with self._lock:
+            self._remember(key, stored)
+            self._evict(keep=key)
+        return stored
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._memory or is_result(self.path_for(key))
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key):
+        try:
+            os.utime(os.path.join(self.path_for(key), "meta.json"))
+        except OSError:
+            pass
+
+    def _evict(self, keep):
+        """Delete least recently used runs until the directory fits in max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not is_result(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            used = os.stat(os.path.join(path, "meta.json")).st_mtime_ns
+            entries.append((used, name, size))
+            total += size
+
+        for used, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            self._memory.pop(name, None)
+            total -= size
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+DOD_BINS = tuple(range(0, 101, 10))
+CYCLE_LIFE_AT_FULL_DOD = 4000.0
+WOHLER_EXPONENT = 1.5
+END_OF_LIFE_FADE = 20.0
+
+
+@dataclass(eq=False)
+class CycleCount:
+    """Rainflow cycles of a SoC trace: depth (% SoC), mean SoC (%) and count (1 for a full cycle, 0.5 for a half)."""
+    depths: np.ndarray
+    means: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def cycles(self):
+        return float(self.counts.sum())
+
+    def histogram(self, bins=DOD_BINS):
+        """Return the cycles per depth-of-discharge bin (``bins`` are edges in %), as ``(edges, cycles)``."""
+        edges = np.asarray(bins, dtype=float)
+        cycles, _ = np.histogram(np.clip(self.depths, edges[0], edges[-1]), bins=edges, weights=self.counts)
+        return edges, cycles
+
+    def capacity_fade(self, cycle_life=CYCLE_LIFE_AT_FULL_DOD, exponent=WOHLER_EXPONENT,
+                      end_of_life=END_OF_LIFE_FADE):
+        """Return the estimated capacity lost to cycling, in % of nameplate.
+
+        A cycle of depth ``d`` % uses up ``(d / 100) ** exponent / cycle_life``
+        of the battery's life (a Woehler curve through ``cycle_life`` full
+        cycles), the damage adds up over cycles (Miner's rule), and a used-up
+        battery has lost ``end_of_life`` % of its capacity. Calendar ageing is
+        not included.
+        """
+        damage = np.sum(self.counts * (self.depths / 100.0) ** exponent) / cycle_life
+        return float(damage * end_of_life)
+
+
+def turning_points(soc):
+    """Return the local extremes of ``soc`` in order, with its first and last values.
+
+    Repeated values collapse into one, so a flat stretch at a limit is a
+    single point; an extreme is a point where the direction of travel flips.
+    """
+    soc = np.asarray(soc, dtype=float)
+    if soc.size < 2:
+        return soc.copy()
+    keep = np.empty(soc.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(soc[1:], soc[:-1], out=keep[1:])
+    values = soc[keep]
+    if values.size < 3:
+        return values
+    rising = values[1:] > values[:-1]
+    keep = np.ones(values.size, dtype=bool)
+    keep[1:-1] = rising[1:] != rising[:-1]
+    return values[keep]
+
+
+def rainflow(soc):
+    """Count the rainflow cycles of a SoC trace.
+
+    Uses the four-point method on the turning points: a range no larger than
+    both of its neighbours closes a full cycle, and removing its two points
+    leaves the sequence alternating. Every pass removes all such ranges at
+    once (adjacent ones wait for the next pass), so a pass is a handful of
+    array operations and the number of passes grows with the nesting depth
+    of the trace, not its length. The ranges that never close (the residue)
+    are counted as half cycles.
+    """
+    points = turning_points(soc)
+    depths, means = [], []
+    while points.size >= 4:
+        ranges = np.abs(np.diff(points))
+        inner = ranges[1:-1]
+        closed = (inner <= ranges[:-2]) & (inner <= ranges[2:])
+        closed[1:] &= ~closed[:-1]
+        if not closed.any():
+            break
+        first = np.flatnonzero(closed) + 1
+        depths.append(ranges[first])
+        means.append((points[first] + points[first + 1]) / 2)
+        keep = np.ones(points.size, dtype=bool)
+        keep[first] = False
+        keep[first + 1] = False
+        points = points[keep]
+
+    full = np.concatenate(depths) if depths else np.empty(0)
+    half_depths = np.abs(np.diff(points))
+    return CycleCount(
+        depths=np.concatenate([full, half_depths]),
+        means=np.concatenate(means + [(points[1:] + points[:-1]) / 2]),
+        counts=np.concatenate([np.ones(full.size), np.full(half_depths.size, 0.5)]),
+    )
@@ -0,0 +1,412 @@
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from config.constants import Constants
+from .schedule import Schedule, compile_schedule, single_window, window_steps
+
+TRUE_TEXT = {"1", "true", "yes", "y", "on"}
+FALSE_TEXT = {"0", "false", "no", "n", "off", ""}
+
+
+@dataclass(frozen=True)
+class DispatchConfig:
+    """Inputs of a single battery run, in the units used by the form (SoC in %, power in kW).
+
+    With the steer on, ``schedule`` (when set) replaces the single daily window
+    of ``start_time``/``end_time``/``soc_target``/``power_setpoint``. With
+    ``optimal`` on, the steer stays off and the battery is dispatched against
+    the price instead (see ``engine.optimal``).
+    """
+    min_soc: float
+    max_soc: float
+    initial_soc: float
+    steer_enabled: bool = False
+    start_time: str = "12:00 AM"
+    end_time: str = "12:15 AM"
+    soc_target: float = 0.0
+    power_setpoint: float = 0.0
+    capacity_kwh: float = Constants.BATTERY_CAPACITY_KWH
+    start_date: str = Constants.SIMULATION_START
+    days: int = Constants.SIMULATION_DAYS
+    timestep_minutes: int = Constants.TIMESTEP_MINUTES
+    schedule: Schedule = None
+    optimal: bool = False
+
+    @property
+    def steps_per_day(self):
+        return 24 * 60 // self.timestep_minutes
+
+    @property
+    def steps(self):
+        return self.days * self.steps_per_day
+
+    @property
+    def step_hours(self):
+        return self.timestep_minutes / 60
+
+    def validate(self):
+        """Raise ValueError if the configuration cannot be simulated."""
+        if not 0 <= self.min_soc <= self.max_soc <= 100:
+            raise ValueError("SoC limits must satisfy 0 <= Min SoC <= Max SoC <= 100")
+        if not self.min_soc <= self.initial_soc <= self.max_soc:
+            raise ValueError("Initial SoC must be within the Min/Max SoC range")
+        if self.capacity_kwh <= 0:
+            raise ValueError("Battery capacity must be positive")
+        if self.days < 1:
+            raise ValueError("The simulation horizon must be at least one day")
+        if (24 * 60) % self.timestep_minutes:
+            raise ValueError("The timestep must divide a day evenly")
+        if self.optimal and self.steer_enabled:
+            raise ValueError("Optimal dispatch replaces the steer; switch one of them off")
+        if self.steer_enabled and self.schedule is not None:
+            self.schedule.validate(self.timestep_minutes)
+        elif self.steer_enabled:
+            if not 0 <= self.soc_target <= 100:
+                raise ValueError("SoC Target must be between 0 and 100")
+            if self.power_setpoint < 0:
+                raise ValueError("Power Setpoint must not be negative")
+            start, stop = self.steer_window()
+            if stop <= start:
+                raise ValueError("End Time must be after Start Time")
+
+    def steer_window(self):
+        """Return the [start, stop) step indices of the daily steer window."""
+        return window_steps(self.start_time, self.end_time, self.timestep_minutes)
+
+    def active_schedule(self):
+        """Return the Schedule the steer follows: ``schedule`` or the single daily window."""
+        if self.schedule is not None:
+            return self.schedule
+        return single_window(self.start_time, self.end_time, self.soc_target, self.power_setpoint)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Build a config from ``to_dict`` output or a project file, converting each field to its type."""
+        types = {field.name: field.type for field in fields(cls)}
+        unknown = set(values) - set(types)
+        if unknown:
+            raise ValueError(f"Unknown config field(s): {', '.join(sorted(unknown))}")
+        converted = {}
+        for name, value in values.items():
+            if value is None or isinstance(value, types[name]):
+                converted[name] = value
+            elif types[name] is Schedule:
+                converted[name] = Schedule.from_dict(value)
+            elif types[name] is bool:
+                converted[name] = parse_bool(value, name)
+            else:
+                converted[name] = types[name](value)
+        return cls(**converted)
+
+
+def parse_bool(value, field):
+    """Return ``value`` as a bool, reading text such as "false" or "yes" (``TRUE_TEXT``, ``FALSE_TEXT``)."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_TEXT:
+        return True
+    if text in FALSE_TEXT:
+        return False
+    raise ValueError(f"{field} must be true or false, not {value!r}")
+
+
+@dataclass(eq=False)
+class StepInputs:
+    """Per-timestep arrays the integrator consumes.
+
+    ``delta`` is the SoC change (in %) requested on free steps, ``steer`` marks
+    steps inside a steer window, where the battery moves towards ``target`` by at
+    most ``rate`` percent per step.
+    """
+    delta: np.ndarray
+    steer: np.ndarray
+    target: np.ndarray
+    rate: np.ndarray
+
+    def slice(self, start, stop):
+        return StepInputs(
+            delta=self.delta[..., start:stop],
+            steer=self.steer[start:stop],
+            target=self.target[..., start:stop],
+            rate=self.rate[..., start:stop],
+        )
+
+
+@dataclass(eq=False)
+class DispatchResult:
+    """SoC at the end of every step plus the power that produced it (positive = discharge)."""
+    config: DispatchConfig
+    soc: np.ndarray
+    power_kw: np.ndarray
+    setpoint_kw: np.ndarray
+    load_kw: np.ndarray = None
+    price: np.ndarray = None
+
+    @property
+    def steps(self):
+        return self.soc.shape[-1]
+
+    def checkpoints(self, every=None):
+        """Return the SoC entering every ``every``-th step (daily by default), starting with step 0."""
+        every = every or self.config.steps_per_day
+        return np.concatenate(([self.config.initial_soc], self.soc[every - 1:-1:every]))
+
+    def timestamps(self, start=0, stop=None):
+        """Return the timestamps of steps [start, stop) as datetime64 values."""
+        stop = self.steps if stop is None else stop
+        origin = np.datetime64(self.config.start_date, "m")
+        offsets = np.arange(start, stop) * self.config.timestep_minutes
+        return origin + offsets.astype("timedelta64[m]")
+
+    def summary(self):
+        """Return headline figures of the run as a flat dict."""
+        config = self.config
+        dt = config.step_hours
+        power = np.asarray(self.power_kw, dtype=float)
+        soc = np.asarray(self.soc, dtype=float)
+        discharged = float(power[power > 0].sum() * dt)
+        charged = float(abs(power[power < 0].sum()) * dt)
+        tolerance = 1e-9
+        summary = {
+            "final_soc": float(soc[-1]),
+            "mean_soc": float(soc.mean()),
+            "lowest_soc": float(soc.min()),
+            "highest_soc": float(soc.max()),
+            "energy_charged_kwh": charged,
+            "energy_discharged_kwh": discharged,
+            "equivalent_cycles": (charged + discharged) / (2 * config.capacity_kwh),
+            "hours_at_min_soc": float((soc <= config.min_soc + tolerance).sum() * dt),
+            "hours_at_max_soc": float((soc >= config.max_soc - tolerance).sum() * dt),
+        }
+        if self.price is not None:
+            summary["revenue"] = float((power * np.asarray(self.price)).sum() * dt / 1000)
+        return summary
+
+
+def compile_inputs(config, load_kw=None):
+    """Expand a configuration (and optional net load profile) into per-step arrays.
+
+    The steer arrays come from ``compile_schedule`` and are shared read-only.
+    """
+    steps = config.steps
+    to_percent = 100 * config.step_hours / config.capacity_kwh
+
+    if load_kw is None:
+        delta = np.zeros(steps)
+    else:
+        load_kw = np.asarray(load_kw, dtype=float)
+        if load_kw.shape[-1] != steps:
+            raise ValueError(f"Load profile has {load_kw.shape[-1]} steps, expected {steps}")
+        delta = -load_kw * to_percent
+
+    if config.steer_enabled:
+        steer, target, rate = compile_schedule(config.active_schedule(), config.start_date, config.days,
+                                               config.timestep_minutes, config.min_soc, config.max_soc,
+                                               to_percent)
+    else:
+        steer = np.zeros(steps, dtype=bool)
+        target = rate = np.zeros(steps)
+    return StepInputs(delta=delta, steer=steer, target=target, rate=rate)
+
+
+def simulate(config, load_kw=None, price=None, progress=None, on_chunk=None):
+    """Run the dispatch model over the whole horizon of ``config``.
+
+    Outside the steer window the battery serves the net load (positive) or
+    absorbs surplus (negative), clamped to the SoC limits. Inside the window it
+    moves towards the SoC target at the power setpoint. The horizon is integrated
+    one calendar month at a time and ``progress(done_steps, total_steps)`` is
+    called after each month; an exception raised by it aborts the run.
+    ``on_chunk(start, stop, columns)``, when given, receives each month's
+    ``soc``, ``power_kw`` and ``setpoint_kw`` as soon as it is integrated.
+    Optimal dispatch configurations are handed to ``simulate_optimal``.
+    """
+    config.validate()
+    if config.optimal:
+        from .optimal import simulate_optimal
+
+        return simulate_optimal(config, load_kw, price, progress, on_chunk)
+    inputs = compile_inputs(config, load_kw)
+    soc = None
+    for start, stop, part in iter_integrate(inputs, config, month_bounds(config)):
+        if soc is None:
+            soc = np.empty(part.shape[:-1] + (config.steps,))
+        soc[..., start:stop] = part
+        if on_chunk is not None:
+            initial = config.initial_soc if start == 0 else soc[..., start - 1]
+            load = None if load_kw is None else np.asarray(load_kw, dtype=float)[..., start:stop]
+            power_kw, setpoint_kw = step_power(config, inputs.slice(start, stop), part, initial, load)
+            on_chunk(start, stop, {"soc": part, "power_kw": power_kw, "setpoint_kw": setpoint_kw})
+        if progress is not None:
+            progress(stop, config.steps)
+    return build_result(config, inputs, soc, load_kw, price)
+
+
+def iter_integrate(inputs, config, bounds, initial=None):
+    """Integrate consecutive [start, stop) spans, carrying the SoC across, and yield ``(start, stop, soc)``."""
+    state = config.initial_soc if initial is None else initial
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        part = integrate(inputs.slice(start, stop), config.min_soc, config.max_soc, state)
+        state = part[..., -1]
+        yield start, stop, part
+
+
+def month_bounds(config):
+    """Return the step indices where each calendar month of the horizon starts, plus the end."""
+    first_day = np.datetime64(config.start_date, "D")
+    last_day = first_day + config.days - 1
+    months = np.arange(first_day.astype("datetime64[M]") + 1, last_day.astype("datetime64[M]") + 1)
+    days = (months.astype("datetime64[D]") - first_day).astype(int)
+    return [0] + [int(day) * config.steps_per_day for day in days] + [config.steps]
+
+
+def build_result(config, inputs, soc, load_kw=None, price=None):
+    """Derive the power and setpoint series from a SoC trajectory."""
+    power_kw, setpoint_kw = step_power(config, inputs, soc, config.initial_soc, load_kw)
+    return DispatchResult(
+        config=config,
+        soc=soc,
+        power_kw=power_kw,
+        setpoint_kw=setpoint_kw,
+        load_kw=None if load_kw is None else np.asarray(load_kw, dtype=float),
+        price=None if price is None else np.asarray(price, dtype=float),
+    )
+
+
+def step_power(config, inputs, soc, initial, load_kw=None):
+    """Return ``(power_kw, setpoint_kw)`` for a SoC span entered at ``initial``, with ``inputs`` sliced to match."""
+    initial = np.asarray(initial, dtype=float)[..., np.newaxis]
+    previous = np.concatenate((np.broadcast_to(initial, soc.shape[:-1] + (1,)), soc[..., :-1]), axis=-1)
+    from_percent = config.capacity_kwh / (100 * config.step_hours)
+    power_kw = (previous - soc) * from_percent
+    setpoint_kw = np.where(
+        inputs.steer,
+        np.sign(previous - inputs.target) * inputs.rate * from_percent,
+        0.0 if load_kw is None else load_kw,
+    )
+    return power_kw, setpoint_kw
+
+
+def integrate(inputs, lo, hi, initial):
+    """Return the SoC at the end of every step for the given per-step inputs.
+
+    Free steps apply ``soc = clip(soc + delta, lo, hi)``. Such clamped updates
+    compose into another clamped update, so every free stretch is reduced with a
+    vectorised segmented scan. Steer windows have a closed form given the SoC at
+    their start, which leaves only one scalar update per stretch to chain in
+    order. Leading axes of ``delta``/``target``/``rate``/``initial`` (assets,
+    scenarios) are simulated together; ``steer`` is shared across them.
+    """
+    steer = np.asarray(inputs.steer, dtype=bool)
+    steps = steer.shape[-1]
+    shape = np.broadcast_shapes(np.shape(inputs.delta), np.shape(inputs.target),
+                                np.shape(inputs.rate), np.shape(initial) + (1,), (steps,))
+    batch = shape[:-1]
+    lo = _per_batch(lo)
+    hi = _per_batch(hi)
+    delta = np.broadcast_to(inputs.delta, shape)
+    target = np.broadcast_to(inputs.target, shape)
+    rate = np.broadcast_to(inputs.rate, shape)
+    state = np.broadcast_to(np.asarray(initial, dtype=float), batch).copy()
+    soc = np.empty(shape)
+
+    changed = stretch_starts(steer, target, rate)
+    starts = np.flatnonzero(changed)
+    stops = np.append(starts[1:], steps)
+
+    free = np.flatnonzero(~steer)
+    if free.size:
+        reset = changed[free]
+        a, low, high = _scan_clamps(delta[..., free], lo, hi, reset)
+        stretch_of_free = np.cumsum(reset) - 1
+        free_ends = np.append(np.flatnonzero(reset)[1:], free.size) - 1
+
+    before = np.empty(batch + (starts.size,))
+    free_index = 0
+    for index, (start, stop) in enumerate(zip(starts, stops)):
+        before[..., index] = state
+        if steer[start]:
+            reach = (stop - start) * rate[..., start]
+            state = state + np.clip(target[..., start] - state, -reach, reach)
+        else:
+            end = free_ends[free_index]
+            state = np.minimum(np.maximum(state + a[..., end], low[..., end]), high[..., end])
+            free_index += 1
+
+    stretch = np.cumsum(changed) - 1
+    if free.size:
+        origin = before[..., stretch[free]]
+        soc[..., free] = np.minimum(np.maximum(origin + a, low), high)
+    steered = np.flatnonzero(steer)
+    if steered.size:
+        origin = before[..., stretch[steered]]
+        elapsed = steered - starts[stretch[steered]] + 1
+        reach = elapsed * rate[..., steered]
+        soc[..., steered] = origin + np.clip(target[..., steered] - origin, -reach, reach)
+    return soc
+
+
+def stretch_starts(steer, target, rate):
+    """Mark the first step of every stretch.
+
+    Stretches are maximal runs of free steps, and runs of steer steps with a
+    constant target and rate; each one is a single update of the SoC.
+    """
+    steps = steer.shape[-1]
+    changed = np.zeros(steps, dtype=bool)
+    changed[0] = True
+    changed[1:] = steer[1:] != steer[:-1]
+    if steps > 1:
+        moved = (target[..., 1:] != target[..., :-1]) | (rate[..., 1:] != rate[..., :-1])
+        changed[1:] |= steer[1:] & moved.reshape(-1, steps - 1).any(axis=0)
+    return changed
+
+
+def _scan_clamps(delta, lo, hi, reset):
+    """Segmented inclusive scan of the maps ``x -> clip(x + delta, lo, hi)``.
+
+    Returns ``(a, low, high)`` such that applying every map from the last reset
+    up to and including step ``i`` equals ``clip(x + a[i], low[i], high[i])``.
+    """
+    a = np.array(delta, dtype=float)
+    low = np.broadcast_to(lo, a.shape).astype(float)
+    high = np.broadcast_to(hi, a.shape).astype(float)
+    flag = np.array(reset, dtype=bool)
+    n = a.shape[-1]
+    offset = 1
+    while offset < n:
+        keep = flag[offset:]
+        prev_a, prev_low, prev_high = a[..., :-offset], low[..., :-offset], high[..., :-offset]
+        cur_a, cur_low, cur_high = a[..., offset:], low[..., offset:], high[..., offset:]
+        new_a = np.where(keep, cur_a, prev_a + cur_a)
+        new_low = np.where(keep, cur_low, np.minimum(np.maximum(prev_low + cur_a, cur_low), cur_high))
+        new_high = np.where(keep, cur_high, np.minimum(np.maximum(prev_high + cur_a, cur_low), cur_high))
+        a[..., offset:] = new_a
+        low[..., offset:] = new_low
+        high[..., offset:] = new_high
+        flag[offset:] = keep | flag[:-offset]
+        offset *= 2
+    return a, low, high
+
+
+def time_options(start_time, end_time, interval_minutes=Constants.TIMESTEP_MINUTES):
+    """Return the clock times from start_time to end_time inclusive, as shown in the dropdowns."""
+    current = datetime.strptime(start_time, Constants.TIME_FORMAT)
+    end = datetime.strptime(end_time, Constants.TIME_FORMAT)
+    options = []
+    while current <= end:
+        options.append(current.strftime(Constants.TIME_FORMAT))
+        current += timedelta(minutes=interval_minutes)
+    return options
+
+
+def _per_batch(value):
+    """Give per-asset bounds a trailing time axis so they broadcast against (..., steps)."""
+    value = np.asarray(value, dtype=float)
+    return value[..., None] if value.ndim else value
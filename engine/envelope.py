@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+
+BASE_BUCKET = 16
+FANOUT = 4
+
+
+class Envelope:
+    """Min/max pyramid over one series, for drawing any window with about one point per pixel.
+
+    Level 0 keeps ``BASE_BUCKET`` samples per bucket and every level above
+    merges ``FANOUT`` buckets of the one below, so the whole pyramid costs about
+    a sixth of the series. The raw samples are never copied: windows finer
+    than level 0 are sliced straight from ``values``, which may be a memory
+    map, so only the visible stretch is ever paged in.
+
+    ``values`` may be filled in progressively; ``extend(length)`` folds newly
+    valid samples into the pyramid, rebuilding only the buckets they touch.
+    """
+
+    def __init__(self, values, length=None, base=BASE_BUCKET, fanout=FANOUT):
+        self.values = values
+        self.base = base
+        self.fanout = fanout
+        self.length = 0
+        self.buckets = []
+        self.mins = []
+        self.maxs = []
+        size, bucket = len(values), base
+        while True:
+            count = math.ceil(size / bucket)
+            self.buckets.append(bucket)
+            self.mins.append(np.empty(count))
+            self.maxs.append(np.empty(count))
+            if count <= 1:
+                break
+            bucket *= fanout
+        self.extend(len(values) if length is None else length)
+
+    def extend(self, length):
+        """Fold samples ``[self.length, length)`` into the pyramid."""
+        if length <= self.length:
+            return
+        start = self.length
+        source_lo, source_hi, step = self.values, self.values, self.base
+        for bucket, mins, maxs in zip(self.buckets, self.mins, self.maxs):
+            first, last = start // bucket, math.ceil(length / bucket)
+            lo, hi = first * step, min(len(source_lo), math.ceil(length / (bucket // step)))
+            offsets = np.arange(0, hi - lo, step)
+            mins[first:last] = np.minimum.reduceat(source_lo[lo:hi], offsets)
+            maxs[first:last] = np.maximum.reduceat(source_hi[lo:hi], offsets)
+            source_lo, source_hi, step = mins, maxs, self.fanout
+        self.length = length
+
+    def bounds(self):
+        """Return the (min, max) of every valid sample, or None before the first one."""
+        if not self.length:
+            return None
+        return float(self.mins[-1][0]), float(self.maxs[-1][0])
+
+    def query(self, start, stop, pixels):
+        """Return ``(x, low, high)`` covering samples ``[start, stop)`` in at most ``pixels`` columns.
+
+        ``x`` is the sample index each column starts at. When the window holds
+        fewer samples than pixels the raw samples come back with ``low == high``.
+        """
+        start, stop = max(0, int(start)), min(self.length, int(math.ceil(stop)))
+        pixels = max(1, int(pixels))
+        if stop <= start:
+            empty = np.empty(0)
+            return empty, empty, empty
+        per_pixel = (stop - start) / pixels
+        if per_pixel <= 1:
+            x = np.arange(start, stop, dtype=float)
+            values = np.asarray(self.values[start:stop], dtype=float)
+            return x, values, values
+
+        level = None
+        for index, bucket in enumerate(self.buckets):
+            if bucket > per_pixel:
+                break
+            level = index
+        if level is None:
+            bucket = 1
+            lows = highs = self.values
+        else:
+            bucket = self.buckets[level]
+            lows, highs = self.mins[level], self.maxs[level]
+
+        first, last = start // bucket, math.ceil(stop / bucket)
+        edges = np.linspace(start, stop, pixels + 1)[:-1] // bucket
+        offsets = np.unique(edges.astype(np.int64)) - first
+        low = np.minimum.reduceat(np.asarray(lows[first:last], dtype=float), offsets)
+        high = np.maximum.reduceat(np.asarray(highs[first:last], dtype=float), offsets)
+        x = ((offsets + first) * bucket).astype(float)
+        x[0] = start
+        return x, low, high
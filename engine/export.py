@@ -0,0 +1,72 @@
+import numpy as np
+
+CSV_COLUMNS = ("soc", "power_kw", "setpoint_kw", "load_kw", "price")
+BLOCK_ROWS = 8192
+
+
+def csv_columns(result, asset_names=None):
+    """Return ``(name, header)`` pairs for the result arrays that exist.
+
+    Multi-asset results (arrays shaped ``(assets, steps)``) get one column per
+    asset, named ``<asset>_<column>``.
+    """
+    columns = []
+    for name in CSV_COLUMNS:
+        values = getattr(result, name, None)
+        if values is None:
+            continue
+        if np.ndim(values) == 1:
+            columns.append((name, [name]))
+        else:
+            assets = asset_names or [f"asset{index + 1}" for index in range(values.shape[0])]
+            columns.append((name, [f"{asset}_{name}" for asset in assets]))
+    return columns
+
+
+def csv_header(result, asset_names=None):
+    """Return the header line of the CSV of ``result``."""
+    headers = [header for _, names in csv_columns(result, asset_names) for header in names]
+    return ",".join(["timestamp"] + headers) + "\n"
+
+
+def format_csv_block(timestamps, arrays, decimals=4):
+    """Return the CSV text of one block of rows.
+
+    ``arrays`` holds the block of every column in ``csv_columns`` order, each
+    shaped ``(rows,)`` or ``(assets, rows)``. The block is formatted with a
+    single ``%`` operation instead of one format call per cell.
+    """
+    arrays = [np.asarray(values, dtype=float).reshape(-1, len(timestamps)) for values in arrays]
+    width = sum(len(values) for values in arrays)
+    block = np.empty((len(timestamps), width + 1), dtype=object)
+    block[:, 0] = np.datetime_as_string(timestamps, unit="m")
+    if arrays:
+        block[:, 1:] = np.concatenate(arrays).T
+    row_format = "%s" + (f",%.{decimals}f" * width) + "\n"
+    return (row_format * len(timestamps)) % tuple(block.ravel())
+
+
+def iter_csv_blocks(result, block_rows=BLOCK_ROWS, asset_names=None, decimals=4):
+    """Yield ``(rows_written, text)`` for consecutive blocks of CSV rows.
+
+    Only one block of ``block_rows`` timesteps is materialised at a time, so
+    memory stays flat whatever the horizon; with memory-mapped result arrays
+    only that slice is read from disk.
+    """
+    names = [name for name, _ in csv_columns(result, asset_names)]
+    steps = result.steps
+
+    for start in range(0, steps, block_rows):
+        stop = min(start + block_rows, steps)
+        arrays = [getattr(result, name)[..., start:stop] for name in names]
+        yield stop, format_csv_block(result.timestamps(start, stop), arrays, decimals)
+
+
+def write_csv(result, path, progress=None, block_rows=BLOCK_ROWS, asset_names=None):
+    """Stream the per-step results to ``path``; ``progress(done, total)`` is called after every block."""
+    with open(path, "w", newline="") as handle:
+        handle.write(csv_header(result, asset_names))
+        for done, text in iter_csv_blocks(result, block_rows, asset_names):
+            handle.write(text)
+            if progress is not None:
+                progress(done, result.steps)
@@ -0,0 +1,364 @@
+from dataclasses import dataclass, replace
+import csv
+import json
+import os
+
+import numpy as np
+
+from .dispatch import DispatchConfig, DispatchResult, month_bounds, parse_bool
+from .project import LIMIT_FIELDS, DISPATCH_FIELDS, SIMULATION_FIELDS, _resolve
+from .schedule import Schedule, layout, window_index, window_values
+from .timeseries import LOAD_COLUMNS, align, profiles
+
+ASSET_FIELDS = LIMIT_FIELDS + DISPATCH_FIELDS + ("capacity_kwh",)
+LOAD_FIELDS = ("load_column", "load_scale")
+
+
+@dataclass(frozen=True)
+class Asset:
+    """One battery of a fleet: its configuration and which share of the fleet's data file it serves.
+
+    ``load_column`` names the data file column holding this site's net load
+    (the fleet's load column when empty); ``load_scale`` multiplies it.
+    """
+    name: str
+    config: DispatchConfig
+    load_column: str = ""
+    load_scale: float = 1.0
+
+
+@dataclass
+class Fleet:
+    """Assets simulated together on one time base, sharing the project's data file."""
+    assets: list
+    project_name: str = ""
+    data_file: str = ""
+
+    @property
+    def names(self):
+        return [asset.name for asset in self.assets]
+
+    @property
+    def config(self):
+        """The configuration of the first asset, which carries the shared time base."""
+        return self.assets[0].config
+
+    def validate(self):
+        """Raise ValueError if an asset cannot be simulated or the assets do not share a time base."""
+        if not self.assets:
+            raise ValueError("The fleet has no assets")
+        names = self.names
+        if len(set(names)) != len(names):
+            raise ValueError("Asset names must be unique")
+        base = self.config
+        for asset in self.assets:
+            try:
+                asset.config.validate()
+            except ValueError as e:
+                raise ValueError(f"Asset {asset.name}: {e}") from None
+            config = asset.config
+            if config.optimal:
+                raise ValueError(f"Asset {asset.name}: fleet runs do not support optimal dispatch")
+            if (config.start_date, config.days, config.timestep_minutes) != (base.start_date, base.days,
+                                                                               base.timestep_minutes):
+                raise ValueError(f"Asset {asset.name} does not share the fleet's simulation horizon")
+
+
+@dataclass(eq=False)
+class FleetResult(DispatchResult):
+    """Per-asset results shaped ``(assets, steps)``; ``config`` is the shared time base of the first asset.
+
+    The per-step arrays are transposed views of time-major buffers.
+    """
+    names: list = None
+    configs: list = None
+
+    @property
+    def capacities(self):
+        return np.array([config.capacity_kwh for config in self.configs])
+
+    def aggregate(self):
+        """Return the fleet as one battery: capacity-weighted SoC and limits, summed power, load and setpoint.
+
+        The weighted SoC only reaches the weighted limit when every asset is at
+        its own, so the time-at-limit figures of its summary stay meaningful.
+        """
+        capacity = self.capacities
+        total = capacity.sum()
+        weights = capacity / total
+        config = replace(
+            self.config,
+            min_soc=float(weights @ [config.min_soc for config in self.configs]),
+            max_soc=float(weights @ [config.max_soc for config in self.configs]),
+            initial_soc=float(weights @ [config.initial_soc for config in self.configs]),
+            capacity_kwh=float(total),
+            steer_enabled=False,
+            schedule=None,
+        )
+        return DispatchResult(
+            config=config,
+            soc=weights @ np.asarray(self.soc, dtype=float),
+            power_kw=np.asarray(self.power_kw, dtype=float).sum(axis=0),
+            setpoint_kw=np.asarray(self.setpoint_kw, dtype=float).sum(axis=0),
+            load_kw=None if self.load_kw is None else np.asarray(self.load_kw, dtype=float).sum(axis=0),
+            price=self.price,
+        )
+
+    def summary(self):
+        """Return the fleet totals (see ``aggregate``) as a flat dict."""
+        return {"assets": len(self.configs), "capacity_kwh": float(self.capacities.sum()),
+                **self.aggregate().summary()}
+
+    def asset_summaries(self):
+        """Return one summary dict per asset, computed for all assets at once."""
+        columns = self.summary_columns()
+        return [{name: float(values[index]) for name, values in columns.items()}
+                for index in range(len(self.configs))]
+
+    def summary_columns(self):
+        """Return the ``summary`` figures as arrays with one value per asset."""
+        dt = self.config.step_hours
+        capacity = self.capacities
+        min_soc = np.array([config.min_soc for config in self.configs])[:, None]
+        max_soc = np.array([config.max_soc for config in self.configs])[:, None]
+        power = np.asarray(self.power_kw, dtype=float)
+        soc = np.asarray(self.soc, dtype=float)
+        discharged = np.where(power > 0, power, 0).sum(axis=1) * dt
+        charged = -np.where(power < 0, power, 0).sum(axis=1) * dt
+        tolerance = 1e-9
+        columns = {
+            "final_soc": soc[:, -1],
+            "mean_soc": soc.mean(axis=1),
+            "lowest_soc": soc.min(axis=1),
+            "highest_soc": soc.max(axis=1),
+            "energy_charged_kwh": charged,
+            "energy_discharged_kwh": discharged,
+            "equivalent_cycles": (charged + discharged) / (2 * capacity),
+            "hours_at_min_soc": (soc <= min_soc + tolerance).sum(axis=1) * dt,
+            "hours_at_max_soc": (soc >= max_soc - tolerance).sum(axis=1) * dt,
+        }
+        if self.price is not None:
+            price = np.asarray(self.price, dtype=float)
+            revenue = power @ price if price.ndim == 1 else (power * price).sum(axis=1)
+            columns["revenue"] = revenue * dt / 1000
+        return columns
+
+
+def fleet_from_dict(data, base_dir=""):
+    """Build a Fleet from its JSON layout, resolving the data file and asset table against base_dir.
+
+    ``assets`` is either a list of objects or the path of a CSV table with one
+    row per asset. Asset fields are ``ASSET_FIELDS`` plus ``name`` and
+    ``LOAD_FIELDS``; fields an asset leaves out come from ``defaults``, and
+    ``simulation`` is shared by every asset. An asset's ``schedule`` names one
+    of the fleet's ``schedules``.
+    """
+    assets = data.get("assets", [])
+    if isinstance(assets, str):
+        assets = read_asset_table(_resolve(assets, base_dir))
+    defaults = {name: value for name, value in data.get("defaults", {}).items() if value is not None}
+    schedules = {name: Schedule.from_dict(schedule) for name, schedule in data.get("schedules", {}).items()}
+    simulation = {name: value for name, value in data.get("simulation", {}).items() if value is not None}
+    unknown = set(simulation) - set(SIMULATION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown simulation field(s): {', '.join(sorted(unknown))}")
+
+    fleet_assets = []
+    for number, row in enumerate(assets, 1):
+        values = {**defaults, **{name: value for name, value in row.items() if value not in (None, "")}}
+        name = str(values.pop("name", f"asset{number}"))
+        load = {field: values.pop(field) for field in LOAD_FIELDS if field in values}
+        unknown = set(values) - set(ASSET_FIELDS)
+        if unknown:
+            raise ValueError(f"Asset {name}: unknown field(s) {', '.join(sorted(unknown))}")
+        missing = [field for field in LIMIT_FIELDS if field not in values]
+        if missing:
+            raise ValueError(f"Asset {name}: missing field(s) {', '.join(missing)}")
+        for flag in ("steer_enabled", "optimal"):
+            if flag in values:
+                try:
+                    values[flag] = parse_bool(values[flag], flag)
+                except ValueError as e:
+                    raise ValueError(f"Asset {name}: {e}") from None
+        if "schedule" in values:
+            if values["schedule"] not in schedules:
+                raise ValueError(f"Asset {name}: unknown schedule {values['schedule']!r}")
+            values["schedule"] = schedules[values["schedule"]]
+            values.setdefault("steer_enabled", True)
+        fleet_assets.append(Asset(
+            name=name,
+            config=DispatchConfig.from_dict({**values, **simulation}),
+            load_column=str(load.get("load_column", "")),
+            load_scale=float(load.get("load_scale", 1.0)),
+        ))
+    return Fleet(assets=fleet_assets, project_name=data.get("project_name", ""),
+                 data_file=_resolve(data.get("data_file", ""), base_dir))
+
+
+def load_fleet(path):
+    """Read a fleet JSON file."""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    return fleet_from_dict(data, os.path.dirname(os.path.abspath(path)))
+
+
+def read_asset_table(path):
+    """Return the rows of an asset CSV table as dicts of stripped strings (empty cells left out)."""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        return [{name.strip(): value.strip() for name, value in row.items() if name and value and value.strip()}
+                for row in csv.DictReader(handle)]
+
+
+def fleet_profiles(fleet, series):
+    """Return ``(load_kw, price)`` for ``fleet`` from a TimeSeries: load shaped ``(assets, steps)`` or None.
+
+    Each distinct load column is aligned once and shared by the assets that use it.
+    """
+    config = fleet.config
+    shared_load, price = profiles(series, config)
+    if shared_load is None and not any(asset.load_column for asset in fleet.assets):
+        return None, price
+
+    by_name = {name.strip().lower(): name for name in series.columns}
+    aligned = {}
+    load_kw = np.empty((len(fleet.assets), config.steps))
+    for index, asset in enumerate(fleet.assets):
+        column = asset.load_column
+        if not column:
+            if shared_load is None:
+                raise ValueError(f"Asset {asset.name}: {series.path} has no load column "
+                                 f"({', '.join(LOAD_COLUMNS)}); set load_column")
+            load_kw[index] = shared_load * asset.load_scale
+            continue
+        key = by_name.get(column.strip().lower())
+        if key is None:
+            raise ValueError(f"Asset {asset.name}: {series.path} has no column {column!r}")
+        if key not in aligned:
+            aligned[key] = align(series, config, key)
+        load_kw[index] = aligned[key] * asset.load_scale
+    return load_kw, price
+
+
+def simulate_fleet(fleet, load_kw=None, price=None, progress=None):
+    """Simulate every asset of ``fleet`` at once, with assets along the first axis and time along the second.
+
+    ``load_kw`` is shared ``(steps,)`` or per asset ``(assets, steps)``. Each
+    step is one vectorised update across the whole fleet, so the cost grows
+    with the horizon rather than with the number of assets, and every asset
+    keeps its own limits and steer schedule. The step inputs are assembled a
+    month at a time from the (shared, cached) compiled schedules, which keeps
+    memory to the outputs plus one month. ``progress(done_steps, total_steps)``
+    is called after each month, as in ``simulate``.
+    """
+    fleet.validate()
+    configs = [asset.config for asset in fleet.assets]
+    base = fleet.config
+    steps = base.steps
+    count = len(configs)
+    lo = np.array([config.min_soc for config in configs])
+    hi = np.array([config.max_soc for config in configs])
+    state = np.array([config.initial_soc for config in configs])
+    capacity = np.array([config.capacity_kwh for config in configs])
+    to_percent = 100 * base.step_hours / capacity
+    if load_kw is not None:
+        load_kw = np.broadcast_to(np.asarray(load_kw, dtype=float), (count, steps))
+    # Assets whose windows fall on the same steps share one window index. Each asset looks its
+    # targets and setpoints up in its own row of an (assets, 1 + windows) table, column 0 idle.
+    layouts, rows, tables = {}, [], []
+    idle = np.full(steps, -1)
+    for index, config in enumerate(configs):
+        key = None
+        if config.steer_enabled:
+            schedule = config.active_schedule()
+            key = layout(schedule)
+            if key not in layouts:
+                layouts[key] = (len(layouts), window_index(key, config.start_date, config.days,
+                                                           config.timestep_minutes))
+            tables.append(window_values(schedule, config.min_soc, config.max_soc, float(to_percent[index])))
+        else:
+            layouts.setdefault(None, (len(layouts), idle))
+            tables.append((np.zeros(1), np.zeros(1)))
+        rows.append(layouts[key][0])
+    indices = [index for _, index in sorted(layouts.values(), key=lambda entry: entry[0])]
+    width = max(len(targets) for targets, _ in tables)
+    target_table = np.zeros((count, width))
+    rate_table = np.zeros((count, width))
+    for row, (targets, rates) in enumerate(tables):
+        target_table[row, 1:len(targets)] = targets[:-1]
+        rate_table[row, 1:len(rates)] = rates[:-1]
+    from_percent = 1 / to_percent
+    setpoint_table = (rate_table * from_percent[:, None]).ravel()
+    target_table, rate_table = target_table.ravel(), rate_table.ravel()
+    offsets = np.arange(count) * width + 1
+
+    # Time-major (steps, assets) buffers, so every step reads and writes one contiguous row.
+    soc = np.empty((steps, count))
+    power_kw = np.empty((steps, count))
+    setpoint_kw = np.empty((steps, count))
+    bounds = month_bounds(base)
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        window = np.stack([index[start:stop] for index in indices], axis=1)[:, rows]
+        steer = window >= 0
+        cells = window + offsets
+        target = target_table.take(cells)
+        load = np.zeros((stop - start, count)) if load_kw is None else load_kw[:, start:stop].T
+        part = soc[start:stop]
+        _integrate_steps(state, -load * to_percent, steer, target, rate_table.take(cells), lo, hi, out=part)
+
+        previous = np.vstack((state, part[:-1]))
+        power = power_kw[start:stop]
+        np.subtract(previous, part, out=power)
+        power *= from_percent
+        setpoint = setpoint_kw[start:stop]
+        np.subtract(previous, target, out=setpoint)
+        np.sign(setpoint, out=setpoint)
+        setpoint *= setpoint_table.take(cells)
+        np.copyto(setpoint, load, where=~steer)
+        state = part[-1]
+        if progress is not None:
+            progress(stop, steps)
+
+    return FleetResult(
+        config=base,
+        soc=soc.T,
+        power_kw=power_kw.T,
+        setpoint_kw=setpoint_kw.T,
+        load_kw=None if load_kw is None else np.array(load_kw),
+        price=None if price is None else np.asarray(price, dtype=float),
+        names=fleet.names,
+        configs=configs,
+    )
+
+
+def _integrate_steps(state, delta, steer, target, rate, lo, hi, out):
+    """Fill ``out`` with the SoC of every asset after each step, for time-major ``(steps, assets)`` inputs.
+
+    The same updates as ``integrate``, applied one step at a time: free steps
+    clamp ``state + delta`` to the limits, steer steps move towards the target
+    by at most ``rate``. Steps where no asset steers skip the steer branch.
+    """
+    any_steer = steer.any(axis=1)
+    for step in range(len(delta)):
+        row = out[step]
+        np.add(state, delta[step], out=row)
+        np.maximum(row, lo, out=row)
+        np.minimum(row, hi, out=row)
+        if any_steer[step]:
+            move = np.minimum(np.maximum(target[step] - state, -rate[step]), rate[step])
+            np.copyto(row, state + move, where=steer[step])
+        state = row
+
+
+def write_asset_summary(result, path):
+    """Write one row per asset: its limits and capacity, then its summary figures."""
+    summaries = result.asset_summaries()
+    summary_fields = list(summaries[0])
+    config_fields = list(LIMIT_FIELDS) + ["capacity_kwh"]
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["asset"] + config_fields + summary_fields)
+        for name, config, summary in zip(result.names, result.configs, summaries):
+            values = config.to_dict()
+            writer.writerow([name] + [values[field] for field in config_fields]
+                            + [round(summary[field], 4) for field in summary_fields])
+
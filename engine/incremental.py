@@ -0,0 +1,87 @@
+import numpy as np
+
+from .dispatch import build_result, compile_inputs, integrate, simulate, step_power
+
+CONVERGENCE_TOLERANCE = 1e-9
+
+
+def resimulate(previous, config, load_kw=None, price=None, progress=None, on_chunk=None):
+    """Re-run ``config`` reusing as much of ``previous`` as possible.
+
+    Returns ``(result, (start, stop))`` where [start, stop) is the span that was
+    actually recomputed. The run resumes from the last daily checkpoint before
+    the first step whose inputs differ, and stops as soon as the new trajectory
+    meets the old one again after the last differing step: from there on the
+    inputs are identical, so the rest of ``previous`` is reused as is.
+    ``progress`` is called as in ``simulate``. ``on_chunk`` receives the whole
+    horizon in order, as from ``simulate``: the reused steps before the resumed
+    span in one chunk, each recomputed part as it is integrated, then the
+    reused steps after it.
+    """
+    config.validate()
+    old_config = previous.config
+    if (np.ndim(previous.soc) != 1 or old_config.steps != config.steps or config.optimal or old_config.optimal
+            or (old_config.min_soc, old_config.max_soc) != (config.min_soc, config.max_soc)):
+        return simulate(config, load_kw, price, progress, on_chunk), (0, config.steps)
+
+    new = compile_inputs(config, load_kw)
+    old = compile_inputs(old_config, previous.load_kw)
+    differs = np.flatnonzero(_changed_steps(old, new))
+    if differs.size == 0 and old_config.initial_soc == config.initial_soc:
+        soc = np.array(previous.soc, dtype=float)
+        _emit(on_chunk, config, new, soc, load_kw, 0, config.steps)
+        return build_result(config, new, soc, load_kw, price), (0, 0)
+
+    steps_per_day = config.steps_per_day
+    first = 0 if old_config.initial_soc != config.initial_soc else int(differs[0])
+    last = int(differs[-1]) if differs.size else -1
+    day = first // steps_per_day
+    start = day * steps_per_day
+    state = config.initial_soc if day == 0 else previous.checkpoints()[day]
+
+    soc = np.array(previous.soc, dtype=float)
+    _emit(on_chunk, config, new, soc, load_kw, 0, start)
+    position = start
+    length = max(last + 1 - start, 1)
+    length = -(-length // steps_per_day) * steps_per_day
+    while position < config.steps:
+        stop = min(position + length, config.steps)
+        part = integrate(new.slice(position, stop), config.min_soc, config.max_soc, state)
+        settled = max(position, last + 1)
+        if settled < stop:
+            met = np.flatnonzero(np.abs(part[settled - position:] - soc[settled:stop]) <= CONVERGENCE_TOLERANCE)
+            if met.size:
+                stop = settled + int(met[0]) + 1
+                soc[position:stop] = part[:stop - position]
+                _emit(on_chunk, config, new, soc, load_kw, position, stop)
+                break
+        soc[position:stop] = part
+        _emit(on_chunk, config, new, soc, load_kw, position, stop)
+        state = part[-1]
+        position = stop
+        length *= 2
+        if progress is not None:
+            progress(position, config.steps)
+    _emit(on_chunk, config, new, soc, load_kw, stop, config.steps)
+    if progress is not None:
+        progress(config.steps, config.steps)
+    return build_result(config, new, soc, load_kw, price), (start, stop)
+
+
+def _emit(on_chunk, config, inputs, soc, load_kw, start, stop):
+    """Pass steps [start, stop) of ``soc`` to ``on_chunk`` with their power columns, as ``simulate`` does."""
+    if on_chunk is None or stop <= start:
+        return
+    initial = config.initial_soc if start == 0 else soc[start - 1]
+    load = None if load_kw is None else np.asarray(load_kw, dtype=float)[..., start:stop]
+    power_kw, setpoint_kw = step_power(config, inputs.slice(start, stop), soc[start:stop], initial, load)
+    on_chunk(start, stop, {"soc": soc[start:stop], "power_kw": power_kw, "setpoint_kw": setpoint_kw})
+
+
+def _changed_steps(old, new):
+    """Mark the steps whose update differs between two sets of step inputs."""
+    steer_changed = old.steer != new.steer
+    free_changed = ~new.steer & (old.delta != new.delta)
+    window_changed = new.steer & ((old.target != new.target) | (old.rate != new.rate))
+    return steer_changed | free_changed | window_changed
+
@@ -0,0 +1,241 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .dispatch import DispatchResult, StepInputs, integrate
+
+WINDOW_HOURS = 48
+COMMIT_HOURS = 24
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+MAX_WARM_ITERATIONS = 30
+WARM_BARRIER = 3e-2
+
+
+@dataclass(eq=False)
+class WindowSolution:
+    """The optimal scaled powers ``x`` of one window, plus a well-centred iterate to warm-start the next.
+
+    ``start`` is the first iterate ``(x, s, z)`` whose barrier fell below
+    ``WARM_BARRIER``: close to the optimum but still in the interior, which
+    is where an interior-point method can restart from. Slacks and
+    multipliers come in four blocks of one entry per step (power upper and
+    lower bound, SoC lower and upper bound), so the overlap with a later
+    window can be cut out of them.
+    """
+    x: np.ndarray
+    start: tuple
+    scale: float
+    iterations: int
+
+    def shifted(self, offset):
+        """Return the starting point for a window that begins ``offset`` steps into this one."""
+        x, s, z = self.start
+        # Multipliers are in units of the window's price scale; hand them on in price units.
+        return (x[offset:], s.reshape(4, -1)[:, offset:].ravel(),
+                z.reshape(4, -1)[:, offset:].ravel() * self.scale)
+
+
+def solve_window(price, initial, lo, hi, rate, start=None):
+    """Maximise the value of the battery's power over one window.
+
+    Powers are scaled to the power limit, so ``x`` lies in [-1, 1] (positive
+    = discharge) and a step at full power moves the SoC by ``rate`` %. The
+    linear program is
+
+        maximise  price . x
+        subject to  -1 <= x <= 1,  lo <= initial - rate * cumsum(x) <= hi
+
+    and is solved with Mehrotra's predictor-corrector interior-point method.
+    Every constraint touches a single step or a prefix of the window, so in
+    terms of the SoC path ``y = cumsum(x)`` the normal equations are
+    tridiagonal and each Newton step costs a pass down the window and back.
+    ``start`` is an ``(x, s, z)`` starting point for the first steps of the
+    window with ``z`` in price units, typically ``WindowSolution.shifted`` of
+    the previous window; the steps it does not cover start idle.
+    """
+    price = np.asarray(price, dtype=float)
+    n = price.size
+    scale = np.abs(price).max() or 1.0
+    c = -price / scale
+    # Constraint rows, scaled by 1 / rate: x <= 1, -x <= 1, cumsum(x) <= (initial - lo) / rate, -cumsum(x) <= ...
+    h = np.concatenate((np.ones(n), np.ones(n), np.full(n, (initial - lo) / rate), np.full(n, (hi - initial) / rate)))
+
+    if start is None:
+        x, s, z = np.zeros(n), np.maximum(h, 1.0), np.ones(4 * n)
+    else:
+        x, s, z = _pad_start(start, n, scale)
+    centred = None
+    m = 4 * n
+    norm_h = 1 + np.abs(h).max()
+    limit = MAX_ITERATIONS if start is None else MAX_WARM_ITERATIONS
+    for iteration in range(1, limit + 1):
+        r_dual = _transposed(z) + c
+        r_primal = _constraints(x) + s - h
+        mu = s @ z / m
+        if centred is None and mu <= WARM_BARRIER:
+            centred = (x, s, z)
+        if (np.abs(r_primal).max() <= TOLERANCE * norm_h and np.abs(r_dual).max() <= TOLERANCE
+                and s @ z <= TOLERANCE * (1 + abs(c @ x))):
+            break
+        w = z / s
+        weights = w.reshape(4, n)
+        # The normal matrix is D + C'WC for the cumulative-sum matrix C; with dx = diff(dy) it becomes
+        # diff'(D)diff + W, a tridiagonal system in the SoC path.
+        power_weight = weights[0] + weights[1]
+        diagonal = power_weight + weights[2] + weights[3]
+        diagonal[:-1] += power_weight[1:]
+        factor = _factor_tridiagonal(diagonal, -power_weight[1:])
+
+        def newton(r_centre):
+            rhs = -r_dual - _transposed(w * r_primal) + _transposed(r_centre / s)
+            dy = _solve_tridiagonal(factor, rhs - np.append(rhs[1:], 0.0))
+            dx = np.diff(dy, prepend=0.0)
+            ds = -r_primal - _constraints(dx)
+            dz = (-r_centre - z * ds) / s
+            return dx, ds, dz
+
+        # Predictor: the pure Newton step; its reach sets how hard the corrector re-centres.
+        dx, ds, dz = newton(s * z)
+        alpha_primal, alpha_dual = _step_length(s, ds), _step_length(z, dz)
+        mu_affine = (s + alpha_primal * ds) @ (z + alpha_dual * dz) / m
+        sigma = (mu_affine / mu) ** 3
+        dx, ds, dz = newton(s * z + ds * dz - sigma * mu)
+        alpha_primal = min(1.0, 0.99 * _step_length(s, ds, 1 / 0.99))
+        alpha_dual = min(1.0, 0.99 * _step_length(z, dz, 1 / 0.99))
+        x = x + alpha_primal * dx
+        s = s + alpha_primal * ds
+        z = z + alpha_dual * dz
+    else:
+        if start is not None:
+            # A warm start far from the new window's optimum can stall; starting over always converges.
+            return solve_window(price, initial, lo, hi, rate)
+        raise ValueError(f"The dispatch optimisation did not converge within {MAX_ITERATIONS} iterations")
+    return WindowSolution(x=x, start=centred or (x, s, z), scale=scale, iterations=iteration)
+
+
+def simulate_optimal(config, load_kw=None, price=None, progress=None, on_chunk=None,
+                     window_hours=WINDOW_HOURS, commit_hours=COMMIT_HOURS, max_power=None, warm_start=True):
+    """Dispatch the battery against the price with a rolling-horizon linear program.
+
+    Each window of ``window_hours`` is optimised from the SoC the previous
+    windows left, and only its first ``commit_hours`` are kept before the
+    window moves on; the last window keeps everything. The power is limited
+    to ``max_power`` kW (the capacity, i.e. 1C, by default) and the SoC to the
+    Min/Max SoC of the configuration. Unless ``warm_start`` is off, every
+    window starts from the previous one's iterate, shifted by the committed
+    steps, so it mostly has to settle the newly added hours. The net load
+    does not move the optimum, since every kWh the battery supplies saves its
+    price whoever uses it, so it is only kept on the result. ``progress`` and
+    ``on_chunk`` are called per committed span as in ``simulate``.
+    """
+    config.validate()
+    if price is None:
+        raise ValueError("Optimal dispatch needs a price column in the data file")
+    price = np.asarray(price, dtype=float)
+    if price.ndim != 1 or price.shape[-1] != config.steps:
+        raise ValueError(f"Price profile must have {config.steps} steps")
+    max_power = max_power or config.capacity_kwh
+    if max_power <= 0:
+        raise ValueError("The power limit must be positive")
+    steps = config.steps
+    window = max(1, int(round(window_hours * 60 / config.timestep_minutes)))
+    commit = max(1, min(window, int(round(commit_hours * 60 / config.timestep_minutes))))
+    rate = 100 * max_power * config.step_hours / config.capacity_kwh
+    lo, hi = config.min_soc, config.max_soc
+    from_percent = max_power / rate
+    # The solver stops within its tolerance of the optimum, so a SoC that should sit on a limit
+    # can end up a hair inside it; anything that close is put on the limit.
+    snap = TOLERANCE * rate
+    soc = np.empty(steps)
+    setpoint = np.empty(steps)
+    state = config.initial_soc
+    solution = None
+    start = 0
+    while start < steps:
+        stop = min(start + window, steps)
+        kept = stop if stop == steps else start + commit
+        warm = solution.shifted(commit) if warm_start and solution is not None else None
+        solution = solve_window(price[start:stop], state, lo, hi, rate, warm)
+        planned = np.clip(solution.x[:kept - start], -1.0, 1.0)
+        inputs = StepInputs(delta=-rate * planned, steer=np.zeros(kept - start, dtype=bool), target=0.0, rate=0.0)
+        part = integrate(inputs, lo, hi, state)
+        part[part <= lo + snap] = lo
+        part[part >= hi - snap] = hi
+        soc[start:kept] = part
+        setpoint[start:kept] = planned * max_power
+        if on_chunk is not None:
+            previous = np.concatenate(([state], part[:-1]))
+            on_chunk(start, kept, {"soc": part, "power_kw": (previous - part) * from_percent,
+                                   "setpoint_kw": setpoint[start:kept]})
+        state = part[-1]
+        start = kept
+        if progress is not None:
+            progress(start, steps)
+
+    previous = np.concatenate(([config.initial_soc], soc[:-1]))
+    return DispatchResult(
+        config=config,
+        soc=soc,
+        power_kw=(previous - soc) * from_percent,
+        setpoint_kw=setpoint,
+        load_kw=None if load_kw is None else np.asarray(load_kw, dtype=float),
+        price=price,
+    )
+
+
+def _constraints(x):
+    """Return the left-hand sides of the window's constraint rows for the scaled powers ``x``."""
+    prefix = np.cumsum(x)
+    return np.concatenate((x, -x, prefix, -prefix))
+
+
+def _transposed(y):
+    """Return the constraint matrix's transpose applied to ``y``, one entry per constraint row."""
+    upper, lower, low_soc, high_soc = y.reshape(4, -1)
+    return upper - lower + np.cumsum((low_soc - high_soc)[::-1])[::-1]
+
+
+def _pad_start(start, n, scale):
+    """Extend a warm start over the ``n`` steps of a window: idle powers, unit slacks, multipliers at its barrier."""
+    x, s, z = start
+    kept = min(len(x), n)
+    s, z = s.reshape(4, -1)[:, :kept], z.reshape(4, -1)[:, :kept] / scale
+    padded_x = np.zeros(n)
+    padded_x[:kept] = x[:kept]
+    padded_s = np.ones((4, n))
+    padded_s[:, :kept] = s
+    padded_z = np.full((4, n), float(np.mean(s * z)))
+    padded_z[:, :kept] = z
+    return padded_x, padded_s.ravel(), padded_z.ravel()
+
+
+def _factor_tridiagonal(diagonal, off):
+    """Return the LDL' factors of the symmetric tridiagonal matrix with ``diagonal`` and ``off`` (super)diagonal."""
+    pivots = diagonal.tolist()
+    multipliers = off.tolist()
+    for index, value in enumerate(multipliers):
+        multipliers[index] = value / pivots[index]
+        pivots[index + 1] -= multipliers[index] * value
+    return pivots, multipliers
+
+
+def _solve_tridiagonal(factor, rhs):
+    """Solve with the factors of ``_factor_tridiagonal``: one sweep down the window and one back up."""
+    pivots, multipliers = factor
+    values = rhs.tolist()
+    for index, multiplier in enumerate(multipliers):
+        values[index + 1] -= multiplier * values[index]
+    values[-1] /= pivots[-1]
+    for index in range(len(multipliers) - 1, -1, -1):
+        values[index] = values[index] / pivots[index] - multipliers[index] * values[index + 1]
+    return np.array(values)
+
+
+def _step_length(values, steps, limit=1.0):
+    """Return the largest ``alpha <= limit`` that keeps ``values + alpha * steps`` non-negative."""
+    falling = steps < 0
+    if not falling.any():
+        return limit
+    with np.errstate(over="ignore"):
+        return min(limit, float(np.min(values[falling] / -steps[falling])))
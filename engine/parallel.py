@@ -0,0 +1,171 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
+
+import numpy as np
+
+from .dispatch import build_result, compile_inputs, iter_integrate, month_bounds, simulate, stretch_starts, _scan_clamps
+
+MIN_CHUNK_STEPS = 100_000
+
+_worker_state = {}
+
+
+class TransferFunction:
+    """The end-of-span SoC as a function of the SoC entering it, kept exactly as knots.
+
+    Every update of the model is a non-decreasing piecewise-linear map with
+    slopes 0 and 1 (a clamp, or a rate-limited move towards a target), and so
+    is any composition of them. ``xs``/``ys`` are the knots of that map over
+    ``[lo, hi]``; pushing the knots through an update only needs new knots
+    where the update has a kink, so a month of updates stays a handful of
+    knots however many steps it holds. Transfer functions compose like the
+    updates they stand for, which is what lets spans be reduced independently
+    and chained afterwards.
+    """
+
+    def __init__(self, lo, hi):
+        self.xs = np.array([lo, hi], dtype=float)
+        self.ys = self.xs.copy()
+
+    def __call__(self, soc):
+        return float(np.interp(soc, self.xs, self.ys))
+
+    def clamp(self, a, low, high):
+        """Follow with ``soc -> clip(soc + a, low, high)``."""
+        self._split(low - a, high - a)
+        self.ys = np.minimum(np.maximum(self.ys + a, low), high)
+        self._simplify()
+
+    def steer(self, target, reach):
+        """Follow with a move of at most ``reach`` towards ``target``."""
+        self._split(target - reach, target + reach)
+        self.ys = self.ys + np.clip(target - self.ys, -reach, reach)
+        self._simplify()
+
+    def _split(self, *kinks):
+        """Add a knot wherever the map reaches one of the ``kinks`` values inside a rising segment."""
+        for kink in kinks:
+            index = int(np.searchsorted(self.ys, kink))
+            if 0 < index < len(self.ys) and self.ys[index - 1] < kink < self.ys[index]:
+                x = self.xs[index - 1] + (kink - self.ys[index - 1])
+                self.xs = np.insert(self.xs, index, x)
+                self.ys = np.insert(self.ys, index, kink)
+
+    def _simplify(self):
+        """Drop knots between two segments of the same slope (0 or 1, so rounding cannot blur them)."""
+        rising = np.diff(self.ys) > 0.5 * np.diff(self.xs)
+        keep = np.ones(len(self.xs), dtype=bool)
+        keep[1:-1] = rising[:-1] != rising[1:]
+        self.xs, self.ys = self.xs[keep], self.ys[keep]
+
+
+def span_transfer(inputs, lo, hi, transfer=None):
+    """Extend ``transfer`` (identity over ``[lo, hi]`` when None) with the updates of ``inputs``.
+
+    The stretches are the ones ``integrate`` uses: free stretches are reduced
+    with the same segmented scan and steer stretches with the same closed form,
+    only applied to knots instead of to one SoC value.
+    """
+    transfer = transfer or TransferFunction(lo, hi)
+    steer = np.asarray(inputs.steer, dtype=bool)
+    steps = steer.shape[-1]
+    target = np.broadcast_to(inputs.target, (steps,))
+    rate = np.broadcast_to(inputs.rate, (steps,))
+    changed = stretch_starts(steer, target, rate)
+    starts = np.flatnonzero(changed)
+    stops = np.append(starts[1:], steps)
+
+    free = np.flatnonzero(~steer)
+    if free.size:
+        reset = changed[free]
+        a, low, high = _scan_clamps(np.broadcast_to(inputs.delta, (steps,))[free], lo, hi, reset)
+        free_ends = iter(np.append(np.flatnonzero(reset)[1:], free.size) - 1)
+    for start, stop in zip(starts, stops):
+        if steer[start]:
+            transfer.steer(target[start], (stop - start) * rate[start])
+        else:
+            end = next(free_ends)
+            transfer.clamp(a[end], low[end], high[end])
+    return transfer
+
+
+def simulate_parallel(config, load_kw=None, price=None, progress=None, max_workers=None, chunks=None):
+    """Run ``config`` like ``simulate``, splitting the horizon across a process pool.
+
+    The horizon is cut into ``chunks`` runs of whole months (two per worker by
+    default). Each worker first reduces its chunks to transfer functions; a
+    prefix scan over those gives the exact SoC entering every chunk, and the
+    workers then integrate their chunks month by month from it, exactly as
+    the serial engine does. Results agree with ``simulate`` to rounding
+    (1e-9 % at most). Horizons shorter than ``MIN_CHUNK_STEPS`` per chunk,
+    batched inputs, optimal dispatch and single-worker machines run serially
+    instead.
+    ``progress(done_steps, total_steps)`` is called as chunks are integrated.
+    """
+    config.validate()
+    max_workers = max_workers or os.cpu_count() or 1
+    bounds = month_bounds(config)
+    months = len(bounds) - 1
+    chunks = chunks or max_workers * 2
+    chunks = min(chunks, months, max(1, config.steps // MIN_CHUNK_STEPS))
+    if chunks < 2 or max_workers < 2 or config.optimal or (load_kw is not None and np.ndim(load_kw) > 1):
+        return simulate(config, load_kw, price, progress)
+
+    edges = [bounds[int(round(months * index / chunks))] for index in range(chunks + 1)]
+    spans = list(zip(edges[:-1], edges[1:]))
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(max_workers, chunks), mp_context=context,
+                             initializer=_init_worker, initargs=(config, load_kw)) as executor:
+        transfers = list(executor.map(_chunk_transfer, spans))
+
+        # Prefix scan: the SoC entering each chunk is the previous chunk's transfer of its own entry.
+        entries = [config.initial_soc]
+        for xs, ys in transfers[:-1]:
+            entries.append(float(np.interp(entries[-1], xs, ys)))
+
+        soc = np.empty(config.steps)
+        futures = {executor.submit(_chunk_soc, span, entry): span for span, entry in zip(spans, entries)}
+        done = 0
+        try:
+            for future in as_completed(futures):
+                start, stop = futures[future]
+                soc[start:stop] = future.result()
+                done += stop - start
+                if progress is not None:
+                    progress(done, config.steps)
+        finally:
+            for future in futures:
+                future.cancel()
+    return build_result(config, compile_inputs(config, load_kw), soc, load_kw, price)
+
+
+def _init_worker(config, load_kw):
+    _worker_state["config"] = config
+    _worker_state["inputs"] = compile_inputs(config, load_kw)
+    _worker_state["bounds"] = month_bounds(config)
+
+
+def _months(span):
+    start, stop = span
+    return [bound for bound in _worker_state["bounds"] if start <= bound <= stop]
+
+
+def _chunk_transfer(span):
+    """Return the knots of a chunk's transfer function, composed month by month."""
+    config, inputs = _worker_state["config"], _worker_state["inputs"]
+    transfer = TransferFunction(config.min_soc, config.max_soc)
+    months = _months(span)
+    for start, stop in zip(months[:-1], months[1:]):
+        span_transfer(inputs.slice(start, stop), config.min_soc, config.max_soc, transfer)
+    return transfer.xs, transfer.ys
+
+
+def _chunk_soc(span, entry):
+    """Integrate one chunk from the SoC entering it, with the serial engine's month boundaries."""
+    config, inputs = _worker_state["config"], _worker_state["inputs"]
+    months = _months(span)
+    offset = months[0]
+    local = inputs.slice(offset, months[-1])
+    parts = [part for _, _, part in iter_integrate(local, config, [bound - offset for bound in months], entry)]
+    return np.concatenate(parts)
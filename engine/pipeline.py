@@ -0,0 +1,177 @@
+import queue
+import threading
+
+import numpy as np
+
+from .envelope import Envelope
+from .export import BLOCK_ROWS, CSV_COLUMNS, csv_columns, csv_header, format_csv_block
+from .report import RunStatistics, write_report
+
+QUEUE_BLOCKS = 4
+VIEWER_SERIES = ("soc", "power_kw", "setpoint_kw")
+
+_DONE = object()
+
+
+class Consumer:
+    """One output fed by ``fan_out``: it sees every block of the result once, in order.
+
+    ``consume`` runs on the consumer's own thread, ``finish`` once every block
+    went through (its return value is the consumer's output) and ``close``
+    always, last, even when the export failed or was cancelled.
+    """
+
+    def consume(self, start, stop, columns):
+        raise NotImplementedError
+
+    def finish(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class CsvConsumer(Consumer):
+    """Writes the per-step CSV of ``write_csv`` from the blocks it is handed."""
+
+    def __init__(self, result, path, asset_names=None):
+        self.result = result
+        self.path = path
+        self.names = [name for name, _ in csv_columns(result, asset_names)]
+        self.handle = open(path, "w", newline="")
+        self.handle.write(csv_header(result, asset_names))
+
+    def consume(self, start, stop, columns):
+        arrays = [columns[name] for name in self.names]
+        self.handle.write(format_csv_block(self.result.timestamps(start, stop), arrays))
+
+    def finish(self):
+        self.handle.close()
+        return self.path
+
+    def close(self):
+        self.handle.close()
+
+
+class ReportConsumer(Consumer):
+    """Gathers the ``RunStatistics`` of the run and writes the run report from them."""
+
+    def __init__(self, result, path, project_name=""):
+        self.result = result
+        self.path = path
+        self.project_name = project_name
+        self.statistics = RunStatistics(result.config, result.price is not None)
+
+    def consume(self, start, stop, columns):
+        self.statistics.add(start, stop, columns["soc"], columns["power_kw"], columns.get("price"))
+
+    def finish(self):
+        write_report(self.result, self.path, self.project_name, self.statistics)
+        return self.statistics
+
+
+class EnvelopeConsumer(Consumer):
+    """Builds the Pilot Viewer's min/max pyramids, one ``Envelope`` per plotted series.
+
+    The envelopes index the result's own arrays, so each block is folded in
+    from the pages the pipeline has just read.
+    """
+
+    def __init__(self, result, series=VIEWER_SERIES):
+        self.envelopes = {name: Envelope(getattr(result, name), length=0) for name in series
+                          if getattr(result, name, None) is not None and np.ndim(getattr(result, name)) == 1}
+
+    def consume(self, start, stop, columns):
+        for envelope in self.envelopes.values():
+            envelope.extend(stop)
+
+    def finish(self):
+        return self.envelopes
+
+
+def fan_out(result, consumers, progress=None, block_rows=BLOCK_ROWS, queue_blocks=QUEUE_BLOCKS):
+    """Read ``result`` once, ``block_rows`` steps at a time, and hand every block to all ``consumers``.
+
+    ``consumers`` maps a name to a ``Consumer``; the outputs of their
+    ``finish`` come back under the same names. Each consumer runs on its own
+    thread behind a queue of at most ``queue_blocks`` blocks, so the reader
+    waits for the slowest consumer instead of running ahead of it, and at
+    most a few blocks per consumer are in memory whatever the horizon. The
+    result arrays may be memory maps; each slice is paged in once and shared.
+    ``progress(done, total)`` is called after every block has been queued;
+    an exception raised by it (or by a consumer) stops the export and
+    is raised here once all consumer threads have ended.
+    """
+    failed = threading.Event()
+    errors = {}
+    queues = {name: queue.Queue(maxsize=queue_blocks) for name in consumers}
+
+    def work(name, consumer):
+        blocks = queues[name]
+        while True:
+            block = blocks.get()
+            if block is _DONE:
+                break
+            if failed.is_set():
+                continue
+            try:
+                consumer.consume(*block)
+            except Exception as e:
+                errors[name] = e
+                failed.set()
+
+    threads = [threading.Thread(target=work, args=item, daemon=True) for item in consumers.items()]
+    for thread in threads:
+        thread.start()
+    names = [name for name in CSV_COLUMNS if getattr(result, name, None) is not None]
+    steps = result.steps
+    try:
+        try:
+            for start in range(0, steps, block_rows):
+                if failed.is_set():
+                    break
+                stop = min(start + block_rows, steps)
+                columns = {name: np.asarray(getattr(result, name)[..., start:stop], dtype=float) for name in names}
+                for blocks in queues.values():
+                    blocks.put((start, stop, columns))
+                if progress is not None:
+                    progress(stop, steps)
+        except BaseException:
+            failed.set()
+            raise
+        finally:
+            for blocks in queues.values():
+                blocks.put(_DONE)
+            for thread in threads:
+                thread.join()
+        # Only reached when the reader got through; an exception of its own (a cancel) is never replaced.
+        if errors:
+            raise next(iter(errors.values()))
+        outputs = {name: consumer.finish() for name, consumer in consumers.items()}
+    finally:
+        for consumer in consumers.values():
+            consumer.close()
+    return outputs
+
+
+def export_result(result, csv_path=None, report_path=None, project_name="", envelopes=False, progress=None,
+                  block_rows=BLOCK_ROWS):
+    """Write the CSV and report of a single-battery run and build its viewer envelopes in one pass.
+
+    Any of the three can be left out. Returns the outputs by name: ``csv``
+    (the path), ``report`` (its ``RunStatistics``) and ``envelopes`` (the
+    ``Envelope`` of each plotted series, for ``PilotViewer.show_result``).
+    """
+    consumers = {}
+    try:
+        if csv_path:
+            consumers["csv"] = CsvConsumer(result, csv_path)
+        if report_path:
+            consumers["report"] = ReportConsumer(result, report_path, project_name)
+        if envelopes:
+            consumers["envelopes"] = EnvelopeConsumer(result)
+    except BaseException:
+        for consumer in consumers.values():
+            consumer.close()
+        raise
+    return fan_out(result, consumers, progress, block_rows)
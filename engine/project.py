@@ -0,0 +1,176 @@
+from dataclasses import dataclass
+import json
+import os
+import shutil
+import tempfile
+
+from .dispatch import DispatchConfig
+from .schedule import Schedule
+
+LIMIT_FIELDS = ("min_soc", "max_soc", "initial_soc")
+DISPATCH_FIELDS = ("steer_enabled", "start_time", "end_time", "soc_target", "power_setpoint", "schedule", "optimal")
+SIMULATION_FIELDS = ("start_date", "days", "timestep_minutes", "capacity_kwh")
+
+
+@dataclass
+class Project:
+    """Everything the input frames hold: project info plus the run configuration."""
+    config: DispatchConfig
+    project_name: str = ""
+    data_file: str = ""
+
+
+def project_from_dict(data, base_dir=""):
+    """Build a Project from the JSON layout, resolving data_file against base_dir."""
+    values = {}
+    for section, names in (("operational_limits", LIMIT_FIELDS),
+                           ("dispatch_control", DISPATCH_FIELDS),
+                           ("simulation", SIMULATION_FIELDS)):
+        section_values = {name: value for name, value in data.get(section, {}).items() if value is not None}
+        unknown = set(section_values) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown {section} field(s): {', '.join(sorted(unknown))}")
+        values.update(section_values)
+
+    missing = [name for name in LIMIT_FIELDS if name not in values]
+    if missing:
+        raise ValueError(f"Missing operational_limits field(s): {', '.join(missing)}")
+
+    data_file = _resolve(data.get("data_file", ""), base_dir)
+    return Project(config=DispatchConfig.from_dict(values), project_name=data.get("project_name", ""),
+                   data_file=data_file)
+
+
+def project_to_dict(project):
+    """Return the JSON layout of a Project."""
+    return form_to_dict(project.project_name, project.data_file, project.config.to_dict())
+
+
+def form_to_dict(project_name, data_file, values, run=None):
+    """Return the JSON layout for form values that may be incomplete; unset fields are stored as null.
+
+    ``run`` references a stored result of these inputs (see ``run_reference``).
+    """
+    data = {
+        "project_name": project_name,
+        "data_file": data_file,
+        "operational_limits": {name: values.get(name) for name in LIMIT_FIELDS},
+        "dispatch_control": {name: values.get(name) for name in DISPATCH_FIELDS if name != "schedule"},
+        "simulation": {name: values.get(name) for name in SIMULATION_FIELDS if values.get(name) is not None},
+    }
+    schedule = values.get("schedule")
+    if schedule is not None:
+        data["dispatch_control"]["schedule"] = schedule.to_dict() if isinstance(schedule, Schedule) else schedule
+    if run:
+        data["run"] = run
+    return data
+
+
+def form_from_dict(data, base_dir=""):
+    """Return ``(project_name, data_file, values, run)`` from the JSON layout without requiring every field.
+
+    Relative paths (``data_file`` and the run's ``path``) are resolved against base_dir
+    and a ``schedule`` comes back as a Schedule.
+    """
+    values = {}
+    for section in ("operational_limits", "dispatch_control", "simulation"):
+        values.update(data.get(section, {}))
+    if values.get("schedule") is not None:
+        values["schedule"] = Schedule.from_dict(values["schedule"])
+    data_file = _resolve(data.get("data_file", ""), base_dir)
+    run = dict(data["run"]) if data.get("run") else None
+    if run:
+        run["path"] = _resolve(run.get("path", ""), base_dir)
+    return data.get("project_name", ""), data_file, values, run
+
+
+def run_reference(store_path, data_file=""):
+    """Describe a stored run for the ``run`` section, with the data file's size and mtime at the time it ran."""
+    run = {"path": os.path.abspath(store_path)}
+    if data_file and os.path.isfile(data_file):
+        stat = os.stat(data_file)
+        run["data_file"] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return run
+
+
+def run_is_current(run, data_file=""):
+    """True when a referenced run still exists and its data file has not changed since."""
+    if not run or not os.path.isfile(os.path.join(run.get("path", ""), "meta.json")):
+        return False
+    recorded = run.get("data_file")
+    if not data_file:
+        return recorded is None
+    try:
+        stat = os.stat(data_file)
+    except OSError:
+        return False
+    return recorded == {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def save_project(data, path, embed_run=False):
+    """Write a project layout to ``path`` atomically; paths are stored relative to it where possible.
+
+    With ``embed_run`` the referenced run store is copied next to the project
+    as ``<name>_run`` so the project can be moved together with its results.
+    """
+    path = os.path.abspath(path)
+    base_dir = os.path.dirname(path)
+    data = dict(data)
+    run = data.get("run")
+    if run:
+        run = dict(run)
+        if embed_run:
+            target = os.path.join(base_dir, f"{os.path.splitext(os.path.basename(path))[0]}_run")
+            if os.path.abspath(run["path"]) != target:
+                staging = tempfile.mkdtemp(prefix=".tmp-", dir=base_dir)
+                try:
+                    shutil.copytree(run["path"], staging, dirs_exist_ok=True)
+                    if os.path.exists(target):
+                        shutil.rmtree(target)
+                    os.replace(staging, target)
+                except BaseException:
+                    shutil.rmtree(staging, ignore_errors=True)
+                    raise
+            run["path"] = target
+        run["path"] = _relative(run["path"], base_dir)
+        data["run"] = run
+    if data.get("data_file"):
+        data["data_file"] = _relative(data["data_file"], base_dir)
+
+    handle = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=base_dir, prefix=".tmp-",
+                                         suffix=".json", delete=False)
+    try:
+        with handle:
+            json.dump(data, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(handle.name, path)
+    except BaseException:
+        if os.path.exists(handle.name):
+            os.remove(handle.name)
+        raise
+    return path
+
+
+def read_project(path):
+    """Read a project file's JSON layout."""
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def load_project(path):
+    """Read a project JSON file."""
+    return project_from_dict(read_project(path), os.path.dirname(os.path.abspath(path)))
+
+
+def _resolve(path, base_dir):
+    if path and base_dir and not os.path.isabs(path):
+        return os.path.join(base_dir, path)
+    return path
+
+
+def _relative(path, base_dir):
+    """Return ``path`` relative to base_dir when it lies inside it, else absolute."""
+    path = os.path.abspath(path)
+    relative = os.path.relpath(path, base_dir)
+    return path if relative.startswith(os.pardir) else relative
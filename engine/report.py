@@ -0,0 +1,266 @@
+import numpy as np
+
+from .degradation import rainflow, turning_points
+from .export import BLOCK_ROWS
+from .scenarios import PERCENTILES
+
+REPORT_LABELS = {
+    "final_soc": ("Final SoC", "%"),
+    "mean_soc": ("Mean SoC", "%"),
+    "lowest_soc": ("Lowest SoC", "%"),
+    "highest_soc": ("Highest SoC", "%"),
+    "energy_charged_kwh": ("Energy charged", "kWh"),
+    "energy_discharged_kwh": ("Energy discharged", "kWh"),
+    "equivalent_cycles": ("Equivalent full cycles", ""),
+    "hours_at_min_soc": ("Time at Min SoC", "h"),
+    "hours_at_max_soc": ("Time at Max SoC", "h"),
+    "revenue": ("Revenue", ""),
+    "assets": ("Assets", ""),
+    "capacity_kwh": ("Fleet capacity", "kWh"),
+}
+ASSET_COLUMNS = ("final_soc", "equivalent_cycles", "energy_discharged_kwh", "revenue")
+MONTHLY_COLUMNS = (
+    ("energy_discharged_kwh", "Discharged (kWh)"),
+    ("energy_charged_kwh", "Charged (kWh)"),
+    ("lowest_soc", "Lowest SoC (%)"),
+    ("highest_soc", "Highest SoC (%)"),
+    ("revenue", "Revenue"),
+)
+
+
+class RunStatistics:
+    """Headline figures, per-day totals and rainflow turning points of a run, gathered one block at a time.
+
+    Feeding consecutive blocks of ``soc``, ``power_kw`` and ``price`` through
+    ``add`` gives the figures of ``DispatchResult.summary`` and the cycles of
+    ``rainflow`` on the whole run while keeping only one value per day and
+    the SoC's turning points, so a run never has to be in memory at once.
+    """
+
+    def __init__(self, config, priced=False):
+        self.config = config
+        self.priced = priced
+        days = config.days
+        self.charged = np.zeros(days)
+        self.discharged = np.zeros(days)
+        self.revenue = np.zeros(days)
+        self.lowest = np.full(days, np.inf)
+        self.highest = np.full(days, -np.inf)
+        self.steps = 0
+        self.soc_total = 0.0
+        self.at_min = 0
+        self.at_max = 0
+        self.final_soc = None
+        self._points = []
+        self._tail = np.empty(0)
+
+    @classmethod
+    def of(cls, result, block_rows=BLOCK_ROWS):
+        """Return the statistics of a whole single-battery result, read ``block_rows`` steps at a time."""
+        statistics = cls(result.config, result.price is not None)
+        for start in range(0, result.steps, block_rows):
+            stop = min(start + block_rows, result.steps)
+            statistics.add(start, stop, result.soc[start:stop], result.power_kw[start:stop],
+                           None if result.price is None else result.price[start:stop])
+        return statistics
+
+    def add(self, start, stop, soc, power_kw, price=None):
+        """Fold in steps ``[start, stop)``; blocks must arrive in order."""
+        if stop <= start:
+            return
+        config = self.config
+        dt = config.step_hours
+        soc = np.asarray(soc, dtype=float)
+        power = np.asarray(power_kw, dtype=float)
+        per_day = config.steps_per_day
+        # Offsets of the block's first step and of every midnight inside it.
+        offsets = np.concatenate(([0], np.arange(per_day - start % per_day, stop - start, per_day)))
+        days = slice(start // per_day, start // per_day + offsets.size)
+        self.discharged[days] += np.add.reduceat(np.where(power > 0, power, 0.0), offsets) * dt
+        self.charged[days] -= np.add.reduceat(np.where(power < 0, power, 0.0), offsets) * dt
+        if price is not None:
+            self.revenue[days] += np.add.reduceat(power * np.asarray(price, dtype=float), offsets) * dt / 1000
+        np.minimum(self.lowest[days], np.minimum.reduceat(soc, offsets), out=self.lowest[days])
+        np.maximum(self.highest[days], np.maximum.reduceat(soc, offsets), out=self.highest[days])
+
+        tolerance = 1e-9
+        self.steps += stop - start
+        self.soc_total += float(soc.sum())
+        self.at_min += int((soc <= config.min_soc + tolerance).sum())
+        self.at_max += int((soc >= config.max_soc - tolerance).sum())
+        self.final_soc = float(soc[-1])
+        # Every turning point but the last two is final; those two are re-examined with the next block.
+        points = turning_points(np.concatenate((self._tail, soc)))
+        self._points.append(points[:-2])
+        self._tail = points[-2:]
+
+    def summary(self):
+        """Return the same headline figures as ``DispatchResult.summary``."""
+        config = self.config
+        charged, discharged = float(self.charged.sum()), float(self.discharged.sum())
+        summary = {
+            "final_soc": self.final_soc,
+            "mean_soc": self.soc_total / self.steps,
+            "lowest_soc": float(self.lowest.min()),
+            "highest_soc": float(self.highest.max()),
+            "energy_charged_kwh": charged,
+            "energy_discharged_kwh": discharged,
+            "equivalent_cycles": (charged + discharged) / (2 * config.capacity_kwh),
+            "hours_at_min_soc": self.at_min * config.step_hours,
+            "hours_at_max_soc": self.at_max * config.step_hours,
+        }
+        if self.priced:
+            summary["revenue"] = float(self.revenue.sum())
+        return summary
+
+    def daily(self):
+        """Return the per-day figures as arrays, one entry per day of the horizon."""
+        daily = {
+            "energy_discharged_kwh": self.discharged,
+            "energy_charged_kwh": self.charged,
+            "lowest_soc": self.lowest,
+            "highest_soc": self.highest,
+        }
+        if self.priced:
+            daily["revenue"] = self.revenue
+        return daily
+
+    def monthly(self):
+        """Return ``(month, figures)`` per calendar month of the horizon, ``month`` as ``YYYY-MM``."""
+        months = (np.datetime64(self.config.start_date, "D") + np.arange(self.config.days)).astype("datetime64[M]")
+        first = np.flatnonzero(np.concatenate(([True], months[1:] != months[:-1])))
+        reducers = {"lowest_soc": np.minimum, "highest_soc": np.maximum}
+        totals = {name: reducers.get(name, np.add).reduceat(values, first) for name, values in self.daily().items()}
+        return [(str(month), {name: float(values[index]) for name, values in totals.items()})
+                for index, month in enumerate(months[first])]
+
+    def cycles(self):
+        """Return the rainflow ``CycleCount`` of the SoC seen so far."""
+        return rainflow(np.concatenate(self._points + [self._tail]))
+
+
+def format_report(result, project_name="", statistics=None):
+    """Return the plain-text run report.
+
+    The figures come from ``statistics`` (a ``RunStatistics`` of the run)
+    when given, so a caller that already streamed the run does not read it
+    again; otherwise they are gathered from ``result`` block by block.
+    """
+    config = result.config
+    lines = ["Battery System Modeler - Run Report", ""]
+    if project_name:
+        lines.append(f"Project: {project_name}")
+    lines.append(f"Horizon: {config.days} days from {config.start_date} "
+                 f"at {config.timestep_minutes}-minute steps")
+    lines.append(f"SoC limits: {config.min_soc:g}% - {config.max_soc:g}% (initial {config.initial_soc:g}%)")
+    if config.steer_enabled and config.schedule is not None:
+        lines.append(f"Steer schedule: {len(config.schedule.rules)} rule(s), "
+                     f"{len(config.schedule.holidays)} holiday(s)")
+        for number, rule in enumerate(config.schedule.rules, 1):
+            months = ", ".join(str(month) for month in rule.months) or "all year"
+            windows = "; ".join(f"{window.start_time} - {window.end_time} to {window.soc_target:g}% "
+                                f"at {window.power_setpoint:g} kW" for window in rule.windows) or "idle"
+            lines.append(f"  {rule.name or number}: {', '.join(rule.days)} ({months}): {windows}")
+    elif config.optimal:
+        lines.append("Dispatch: price-optimal (rolling linear program)")
+    elif config.steer_enabled:
+        lines.append(f"Daily steer: {config.start_time} - {config.end_time}, "
+                     f"target {config.soc_target:g}% at {config.power_setpoint:g} kW")
+    else:
+        lines.append("Daily steer: off")
+    lines.append("")
+
+    statistics = statistics or RunStatistics.of(result)
+    for name, value in statistics.summary().items():
+        label, unit = REPORT_LABELS.get(name, (name, ""))
+        lines.append(f"{label + ':':<28}{value:,.2f} {unit}".rstrip())
+    lines.append("")
+    lines.extend(format_monthly(statistics.monthly()))
+    lines.append("")
+    lines.extend(format_cycling(statistics.cycles()))
+    return "\n".join(lines) + "\n"
+
+
+def format_monthly(months):
+    """Return the report lines of the per-month table from ``RunStatistics.monthly``."""
+    columns = [(name, heading) for name, heading in MONTHLY_COLUMNS if name in months[0][1]]
+    lines = ["Monthly:", f"{'Month':<10}" + "".join(f"{heading:>18}" for _, heading in columns)]
+    for month, figures in months:
+        lines.append(f"{month:<10}" + "".join(f"{figures[name]:>18,.2f}" for name, _ in columns))
+    return lines
+
+
+def format_cycling(counted):
+    """Return the report lines on rainflow cycles (a ``CycleCount``) by depth of discharge and the capacity fade."""
+    lines = [
+        "Cycling (rainflow):",
+        f"{'Cycles:':<28}{counted.cycles:,.1f}",
+        f"{'Estimated capacity fade:':<28}{counted.capacity_fade():,.2f} %",
+        "Cycles by depth of discharge:",
+    ]
+    edges, cycles = counted.histogram()
+    for low, high, count in zip(edges[:-1], edges[1:], cycles):
+        lines.append(f"{f'  {low:g}-{high:g}%:':<28}{count:,.1f}")
+    return lines
+
+
+def format_fleet_report(result, project_name=""):
+    """Return the plain-text report of a fleet run: fleet totals, then one line per asset."""
+    config = result.config
+    lines = ["Battery System Modeler - Fleet Report", ""]
+    if project_name:
+        lines.append(f"Project: {project_name}")
+    lines.append(f"Horizon: {config.days} days from {config.start_date} "
+                 f"at {config.timestep_minutes}-minute steps")
+    lines.append("")
+    lines.append("Fleet totals (SoC weighted by capacity):")
+    for name, value in result.summary().items():
+        label, unit = REPORT_LABELS.get(name, (name, ""))
+        text = f"{value:,}" if isinstance(value, int) else f"{value:,.2f}"
+        lines.append(f"{label + ':':<28}{text} {unit}".rstrip())
+    lines.append("")
+
+    summaries = result.asset_summaries()
+    columns = [name for name in ASSET_COLUMNS if name in summaries[0]]
+    width = max(len("Asset"), *(len(name) for name in result.names))
+    headers = [REPORT_LABELS[name][0] for name in columns]
+    lines.append(f"{'Asset':<{width}}" + "".join(f"{header:>24}" for header in headers))
+    for name, summary in zip(result.names, summaries):
+        lines.append(f"{name:<{width}}" + "".join(f"{summary[column]:>24,.2f}" for column in columns))
+    return "\n".join(lines) + "\n"
+
+
+def format_scenario_report(result, project_name=""):
+    """Return the plain-text report of a scenario run: P10/P50/P90 of every summary figure across scenarios."""
+    config = result.config
+    lines = ["Battery System Modeler - Scenario Report", ""]
+    if project_name:
+        lines.append(f"Project: {project_name}")
+    lines.append(f"Horizon: {config.days} days from {config.start_date} "
+                 f"at {config.timestep_minutes}-minute steps")
+    lines.append(f"SoC limits: {config.min_soc:g}% - {config.max_soc:g}% (initial {config.initial_soc:g}%)")
+    lines.append(f"Scenarios: {result.scenarios:,} (seed {result.seed})")
+    lines.append("Perturbation (standard deviations): " + ", ".join(
+        f"{name} {value:g}" for name, value in result.perturbation.to_dict().items()))
+    lines.append("")
+
+    lines.append(f"{'':<28}" + "".join(f"{f'P{percentile}':>16}" for percentile in PERCENTILES))
+    for name, values in result.summary().items():
+        label, unit = REPORT_LABELS.get(name, (name, ""))
+        lines.append(f"{label + ':':<28}" + "".join(f"{value:>16,.2f}" for value in values) + f" {unit}".rstrip())
+    return "\n".join(lines) + "\n"
+
+
+def write_report(result, path, project_name="", statistics=None):
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(format_report(result, project_name, statistics))
+
+
+def write_fleet_report(result, path, project_name=""):
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(format_fleet_report(result, project_name))
+
+
+def write_scenario_report(result, path, project_name=""):
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(format_scenario_report(result, project_name))
@@ -0,0 +1,130 @@
+import queue
+import threading
+import time
+
+PROGRESS_INTERVAL = 0.05
+
+
+class RunCancelled(Exception):
+    """Raised inside a worker when its run has been cancelled."""
+
+
+class RunEvent:
+    """One message from a worker to the UI: kind is 'stage', 'progress', 'done', 'error', 'cancelled' or a custom kind."""
+
+    __slots__ = ("kind", "payload", "time")
+
+    def __init__(self, kind, payload=None):
+        self.kind = kind
+        self.payload = payload
+        self.time = time.monotonic()
+
+    def __repr__(self):
+        return f"RunEvent({self.kind!r}, {self.payload!r})"
+
+
+class Reporter:
+    """Handed to the worker function; the only way it talks to the outside world."""
+
+    def __init__(self, controller):
+        self._controller = controller
+        self._last_progress = 0.0
+
+    def stage(self, name):
+        self.check()
+        self._controller.post("stage", name)
+
+    def progress(self, done, total):
+        """Report progress, rate-limited to one event per PROGRESS_INTERVAL; raises RunCancelled when cancelled."""
+        self.check()
+        now = time.monotonic()
+        if done >= total or now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            self._controller.post("progress", (done, total))
+
+    def post(self, kind, payload=None):
+        self.check()
+        self._controller.post(kind, payload)
+
+    def check(self):
+        if self._controller.cancelled:
+            raise RunCancelled()
+
+
+class RunController:
+    """Runs one job on a worker thread and queues its events for the UI thread.
+
+    The worker never touches widgets: it calls ``target(reporter, *args)`` and
+    everything it wants shown goes through the queue. The UI thread calls
+    ``drain()`` from a timer (``after`` in Tk) and applies the events itself.
+    """
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self._cancel = threading.Event()
+        self._ended = threading.Event()
+        self._thread = None
+        self.started = None
+        self.stage = None
+        self.fraction = 0.0
+
+    @property
+    def running(self):
+        # Ended is set before the final event is posted, so the UI never sees a run as still going after it.
+        return self._thread is not None and not self._ended.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def start(self, target, *args):
+        if self.running:
+            raise RuntimeError("A run is already in progress")
+        self._cancel.clear()
+        self._ended.clear()
+        self.started = time.monotonic()
+        self.stage = None
+        self.fraction = 0.0
+        self._thread = threading.Thread(target=self._work, args=(target, args), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def post(self, kind, payload=None):
+        self.events.put(RunEvent(kind, payload))
+
+    def drain(self, limit=100):
+        """Return up to ``limit`` pending events, updating stage and fraction on the way."""
+        events = []
+        while len(events) < limit:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event.kind == "stage":
+                self.stage = event.payload
+            elif event.kind == "progress":
+                done, total = event.payload
+                self.fraction = done / total if total else 1.0
+            events.append(event)
+        return events
+
+    def eta(self):
+        """Seconds left at the current rate, or None before the first progress report."""
+        if not self.started or self.fraction <= 0:
+            return None
+        elapsed = time.monotonic() - self.started
+        return elapsed * (1 - self.fraction) / self.fraction
+
+    def _work(self, target, args):
+        try:
+            result = target(Reporter(self), *args)
+        except RunCancelled:
+            kind, payload = "cancelled", None
+        except Exception as e:
+            kind, payload = "error", e
+        else:
+            kind, payload = ("cancelled", None) if self.cancelled else ("done", result)
+        self._ended.set()
+        self.post(kind, payload)
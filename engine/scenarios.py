@@ -0,0 +1,159 @@
+from dataclasses import dataclass, asdict
+import tempfile
+
+import numpy as np
+
+from .export import BLOCK_ROWS
+from .fleet import Asset, Fleet, simulate_fleet
+
+PERCENTILES = (10, 50, 90)
+BAND_NAMES = ("soc", "energy_discharged_kwh")
+CHUNK_BYTES = 256 << 20
+ARRAYS_PER_SCENARIO = 10
+
+
+@dataclass(frozen=True)
+class Perturbation:
+    """How far scenarios stray from the input profiles, as standard deviations relative to them.
+
+    Load is scaled by one factor per scenario (``load_scale``) and one per
+    day (``load_daily``), then gets independent noise per step (``load_noise``,
+    relative to the mean absolute load). Price is scaled by log-normal factors
+    per day (``price_daily``) and per step (``price_noise``).
+    """
+    load_scale: float = 0.05
+    load_daily: float = 0.10
+    load_noise: float = 0.05
+    price_daily: float = 0.15
+    price_noise: float = 0.05
+
+    def validate(self):
+        if min(asdict(self).values()) < 0:
+            raise ValueError("Perturbation standard deviations must not be negative")
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(eq=False)
+class ScenarioResult:
+    """Percentile bands over many perturbed runs of one configuration.
+
+    ``bands[name]`` is shaped ``(len(PERCENTILES), steps)`` for the per-step
+    quantities in ``BAND_NAMES``; ``totals[name]`` holds one value per
+    scenario for every figure of ``DispatchResult.summary``.
+    """
+    config: object
+    scenarios: int
+    seed: int
+    perturbation: Perturbation
+    bands: dict
+    totals: dict
+
+    @property
+    def steps(self):
+        return self.config.steps
+
+    def band(self, name, percentile):
+        return self.bands[name][PERCENTILES.index(percentile)]
+
+    def timestamps(self, start=0, stop=None):
+        stop = self.steps if stop is None else stop
+        origin = np.datetime64(self.config.start_date, "m")
+        return origin + (np.arange(start, stop) * self.config.timestep_minutes).astype("timedelta64[m]")
+
+    def summary(self):
+        """Return ``{name: (p10, p50, p90)}`` of every per-scenario total."""
+        return {name: tuple(float(value) for value in np.percentile(values, PERCENTILES))
+                for name, values in self.totals.items()}
+
+
+def perturb(load_kw, price, config, seed, indices, perturbation=Perturbation()):
+    """Return the ``(load_kw, price)`` profiles of the scenarios in ``indices``, shaped ``(len(indices), steps)``.
+
+    Scenario ``i`` draws from its own generator seeded with ``(seed, i)``, so it
+    comes out the same however the scenarios are split into chunks.
+    """
+    load_kw = np.asarray(load_kw, dtype=float)
+    steps, days = config.steps, config.days
+    spread = np.abs(load_kw).mean()
+    loads = np.empty((len(indices), steps))
+    prices = None if price is None else np.empty((len(indices), steps))
+    for row, index in enumerate(indices):
+        rng = np.random.default_rng((seed, index))
+        factor = 1 + rng.normal(0, perturbation.load_scale) + np.repeat(
+            rng.normal(0, perturbation.load_daily, days), config.steps_per_day)
+        loads[row] = load_kw * factor + rng.normal(0, perturbation.load_noise * spread, steps)
+        if prices is not None:
+            exponent = np.repeat(rng.normal(0, perturbation.price_daily, days), config.steps_per_day)
+            prices[row] = price * np.exp(exponent + rng.normal(0, perturbation.price_noise, steps))
+    return loads, prices
+
+
+def simulate_scenarios(config, load_kw, price=None, scenarios=1000, seed=0, perturbation=Perturbation(),
+                       progress=None, chunk_bytes=CHUNK_BYTES):
+    """Simulate ``scenarios`` perturbed copies of the input profiles and reduce them to percentile bands.
+
+    Each chunk of scenarios runs as a fleet of identical batteries, one per
+    scenario, so every step is a single update across the chunk; chunks are
+    sized so their arrays stay within about ``chunk_bytes``. The
+    per-step quantities are parked in temporary float32 memory maps, and the
+    bands are taken from them one block of steps at a time, so memory stays
+    bounded whatever the scenario count. ``progress(done, total)`` counts
+    scenarios; an exception raised by it aborts the run.
+    """
+    config.validate()
+    perturbation.validate()
+    if load_kw is None:
+        raise ValueError("Scenarios perturb the load profile, so they need a data file with a load column")
+    if scenarios < 1:
+        raise ValueError("Run at least one scenario")
+    if config.optimal:
+        raise ValueError("Scenarios run the steer dispatch; switch optimal dispatch off")
+    steps = config.steps
+    chunk = min(scenarios, max(1, chunk_bytes // (steps * 8 * ARRAYS_PER_SCENARIO)))
+    batteries = [Asset(f"scenario{index + 1}", config) for index in range(chunk)]
+    totals = {}
+
+    with tempfile.TemporaryFile() as soc_file, tempfile.TemporaryFile() as energy_file:
+        parked = {
+            "soc": np.memmap(soc_file, dtype=np.float32, mode="w+", shape=(scenarios, steps)),
+            "energy_discharged_kwh": np.memmap(energy_file, dtype=np.float32, mode="w+", shape=(scenarios, steps)),
+        }
+        for start in range(0, scenarios, chunk):
+            stop = min(start + chunk, scenarios)
+            loads, prices = perturb(load_kw, price, config, seed, range(start, stop), perturbation)
+            result = simulate_fleet(Fleet(batteries[:stop - start]), loads, prices)
+            parked["soc"][start:stop] = result.soc
+            discharged = np.maximum(result.power_kw, 0.0) * config.step_hours
+            parked["energy_discharged_kwh"][start:stop] = np.cumsum(discharged, axis=-1)
+            for name, values in result.summary_columns().items():
+                totals.setdefault(name, np.empty(scenarios))[start:stop] = values
+            if progress is not None:
+                progress(stop, scenarios)
+
+        block = max(1, chunk_bytes // (scenarios * 4 * ARRAYS_PER_SCENARIO))
+        bands = {name: np.empty((len(PERCENTILES), steps)) for name in BAND_NAMES}
+        for first in range(0, steps, block):
+            last = min(first + block, steps)
+            for name in BAND_NAMES:
+                bands[name][:, first:last] = np.percentile(parked[name][:, first:last], PERCENTILES, axis=0)
+        del parked
+    return ScenarioResult(config=config, scenarios=scenarios, seed=seed, perturbation=perturbation,
+                          bands=bands, totals=totals)
+
+
+def write_bands(result, path):
+    """Write the per-step percentile bands to a CSV table, one column per quantity and percentile."""
+    headers = [f"{name}_p{percentile}" for name in BAND_NAMES for percentile in PERCENTILES]
+    columns = np.vstack([result.bands[name] for name in BAND_NAMES]).T
+    stamps = np.datetime_as_string(result.timestamps(), unit="m")
+    with open(path, "w", newline="") as handle:
+        handle.write(",".join(["timestamp"] + headers) + "\n")
+        row_format = "%s" + ",%.4f" * len(headers) + "\n"
+        for start in range(0, result.steps, BLOCK_ROWS):
+            stop = min(start + BLOCK_ROWS, result.steps)
+            block = np.empty((stop - start, len(headers) + 1), dtype=object)
+            block[:, 0] = stamps[start:stop]
+            block[:, 1:] = columns[start:stop]
+            handle.write((row_format * (stop - start)) % tuple(block.ravel()))
@@ -0,0 +1,208 @@
+from dataclasses import dataclass, asdict, replace
+from datetime import datetime
+from functools import lru_cache
+import math
+
+import numpy as np
+
+from config.constants import Constants
+
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DAY_GROUPS = {
+    "all": set(DAY_NAMES),
+    "weekday": set(DAY_NAMES[:5]),
+    "weekend": set(DAY_NAMES[5:]),
+}
+SEASONS = {
+    "winter": (12, 1, 2),
+    "spring": (3, 4, 5),
+    "summer": (6, 7, 8),
+    "autumn": (9, 10, 11),
+}
+COMPILED_SCHEDULES = 32
+
+
+@dataclass(frozen=True)
+class Window:
+    """One steer window: move towards ``soc_target`` (%) at ``power_setpoint`` (kW) from start to end time."""
+    start_time: str
+    end_time: str
+    soc_target: float
+    power_setpoint: float
+
+
+@dataclass(frozen=True)
+class ScheduleRule:
+    """The windows of the days a rule covers.
+
+    ``days`` holds day names (``mon`` .. ``sun``), ``weekday``, ``weekend``,
+    ``holiday`` or ``all``; ``months`` holds month numbers or season names
+    (``SEASONS``), and an empty tuple means every month. Holidays only match
+    rules that name ``holiday`` or ``all``, whatever day of the week they are.
+    """
+    windows: tuple
+    days: tuple = ("all",)
+    months: tuple = ()
+    name: str = ""
+
+    def month_numbers(self):
+        numbers = set()
+        for month in self.months:
+            numbers.update(SEASONS[month] if isinstance(month, str) else (int(month),))
+        return numbers or set(range(1, 13))
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """Calendar-aware steer windows; each day follows the first rule that matches it, days without one idle."""
+    rules: tuple
+    holidays: tuple = ()
+
+    def validate(self, timestep_minutes=Constants.TIMESTEP_MINUTES):
+        """Raise ValueError if a rule or window cannot be compiled."""
+        for number, rule in enumerate(self.rules, 1):
+            label = f"Schedule rule {rule.name or number}"
+            unknown = set(rule.days) - set(DAY_NAMES) - set(DAY_GROUPS) - {"holiday"}
+            if unknown:
+                raise ValueError(f"{label}: unknown day(s) {', '.join(sorted(unknown))}")
+            for month in rule.months:
+                if month not in SEASONS and not (isinstance(month, int) and 1 <= month <= 12):
+                    raise ValueError(f"{label}: unknown month or season {month!r}")
+            previous_stop = 0
+            for window in sorted(rule.windows, key=lambda window: _minutes_of_day(window.start_time)):
+                if not 0 <= window.soc_target <= 100:
+                    raise ValueError(f"{label}: SoC Target must be between 0 and 100")
+                if window.power_setpoint < 0:
+                    raise ValueError(f"{label}: Power Setpoint must not be negative")
+                start, stop = window_steps(window.start_time, window.end_time, timestep_minutes)
+                if stop <= start:
+                    raise ValueError(f"{label}: End Time must be after Start Time")
+                if start < previous_stop:
+                    raise ValueError(f"{label}: windows overlap at {window.start_time}")
+                previous_stop = stop
+        for day in self.holidays:
+            try:
+                np.datetime64(day, "D")
+            except ValueError:
+                raise ValueError(f"Schedule holiday {day!r} is not a YYYY-MM-DD date") from None
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Schedule from its JSON layout (lists for the tuples)."""
+        try:
+            rules = tuple(
+                ScheduleRule(
+                    windows=tuple(Window(start_time=window["start_time"], end_time=window["end_time"],
+                                         soc_target=float(window["soc_target"]),
+                                         power_setpoint=float(window["power_setpoint"]))
+                                  for window in rule.get("windows", ())),
+                    days=tuple(day.lower() for day in rule.get("days", ("all",))),
+                    months=tuple(month.lower() if isinstance(month, str) else int(month)
+                                 for month in rule.get("months", ())),
+                    name=rule.get("name", ""),
+                )
+                for rule in data.get("rules", ())
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid schedule: {e!r}") from None
+        return cls(rules=rules, holidays=tuple(str(day) for day in data.get("holidays", ())))
+
+
+def single_window(start_time, end_time, soc_target, power_setpoint):
+    """Return the Schedule of the form's one daily window, applied every day."""
+    return Schedule(rules=(ScheduleRule(windows=(Window(start_time, end_time, soc_target, power_setpoint),)),))
+
+
+def window_steps(start_time, end_time, timestep_minutes):
+    """Return the [start, stop) step indices of a daily window."""
+    start = _minutes_of_day(start_time) // timestep_minutes
+    stop = math.ceil(_minutes_of_day(end_time) / timestep_minutes)
+    return start, min(stop, 24 * 60 // timestep_minutes)
+
+
+def day_rules(schedule, start_date, days):
+    """Return the index of the rule every day of the horizon follows, -1 where none matches."""
+    dates = np.datetime64(start_date, "D") + np.arange(days)
+    weekday = (dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    month = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    holiday = np.isin(dates, np.array(schedule.holidays, dtype="datetime64[D]"))
+
+    rule_of_day = np.full(days, -1)
+    for index, rule in enumerate(schedule.rules):
+        names = set()
+        for day in rule.days:
+            names |= DAY_GROUPS.get(day, {day})
+        by_weekday = np.array([name in names for name in DAY_NAMES])
+        covers = np.where(holiday, "holiday" in rule.days or "all" in rule.days, by_weekday[weekday])
+        covers &= np.isin(month, sorted(rule.month_numbers()))
+        rule_of_day[covers & (rule_of_day < 0)] = index
+    return rule_of_day
+
+
+def layout(schedule):
+    """Return ``schedule`` with every window's target and setpoint zeroed: the key of when windows apply."""
+    return Schedule(
+        rules=tuple(replace(rule, name="", windows=tuple(Window(window.start_time, window.end_time, 0.0, 0.0)
+                                                         for window in rule.windows))
+                    for rule in schedule.rules),
+        holidays=schedule.holidays,
+    )
+
+
+def windows(schedule):
+    """Return every window of ``schedule`` in rule order, the numbering ``window_index`` uses."""
+    return [window for rule in schedule.rules for window in rule.windows]
+
+
+@lru_cache(maxsize=COMPILED_SCHEDULES)
+def window_index(schedule_layout, start_date, days, timestep_minutes):
+    """Return, for every step of a horizon, the number of the window it falls in (-1 outside windows).
+
+    Each rule becomes one day-long profile and the horizon is a single gather
+    of those profiles by the rule every day follows, so a multi-year schedule
+    costs one array build instead of a lookup per step. Only window times
+    matter, so schedules differing in targets or setpoints share one entry
+    (pass ``layout(schedule)``); the result is read-only since callers share it.
+    """
+    steps_per_day = 24 * 60 // timestep_minutes
+    profiles = np.full((len(schedule_layout.rules) + 1, steps_per_day), -1)  # the last profile is the idle day
+    number = 0
+    for index, rule in enumerate(schedule_layout.rules):
+        for window in rule.windows:
+            start, stop = window_steps(window.start_time, window.end_time, timestep_minutes)
+            profiles[index, start:stop] = number
+            number += 1
+    index = profiles[day_rules(schedule_layout, start_date, days)].reshape(-1)
+    index.setflags(write=False)
+    return index
+
+
+@lru_cache(maxsize=COMPILED_SCHEDULES)
+def compile_schedule(schedule, start_date, days, timestep_minutes, min_soc, max_soc, to_percent):
+    """Return the per-step ``(steer, target, rate)`` arrays of ``schedule`` over a horizon.
+
+    Built from the shared ``window_index`` with one gather per array, memoised
+    on the arguments and returned read-only. Targets are clipped to the SoC
+    limits and ``rate`` is in percent per step; both are 0 outside windows.
+    """
+    index = window_index(layout(schedule), start_date, days, timestep_minutes)
+    targets, rates = window_values(schedule, min_soc, max_soc, to_percent)
+    arrays = (index >= 0, targets[index], rates[index])
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def window_values(schedule, min_soc, max_soc, to_percent):
+    """Return the ``(targets, rates)`` of every window, each followed by a 0 for steps outside windows."""
+    targets = [float(np.clip(window.soc_target, min_soc, max_soc)) for window in windows(schedule)]
+    rates = [window.power_setpoint * to_percent for window in windows(schedule)]
+    return np.array(targets + [0.0]), np.array(rates + [0.0])
+
+
+def _minutes_of_day(text):
+    parsed = datetime.strptime(text, Constants.TIME_FORMAT)
+    return parsed.hour * 60 + parsed.minute
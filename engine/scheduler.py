@@ -0,0 +1,203 @@
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from dataclasses import dataclass
+import heapq
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from .cache import run_key
+from .dispatch import simulate
+from .store import save_result
+from .timeseries import load_timeseries, profiles
+
+PRIORITIES = {"High": 2, "Normal": 1, "Low": 0}
+STATUSES = ("queued", "running", "done", "failed", "cancelled")
+
+
+@dataclass(eq=False)
+class Job:
+    """One configured run in the queue: what to run, how urgent it is, and how it went.
+
+    ``key`` is the ``run_key`` of the configuration and data file, so a job
+    for inputs already queued, running or in the result cache is never run
+    twice. ``submitted``, ``started`` and ``finished`` are ``time.time()``
+    stamps; ``error`` holds the message of a failed run.
+    """
+    number: int
+    key: str
+    project: str
+    config: object
+    data_file: str
+    priority: int
+    submitted: float
+    status: str = "queued"
+    started: float = None
+    finished: float = None
+    error: str = None
+
+    @property
+    def elapsed(self):
+        """Seconds the job has been running (so far, or in total), or None before it starts."""
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+
+class RunScheduler:
+    """Queue of configured runs executed on a bounded process pool, highest priority first.
+
+    Jobs wait in a heap ordered by priority, then submission time, and only
+    as many as there are workers are handed to the pool at once, so a job
+    queued later with a higher priority still overtakes everything not yet
+    started. Workers load the data file themselves (through its memory-mapped
+    sidecar) and save the run straight into the result cache's directory; the
+    scheduler then adopts it into the cache, so finished runs open like any
+    cached run. Pool callbacks and the UI share one lock, and while
+    ``listening`` is on, every change of a job's status is queued for
+    ``drain`` on the UI thread, as with ``RunController``; a view that is not
+    open turns it off and reads ``jobs`` when it opens again. The pool is
+    started with the first job and kept until ``shutdown``.
+    """
+
+    def __init__(self, cache, max_workers=None):
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.jobs = []
+        self.events = queue.Queue()
+        self.listening = False
+        self._heap = []
+        self._active = {}
+        self._running = 0
+        self._numbers = itertools.count(1)
+        self._executor = None
+        self._lock = threading.RLock()
+
+    def submit(self, config, data_file="", project="", priority=PRIORITIES["Normal"]):
+        """Queue a run of ``config`` on ``data_file`` and return ``(job, added)``.
+
+        When the same inputs are already queued or running, that job comes
+        back with ``added`` False instead; a queued one is raised to
+        ``priority`` if that is higher. Inputs whose run is already in the
+        result cache give a job that is done at once. The key hashes the whole
+        data file, so UIs should submit from a worker thread.
+        """
+        config.validate()
+        key = run_key(config, data_file)
+        with self._lock:
+            job = self._active.get(key)
+            if job is not None:
+                if job.status == "queued" and priority > job.priority:
+                    job.priority = priority
+                    self._push(job)
+                    self._changed(job)
+                return job, False
+            job = Job(number=next(self._numbers), key=key, project=project, config=config,
+                      data_file=data_file or "", priority=priority, submitted=time.time())
+            self.jobs.append(job)
+            if key in self.cache:
+                job.status = "done"
+                job.started = job.finished = job.submitted
+            else:
+                self._active[key] = job
+                self._push(job)
+            self._changed(job)
+            self._fill()
+        return job, True
+
+    def cancel(self, job):
+        """Take a queued job off the queue; returns False when it has already started or ended."""
+        with self._lock:
+            if job.status != "queued":
+                return False
+            self._end(job, "cancelled")
+            return True
+
+    def remove_finished(self):
+        """Forget the jobs that have ended, keeping the queued and running ones."""
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.status in ("queued", "running")]
+
+    def counts(self):
+        """Return the number of jobs in each status."""
+        with self._lock:
+            counts = dict.fromkeys(STATUSES, 0)
+            for job in self.jobs:
+                counts[job.status] += 1
+            return counts
+
+    def drain(self, limit=100):
+        """Return up to ``limit`` jobs whose status changed since the last call (a job may repeat)."""
+        jobs = []
+        while len(jobs) < limit:
+            try:
+                jobs.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def shutdown(self, wait=False):
+        """Cancel every queued job and stop the pool once the running ones finish."""
+        with self._lock:
+            for job in list(self._active.values()):
+                if job.status == "queued":
+                    self._end(job, "cancelled")
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _push(self, job):
+        # A job raised to a higher priority is pushed again; the stale entry is skipped when it surfaces.
+        heapq.heappush(self._heap, (-job.priority, job.submitted, job.number, job))
+
+    def _fill(self):
+        """Start queued jobs, best first, until every worker is busy."""
+        while self._running < self.max_workers and self._heap:
+            priority, _, _, job = heapq.heappop(self._heap)
+            if job.status != "queued" or -priority != job.priority:
+                continue
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            job.status = "running"
+            job.started = time.time()
+            self._running += 1
+            future = self._executor.submit(_run_job, job.config, job.data_file,
+                                          os.path.abspath(self.cache.path_for(job.key)))
+            self._changed(job)
+            future.add_done_callback(lambda future, job=job: self._finished(job, future))
+
+    def _finished(self, job, future):
+        """Pool callback: record how the job went and start the next one."""
+        with self._lock:
+            self._running -= 1
+            try:
+                future.result()
+                self.cache.adopt(job.key)
+            except CancelledError:
+                self._end(job, "cancelled")
+            except Exception as e:
+                job.error = str(e) or type(e).__name__
+                self._end(job, "failed")
+            else:
+                self._end(job, "done")
+            self._fill()
+
+    def _end(self, job, status):
+        job.status = status
+        job.finished = time.time()
+        self._active.pop(job.key, None)
+        self._changed(job)
+
+    def _changed(self, job):
+        if self.listening:
+            self.events.put(job)
+
+
+def _run_job(config, data_file, directory):
+    load_kw = price = None
+    if data_file:
+        load_kw, price = profiles(load_timeseries(data_file), config)
+    return save_result(simulate(config, load_kw, price), directory)
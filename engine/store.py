@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .dispatch import DispatchConfig, DispatchResult
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+STORE_COLUMNS = ("soc", "power_kw", "setpoint_kw", "load_kw", "price")
+
+
+def save_result(result, directory, extra=None):
+    """Write ``result`` as one ``.npy`` file per column plus ``meta.json``.
+
+    The run is assembled in a temporary sibling directory and renamed into
+    place, so readers never see a half-written run. ``extra`` is stored in the
+    metadata untouched.
+    """
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        columns = {}
+        for name in STORE_COLUMNS:
+            values = getattr(result, name)
+            if values is None:
+                continue
+            filename = f"{name}.npy"
+            target = np.lib.format.open_memmap(os.path.join(staging, filename), mode="w+",
+                                               dtype=np.float64, shape=np.shape(values))
+            target[...] = values
+            target.flush()
+            del target
+            columns[name] = {"file": filename, "shape": list(np.shape(values)), "dtype": "float64"}
+
+        meta = {
+            "format": FORMAT_VERSION,
+            "config": result.config.to_dict(),
+            "columns": columns,
+            "extra": extra or {},
+        }
+        with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as handle:
+            json.dump(meta, handle, indent=2)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return directory
+
+
+def read_meta(directory):
+    with open(os.path.join(directory, META_FILE), encoding="utf-8") as handle:
+        meta = json.load(handle)
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result format {meta.get('format')!r} in {directory}")
+    return meta
+
+
+def open_result(directory, columns=None):
+    """Open a stored run with every column memory-mapped read-only.
+
+    Nothing is read until a slice of a column is touched, so opening is cheap
+    regardless of the horizon, and ``result.soc[start:stop]`` only pages in that
+    range. Pass ``columns`` to skip the others entirely (they come back as None).
+    """
+    meta = read_meta(directory)
+    arrays = {}
+    for name, info in meta["columns"].items():
+        if columns is not None and name not in columns:
+            continue
+        arrays[name] = np.load(os.path.join(directory, info["file"]), mmap_mode="r")
+    return DispatchResult(config=DispatchConfig.from_dict(meta["config"]), **{
+        name: arrays.get(name) for name in STORE_COLUMNS
+    })
+
+
+def is_result(directory):
+    return os.path.isfile(os.path.join(directory, META_FILE))
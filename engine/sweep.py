@@ -0,0 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from itertools import product
+import csv
+import multiprocessing
+import os
+
+from .dispatch import simulate
+
+SWEEP_FIELDS = ("min_soc", "max_soc", "soc_target", "power_setpoint", "start_time", "end_time")
+STEER_FIELDS = {"soc_target", "power_setpoint", "start_time", "end_time"}
+
+_worker_profiles = {}
+
+
+def build_grid(base_config, **values):
+    """Return every valid configuration in the cartesian product of ``values``.
+
+    Keys are DispatchConfig field names (see SWEEP_FIELDS); fields left out keep
+    the value from ``base_config`` and sweeping a steer field turns the steer on.
+    Combinations that fail validation, such as an End Time before the Start
+    Time, are skipped.
+    """
+    unknown = set(values) - set(SWEEP_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot sweep over {', '.join(sorted(unknown))}")
+    names = [name for name in SWEEP_FIELDS if values.get(name)]
+    if set(names) & STEER_FIELDS:
+        base_config = replace(base_config, steer_enabled=True, optimal=False)
+    configs = []
+    for combination in product(*(values[name] for name in names)):
+        config = replace(base_config, **dict(zip(names, combination)))
+        try:
+            config.validate()
+        except ValueError:
+            continue
+        configs.append(config)
+    return configs
+
+
+def iter_sweep(configs, load_kw=None, price=None, max_workers=None, chunk_size=None):
+    """Simulate ``configs`` on a process pool and yield ``(index, config, summary)`` as runs finish.
+
+    Configurations are sent to the workers in chunks so that per-task overhead
+    stays small next to the simulation itself; the profiles are shipped once per
+    worker through the pool initializer rather than with every task.
+    """
+    configs = list(configs)
+    if not configs:
+        return
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, len(configs) // (max_workers * 4))
+    chunks = [range(start, min(start + chunk_size, len(configs)))
+              for start in range(0, len(configs), chunk_size)]
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                             initializer=_init_worker, initargs=(load_kw, price)) as executor:
+        futures = [executor.submit(_run_chunk, [(index, configs[index]) for index in chunk])
+                   for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                for index, summary in future.result():
+                    yield index, configs[index], summary
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def write_summary(rows, path):
+    """Write ``(index, config, summary)`` rows to a CSV table ordered by index."""
+    rows = sorted(rows, key=lambda row: row[0])
+    if not rows:
+        return
+    config_fields = list(rows[0][1].to_dict())
+    summary_fields = list(rows[0][2])
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["run"] + config_fields + summary_fields)
+        for index, config, summary in rows:
+            values = config.to_dict()
+            writer.writerow([index] + [values[name] for name in config_fields]
+                            + [summary[name] for name in summary_fields])
+
+
+def _init_worker(load_kw, price):
+    _worker_profiles["load_kw"] = load_kw
+    _worker_profiles["price"] = price
+
+
+def _run_chunk(items):
+    load_kw = _worker_profiles.get("load_kw")
+    price = _worker_profiles.get("price")
+    return [(index, simulate(config, load_kw, price).summary()) for index, config in items]
@@ -0,0 +1,298 @@
+from dataclasses import dataclass
+from datetime import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+SIDECAR_VERSION = 1
+INDEX_FILE = "index.json"
+CHUNK_BYTES = 16 << 20
+SAMPLE_ROWS = 200
+DELIMITERS = (",", ";", "\t")
+TIMESTAMP_FORMATS = (
+    "%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %I:%M %p", "%d/%m/%Y %H:%M",
+    "%d.%m.%Y %H:%M", "%Y/%m/%d %H:%M", "%m/%d/%Y", "%d/%m/%Y",
+)
+LOAD_COLUMNS = ("load_kw", "net_load_kw", "net_load", "load")
+PRICE_COLUMNS = ("price", "price_per_mwh", "price_mwh", "lmp")
+
+
+@dataclass(eq=False)
+class TimeSeries:
+    """Columns of a data file: ``timestamps`` as datetime64[m] (None without a time column) and float64 columns by name."""
+    path: str
+    timestamps: np.ndarray
+    columns: dict
+
+    @property
+    def rows(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+
+def sidecar_path(path):
+    """Return the directory that caches the parsed contents of ``path``."""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.cache")
+
+
+def load_timeseries(path, progress=None, chunk_bytes=CHUNK_BYTES):
+    """Return the TimeSeries in a delimited text file, reusing its sidecar cache when it is still fresh.
+
+    The first load parses the file in blocks of ``chunk_bytes`` and writes
+    every column as a ``.npy`` file plus an index into the sidecar directory;
+    later loads memory-map those arrays instead of parsing. The sidecar is
+    rebuilt whenever the file's size or mtime changes. ``progress(done, total)``
+    is called with bytes parsed.
+    """
+    stat = os.stat(path)
+    sidecar = sidecar_path(path)
+    series = _open_sidecar(path, sidecar, stat)
+    if series is not None:
+        return series
+
+    timestamps, columns, skipped = parse_delimited(path, progress, chunk_bytes)
+    series = TimeSeries(path=path, timestamps=timestamps, columns=columns)
+    try:
+        _write_sidecar(sidecar, stat, series, skipped)
+    except OSError as e:
+        print(f"Could not cache {path}: {e}")
+        return series
+    return _open_sidecar(path, sidecar, stat) or series
+
+
+def parse_delimited(path, progress=None, chunk_bytes=CHUNK_BYTES):
+    """Parse a delimited text file with a header row into ``(timestamps, columns, skipped)``.
+
+    Column types are inferred from the first rows: a column is numeric if its
+    sample parses as floats, a timestamp if it parses as ISO 8601 or one of
+    ``TIMESTAMP_FORMATS``, and skipped (listed in ``skipped``) otherwise. Empty
+    numeric cells become NaN. Only the first timestamp column is used.
+    """
+    total = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        header = handle.readline()
+        text = header.decode("utf-8-sig").strip()
+        delimiter = max(DELIMITERS, key=text.count)
+        names = [name.strip().strip('"') for name in text.split(delimiter)]
+
+        kinds = None
+        parts = {name: [] for name in names}
+        done = len(header)
+        leftover = b""
+        line_number = 1
+        while True:
+            block = handle.read(chunk_bytes)
+            data = leftover + block
+            if block:
+                cut = data.rfind(b"\n") + 1
+                data, leftover = data[:cut], data[cut:]
+            if data.strip():
+                if kinds is None:
+                    sample = _split_block(data.split(b"\n", SAMPLE_ROWS)[:SAMPLE_ROWS], names, delimiter, path, line_number)
+                    kinds = [_infer_kind(column) for column in sample]
+                line_number += _parse_block(data, names, kinds, delimiter, parts, path, line_number)
+            done += len(block)
+            if progress is not None:
+                progress(min(done, total), total)
+            if not block:
+                break
+
+    if kinds is None:
+        raise ValueError(f"{path} has no data rows")
+    timestamps = None
+    columns = {}
+    skipped = []
+    for name, kind in zip(names, kinds):
+        if kind is None or (kind != "number" and timestamps is not None):
+            skipped.append(name)
+        elif kind == "number":
+            columns[name] = np.concatenate(parts[name])
+        else:
+            timestamps = np.concatenate(parts[name])
+    if not columns:
+        raise ValueError(f"{path} has no numeric columns")
+    return timestamps, columns, skipped
+
+
+def _parse_block(data, names, kinds, delimiter, parts, path, line_number):
+    """Parse whole lines in ``data`` into ``parts``; returns the number of lines consumed.
+
+    Blocks go through NumPy's C parser with a structured dtype; a block it
+    rejects (empty cells, ragged rows) is re-parsed line by line, which fills
+    NaN for empty numbers and reports the offending line.
+    """
+    used = [index for index, kind in enumerate(kinds) if kind is not None]
+    dtype = [(f"f{index}", "f8" if kinds[index] == "number" else "M8[m]" if kinds[index] == "iso" else "S64")
+             for index in used]
+    try:
+        table = np.loadtxt(io.BytesIO(data), delimiter=delimiter, dtype=dtype, usecols=used,
+                           quotechar='"', comments=None, ndmin=1, encoding="utf-8")
+        # The C parser reads strptime-format timestamps as text; only those still need converting.
+        columns = [table[f"f{index}"] if kinds[index] in ("number", "iso")
+                   else _convert(table[f"f{index}"], kinds[index]) for index in used]
+        lines = len(table)
+    except ValueError:
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        cells = _split_block(lines, names, delimiter, path, line_number)
+        columns = [_convert(cells[index], kinds[index]) for index in used]
+        lines = len(lines)
+    for index, column in zip(used, columns):
+        parts[names[index]].append(column)
+    return lines
+
+
+def _split_block(lines, names, delimiter, path, line_number):
+    """Split raw lines into one bytes array per column, checking every row has every field."""
+    separator = delimiter.encode()
+    rows = []
+    for offset, line in enumerate(lines):
+        line = line.rstrip(b"\r")
+        if not line.strip():
+            continue
+        row = line.split(separator)
+        if len(row) != len(names):
+            raise ValueError(f"{path}, line {line_number + offset + 1}: expected {len(names)} "
+                             f"fields, found {len(row)}")
+        rows.append(row)
+    cells = np.char.strip(np.array(rows, dtype=bytes).reshape(len(rows), len(names)), b'" ')
+    return [cells[:, index] for index in range(len(names))]
+
+
+def align(series, config, column):
+    """Resample one column onto the steps of ``config``.
+
+    Timestamps mark the start of their interval. Each step takes the mean of
+    the samples that fall in it, so finer data is averaged; steps without a
+    sample hold the previous value (the first sample before the first one).
+    Without a time column the rows are taken as steps, in order.
+    """
+    values = np.asarray(series.columns[column], dtype=float)
+    steps = config.steps
+    if series.timestamps is None:
+        if len(values) < steps:
+            raise ValueError(f"{column} has {len(values)} rows, the simulation needs {steps}")
+        return np.array(values[:steps])
+
+    timestamps = np.asarray(series.timestamps)
+    valid = ~np.isnat(timestamps) & ~np.isnan(values)
+    start = np.datetime64(config.start_date, "m")
+    index = np.zeros(len(values), dtype=np.int64)
+    index[valid] = (timestamps[valid] - start) // np.timedelta64(config.timestep_minutes, "m")
+    keep = valid & (index >= 0) & (index < steps)
+    if not keep.any():
+        raise ValueError(f"{column} has no data between {config.start_date} and the end of the simulation")
+    sums = np.bincount(index[keep], weights=values[keep], minlength=steps)
+    counts = np.bincount(index[keep], minlength=steps)
+    have = counts > 0
+    positions = np.maximum.accumulate(np.where(have, np.arange(steps), 0))
+    positions[:np.argmax(have)] = np.argmax(have)
+    return (sums / np.maximum(counts, 1))[positions]
+
+
+def profiles(series, config):
+    """Return ``(load_kw, price)`` for ``config`` from the columns of ``series``; either may be None.
+
+    Columns are matched by name, ignoring case (``LOAD_COLUMNS``,
+    ``PRICE_COLUMNS``); a file with a single numeric column is taken as load.
+    """
+    by_name = {name.strip().lower(): name for name in series.columns}
+    load_column = next((by_name[name] for name in LOAD_COLUMNS if name in by_name), None)
+    price_column = next((by_name[name] for name in PRICE_COLUMNS if name in by_name), None)
+    if load_column is None and price_column is None:
+        if len(series.columns) != 1:
+            raise ValueError(f"{series.path} has no load column ({', '.join(LOAD_COLUMNS)}) "
+                             f"or price column ({', '.join(PRICE_COLUMNS)})")
+        load_column = next(iter(series.columns))
+    load_kw = align(series, config, load_column) if load_column else None
+    price = align(series, config, price_column) if price_column else None
+    return load_kw, price
+
+
+def _infer_kind(sample):
+    """Return 'number', a timestamp format ('iso' or a strptime format) or None for a column sample."""
+    filled = sample[sample != b""]
+    if not filled.size:
+        return "number"
+    try:
+        filled.astype(float)
+        return "number"
+    except ValueError:
+        pass
+    try:
+        filled.astype("datetime64[m]")
+        return "iso"
+    except ValueError:
+        pass
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            for cell in filled:
+                datetime.strptime(cell.decode(), fmt)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+def _convert(column, kind):
+    column = np.char.strip(column.astype(bytes), b'" ')
+    if kind == "number":
+        return np.where(column == b"", b"nan", column).astype(float)
+    if kind == "iso":
+        return column.astype("datetime64[m]")
+    return np.array([datetime.strptime(cell.decode(), kind) for cell in column], dtype="datetime64[m]")
+
+
+def _open_sidecar(path, sidecar, stat):
+    """Return the cached TimeSeries, or None if the sidecar is missing, stale or unreadable."""
+    try:
+        with open(os.path.join(sidecar, INDEX_FILE), encoding="utf-8") as handle:
+            index = json.load(handle)
+        if (index.get("format") != SIDECAR_VERSION or index["source"]["size"] != stat.st_size
+                or index["source"]["mtime_ns"] != stat.st_mtime_ns):
+            return None
+        timestamps = None
+        if index["timestamps"]:
+            timestamps = np.load(os.path.join(sidecar, index["timestamps"]), mmap_mode="r")
+        columns = {name: np.load(os.path.join(sidecar, filename), mmap_mode="r")
+                   for name, filename in index["columns"].items()}
+    except (OSError, ValueError, KeyError):
+        return None
+    return TimeSeries(path=path, timestamps=timestamps, columns=columns)
+
+
+def _write_sidecar(sidecar, stat, series, skipped):
+    """Write the sidecar through a staging directory so readers never see half of one."""
+    parent = os.path.dirname(sidecar)
+    staging = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        filenames = {}
+        for number, (name, values) in enumerate(series.columns.items()):
+            filenames[name] = f"column_{number}.npy"
+            np.save(os.path.join(staging, filenames[name]), values)
+        index = {
+            "format": SIDECAR_VERSION,
+            "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+            "rows": series.rows,
+            "timestamps": None,
+            "columns": filenames,
+            "skipped": skipped,
+        }
+        if series.timestamps is not None:
+            np.save(os.path.join(staging, "timestamps.npy"), series.timestamps)
+            index["timestamps"] = "timestamps.npy"
+            if len(series.timestamps):
+                index["first"] = str(series.timestamps.min())
+                index["last"] = str(series.timestamps.max())
+        with open(os.path.join(staging, INDEX_FILE), "w", encoding="utf-8") as handle:
+            json.dump(index, handle, indent=2)
+
+        if os.path.exists(sidecar):
+            shutil.rmtree(sidecar)
+        os.replace(staging, sidecar)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
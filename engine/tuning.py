@@ -0,0 +1,174 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from itertools import product
+import multiprocessing
+import os
+
+import numpy as np
+
+from config.constants import Constants
+from .fleet import Asset, Fleet, simulate_fleet
+
+OBJECTIVES = {
+    "revenue": "Highest revenue",
+    "cycles": "Fewest equivalent cycles",
+    "limits": "Least time at the SoC limits",
+}
+COARSE_POINTS = 5
+BEAM = 4
+BATCH_CANDIDATES = 64
+
+_worker_profiles = {}
+
+
+@dataclass(eq=False)
+class TuningResult:
+    """The best configuration found, its summary and score, and how many runs the search took."""
+    config: object
+    summary: dict
+    score: float
+    objective: str
+    evaluated: int
+    cached: int
+
+    def form_values(self):
+        """Return the steer settings of the winner, keyed like ``DispatchControlFrame.set_values`` expects."""
+        config = self.config
+        return {"steer_enabled": True, "start_time": config.start_time, "end_time": config.end_time,
+                "soc_target": config.soc_target, "power_setpoint": config.power_setpoint, "schedule": None}
+
+
+def score(summary, objective):
+    """Return how good a run summary is under ``objective``; higher is better."""
+    if objective == "revenue":
+        return summary["revenue"]
+    if objective == "cycles":
+        return -summary["equivalent_cycles"]
+    if objective == "limits":
+        return -(summary["hours_at_min_soc"] + summary["hours_at_max_soc"])
+    raise ValueError(f"Unknown objective {objective!r}; expected one of {', '.join(OBJECTIVES)}")
+
+
+class Tuner:
+    """Searches SoC Target, Power Setpoint and the steer window of a base configuration.
+
+    Candidates are points on a grid (target in %, setpoint in kW, window edges
+    in steps of the day). The search starts from a coarse grid over the whole
+    space, keeps the ``beam`` best points and only refines around those,
+    halving the grid spacing every round, so regions whose coarse points
+    scored poorly are never refined. A round's new candidates run in fleets
+    of ``BATCH_CANDIDATES``, simulated side by side in one pass over time,
+    and the fleets are spread over a process pool when there is more than
+    one core (the profiles are shipped once per worker, as in sweeps). Run
+    summaries are memoised on the configuration, so candidates revisited
+    across rounds, and later searches for another objective on the same
+    profiles, reuse earlier runs.
+    """
+
+    def __init__(self, base_config, load_kw=None, price=None, max_power=None, max_workers=None):
+        self.base = replace(base_config, steer_enabled=True, schedule=None, optimal=False)
+        self.base.validate()
+        self.load_kw = load_kw
+        self.price = price
+        self.max_power = max_power or self.base.capacity_kwh
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.summaries = {}
+
+    def tune(self, objective="revenue", rounds=None, beam=BEAM, progress=None):
+        """Return the TuningResult of a beam search for ``objective``.
+
+        ``progress(done, total)`` is called after every round; an exception
+        raised by it stops the search.
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {objective!r}; expected one of {', '.join(OBJECTIVES)}")
+        if objective == "revenue" and self.price is None:
+            raise ValueError("The revenue objective needs a price column in the data file")
+        base = self.base
+        span = base.max_soc - base.min_soc
+        day = base.steps_per_day
+        steps = [span / (COARSE_POINTS - 1), self.max_power / (COARSE_POINTS - 1), day / 6, day / 6]
+        resolution = [min(1.0, span or 1.0), self.max_power / 100, 1.0, 1.0]
+        rounds = rounds or max(int(np.ceil(np.log2(step / floor))) for step, floor in zip(steps, resolution)
+                               if step > floor) + 1
+
+        points = set(product(np.linspace(base.min_soc, base.max_soc, COARSE_POINTS),
+                             np.linspace(0.0, self.max_power, COARSE_POINTS),
+                             np.arange(0, day, steps[2]), np.arange(steps[3], day, steps[3])))
+        evaluated = cached = 0
+        best = []
+        pool = nullcontext()
+        if self.max_workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_worker, initargs=(self.load_kw, self.price))
+        with pool as executor:
+            for number in range(rounds):
+                configs = dict.fromkeys(config for config in map(self._config, points) if config is not None)
+                fresh = [config for config in configs if config not in self.summaries]
+                cached += len(configs) - len(fresh)
+                evaluated += len(fresh)
+                self._evaluate(fresh, executor)
+
+                # Ties keep grid order, so the winner does not depend on set iteration order.
+                ranked = sorted(sorted(set(best) | set(configs), key=self._point),
+                                key=lambda config: score(self.summaries[config], objective), reverse=True)
+                best = ranked[:beam]
+                if progress is not None:
+                    progress(number + 1, rounds)
+                steps = [max(step / 2, floor) for step, floor in zip(steps, resolution)]
+                points = {
+                    tuple(value + offset * step for value, offset, step in zip(self._point(config), offsets, steps))
+                    for config in best for offsets in product((-1, 0, 1), repeat=4)
+                }
+
+        winner = best[0]
+        return TuningResult(config=winner, summary=self.summaries[winner],
+                            score=score(self.summaries[winner], objective), objective=objective,
+                            evaluated=evaluated, cached=cached)
+
+    def _config(self, point):
+        """Return the configuration of a grid point snapped to the form's resolution, or None outside the space."""
+        target, power, start, stop = point
+        base = self.base
+        start, stop = int(round(start)), int(round(stop))
+        if not (base.min_soc <= target <= base.max_soc and 0 <= power <= self.max_power
+                and 0 <= start < stop < base.steps_per_day):
+            return None
+        return replace(base, soc_target=round(float(target), 1), power_setpoint=float(round(power)),
+                       start_time=_clock(start, base.timestep_minutes),
+                       end_time=_clock(stop, base.timestep_minutes))
+
+    def _point(self, config):
+        start, stop = config.steer_window()
+        return config.soc_target, config.power_setpoint, start, stop
+
+    def _evaluate(self, configs, executor=None):
+        """Simulate ``configs`` in fleets of ``BATCH_CANDIDATES`` (on ``executor`` when given) and memoise them."""
+        batches = [configs[first:first + BATCH_CANDIDATES] for first in range(0, len(configs), BATCH_CANDIDATES)]
+        if executor is not None and len(batches) > 1:
+            results = executor.map(_run_batch, batches)
+        else:
+            results = (_batch_summaries(batch, self.load_kw, self.price) for batch in batches)
+        for batch, summaries in zip(batches, results):
+            self.summaries.update(zip(batch, summaries))
+
+
+def _batch_summaries(configs, load_kw, price):
+    fleet = Fleet([Asset(f"candidate{index}", config) for index, config in enumerate(configs)])
+    return simulate_fleet(fleet, load_kw, price).asset_summaries()
+
+
+def _init_worker(load_kw, price):
+    _worker_profiles["load_kw"] = load_kw
+    _worker_profiles["price"] = price
+
+
+def _run_batch(configs):
+    return _batch_summaries(configs, _worker_profiles["load_kw"], _worker_profiles["price"])
+
+
+def _clock(step, timestep_minutes=Constants.TIMESTEP_MINUTES):
+    """Return the form's clock text for the start of a step of the day."""
+    return (datetime(2000, 1, 1) + timedelta(minutes=step * timestep_minutes)).strftime(Constants.TIME_FORMAT)
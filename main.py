@@ -1,8 +1,190 @@
-from app import BatteryModelerApp
+import argparse
+import os
+import sys
+
+
+def run(args):
+    """Run one project headless and write the CSV, report and stored run next to each other."""
+    from dataclasses import replace
+
+    from engine.parallel import simulate_parallel
+    from engine.pipeline import export_result
+    from engine.project import load_project
+    from engine.store import save_result
+    from engine.timeseries import load_timeseries, profiles
+
+    try:
+        project = load_project(args.config)
+        if args.optimal:
+            project = replace(project, config=replace(project.config, optimal=True, steer_enabled=False))
+        load_kw = price = None
+        if project.data_file:
+            load_kw, price = profiles(load_timeseries(project.data_file), project.config)
+        result = simulate_parallel(project.config, load_kw, price, max_workers=args.workers)
+    except (OSError, ValueError) as e:
+        print(f"Error running {args.config}: {e}", file=sys.stderr)
+        return 1
+
+    output = args.output or os.path.dirname(os.path.abspath(args.config))
+    os.makedirs(output, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.config))[0]
+    csv_path = os.path.join(output, f"{stem}_results.csv")
+    report_path = os.path.join(output, f"{stem}_report.txt")
+    store_path = os.path.join(output, f"{stem}_run")
+    export_result(result, csv_path, report_path, project.project_name)
+    save_result(result, store_path, {"project_name": project.project_name})
+    for path in (csv_path, report_path, store_path):
+        print(f"Wrote {path}")
+    return 0
+
+
+def fleet(args):
+    """Run a fleet file headless: per-asset and fleet-total CSVs, a per-asset summary table and the report."""
+    from engine.export import write_csv
+    from engine.fleet import fleet_profiles, load_fleet, simulate_fleet, write_asset_summary
+    from engine.report import write_fleet_report
+    from engine.timeseries import load_timeseries
+
+    try:
+        assets = load_fleet(args.config)
+        load_kw = price = None
+        if assets.data_file:
+            load_kw, price = fleet_profiles(assets, load_timeseries(assets.data_file))
+        result = simulate_fleet(assets, load_kw, price)
+    except (OSError, ValueError) as e:
+        print(f"Error running {args.config}: {e}", file=sys.stderr)
+        return 1
+
+    output = args.output or os.path.dirname(os.path.abspath(args.config))
+    os.makedirs(output, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.config))[0]
+    paths = {name: os.path.join(output, f"{stem}_{name}") for name in
+             ("results.csv", "totals.csv", "assets.csv", "report.txt")}
+    write_csv(result, paths["results.csv"], asset_names=result.names)
+    write_csv(result.aggregate(), paths["totals.csv"])
+    write_asset_summary(result, paths["assets.csv"])
+    write_fleet_report(result, paths["report.txt"], assets.project_name)
+    for path in paths.values():
+        print(f"Wrote {path}")
+    return 0
+
+
+def scenarios(args):
+    """Run a project's scenarios headless: the percentile bands as CSV plus the scenario report."""
+    from engine.project import load_project
+    from engine.report import write_scenario_report
+    from engine.scenarios import simulate_scenarios, write_bands
+    from engine.timeseries import load_timeseries, profiles
+
+    try:
+        project = load_project(args.config)
+        if not project.data_file:
+            raise ValueError("the project has no data file to perturb")
+        load_kw, price = profiles(load_timeseries(project.data_file), project.config)
+        result = simulate_scenarios(project.config, load_kw, price, scenarios=args.count, seed=args.seed)
+    except (OSError, ValueError) as e:
+        print(f"Error running {args.config}: {e}", file=sys.stderr)
+        return 1
+
+    output = args.output or os.path.dirname(os.path.abspath(args.config))
+    os.makedirs(output, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.config))[0]
+    bands_path = os.path.join(output, f"{stem}_bands.csv")
+    report_path = os.path.join(output, f"{stem}_scenario_report.txt")
+    write_bands(result, bands_path)
+    write_scenario_report(result, report_path, project.project_name)
+    for path in (bands_path, report_path):
+        print(f"Wrote {path}")
+    return 0
+
+
+def tune(args):
+    """Search a project's steer settings for the best objective; --save writes the winner into the project file."""
+    from dataclasses import replace
+
+    from engine.project import load_project, project_to_dict, save_project
+    from engine.report import REPORT_LABELS
+    from engine.timeseries import load_timeseries, profiles
+    from engine.tuning import Tuner
+
+    try:
+        project = load_project(args.config)
+        load_kw = price = None
+        if project.data_file:
+            load_kw, price = profiles(load_timeseries(project.data_file), project.config)
+        result = Tuner(project.config, load_kw, price, max_workers=args.workers).tune(args.objective)
+    except (OSError, ValueError) as e:
+        print(f"Error tuning {args.config}: {e}", file=sys.stderr)
+        return 1
+
+    config = result.config
+    print(f"Best of {result.evaluated:,} runs ({result.cached:,} served from the cache):")
+    print(f"  Start Time {config.start_time}, End Time {config.end_time}, "
+          f"SoC Target {config.soc_target:g}%, Power Setpoint {config.power_setpoint:g} kW")
+    for name, value in result.summary.items():
+        label, unit = REPORT_LABELS.get(name, (name, ""))
+        print(f"  {label + ':':<28}{value:,.2f} {unit}".rstrip())
+    if args.save:
+        try:
+            save_project(project_to_dict(replace(project, config=config)), args.config)
+        except OSError as e:
+            print(f"Error saving {args.config}: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {args.config}")
+    return 0
+
+
+def gui(args):
+    from app import BatteryModelerApp
 
-def main():
     app = BatteryModelerApp()
     app.mainloop()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Battery System Modeler")
+    parser.set_defaults(handler=gui)
+    commands = parser.add_subparsers(title="commands")
+
+    run_parser = commands.add_parser("run", help="simulate a project file without the GUI")
+    run_parser.add_argument("--config", required=True, help="project JSON file")
+    run_parser.add_argument("--output", help="directory for the CSV and report (default: next to the config)")
+    run_parser.add_argument("--workers", type=int, default=1,
+                            help="processes for long horizons (default: 1, serial; 0: one per core)")
+    run_parser.add_argument("--optimal", action="store_true",
+                            help="dispatch against the price with the rolling linear program instead of the steer")
+    run_parser.set_defaults(handler=run)
+
+    fleet_parser = commands.add_parser("fleet", help="simulate a fleet file (many batteries at once) without the GUI")
+    fleet_parser.add_argument("--config", required=True, help="fleet JSON file")
+    fleet_parser.add_argument("--output", help="directory for the outputs (default: next to the config)")
+    fleet_parser.set_defaults(handler=fleet)
+
+    scenario_parser = commands.add_parser("scenarios", help="simulate perturbed copies of a project's data file "
+                                                            "and report P10/P50/P90 bands")
+    scenario_parser.add_argument("--config", required=True, help="project JSON file")
+    scenario_parser.add_argument("--count", type=int, default=1000, help="number of scenarios (default: 1000)")
+    scenario_parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    scenario_parser.add_argument("--output", help="directory for the outputs (default: next to the config)")
+    scenario_parser.set_defaults(handler=scenarios)
+
+    tune_parser = commands.add_parser("tune", help="search a project's steer settings for the best objective")
+    tune_parser.add_argument("--config", required=True, help="project JSON file")
+    tune_parser.add_argument("--objective", choices=("revenue", "cycles", "limits"), default="revenue",
+                             help="revenue (highest), cycles (fewest) or limits (least time at Min/Max SoC)")
+    tune_parser.add_argument("--workers", type=int, default=0, help="processes (default: 0, one per core)")
+    tune_parser.add_argument("--save", action="store_true", help="write the best settings into the project file")
+    tune_parser.set_defaults(handler=tune)
+
+    commands.add_parser("gui", help="start the graphical interface (default)").set_defaults(handler=gui)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.handler(args)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
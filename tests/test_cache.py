@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from engine.cache import ResultCache, run_key
+from engine.dispatch import DispatchConfig, simulate
+
+
+def make_result(days=2, initial_soc=50):
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=initial_soc, days=days)
+    return config, simulate(config, np.random.default_rng(initial_soc).normal(0, 100, config.steps))
+
+
+def test_memory_keeps_the_most_recently_used_runs(tmp_path):
+    cache = ResultCache(str(tmp_path), memory_entries=2)
+    stored = {key: cache.put(key, make_result(initial_soc=soc)[1]) for key, soc in (("a", 40), ("b", 50))}
+    assert cache.get("a") is stored["a"]
+    cache.put("c", make_result(initial_soc=60)[1])
+    assert list(cache._memory) == ["a", "c"]
+    reopened = cache.get("b")
+    assert reopened is not stored["b"]
+    np.testing.assert_array_equal(reopened.soc, stored["b"].soc)
+
+
+def test_disk_evicts_the_least_recently_used_runs(tmp_path):
+    cache = ResultCache(str(tmp_path), memory_entries=1)
+    cache.put("a", make_result(initial_soc=40)[1])
+    size = sum(entry.stat().st_size for entry in os.scandir(cache.path_for("a")))
+    cache.max_bytes = int(size * 2.5)
+    cache.put("b", make_result(initial_soc=50)[1])
+    # Using "a" makes "b" the least recently used run on disk.
+    for key, used in (("b", 1_000_000_000), ("a", 2_000_000_000)):
+        os.utime(os.path.join(cache.path_for(key), "meta.json"), ns=(used, used))
+    cache.put("c", make_result(initial_soc=60)[1])
+    assert "a" in cache and "c" in cache
+    assert not os.path.exists(cache.path_for("b"))
+    assert cache.get("b") is None
+
+
+def test_key_changes_with_the_data_file_contents(tmp_path):
+    config, _ = make_result()
+    path = tmp_path / "data.csv"
+    path.write_text("load_kw\n1\n")
+    first = run_key(config, str(path))
+    assert run_key(config, str(path)) == first
+    path.write_text("load_kw\n2\n")
+    os.utime(path, ns=(1, 1))
+    assert run_key(config, str(path)) != first
+    assert run_key(config) != first
+    assert run_key(DispatchConfig(min_soc=10, max_soc=90, initial_soc=51, days=2), str(path)) != run_key(config, str(path))
+
+
+def test_lookups_miss_until_a_run_is_stored(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert "a" not in cache and cache.get("a") is None
+    _, result = make_result()
+    cache.put("a", result)
+    cache.clear_memory()
+    assert "a" in cache
+    np.testing.assert_array_equal(cache.get("a").soc, result.soc)
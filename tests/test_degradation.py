@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from engine.degradation import rainflow, turning_points
+
+
+def sequential_four_point(soc):
+    """Count cycles the textbook way: push turning points on a stack, closing inner ranges as they appear."""
+    values = [float(value) for value in np.asarray(soc, dtype=float)]
+    points = [value for index, value in enumerate(values) if index == 0 or value != values[index - 1]]
+    extremes = [value for index, value in enumerate(points)
+                if index in (0, len(points) - 1) or (value - points[index - 1]) * (points[index + 1] - value) < 0]
+    stack, cycles = [], []
+    for point in extremes:
+        stack.append(point)
+        while len(stack) >= 4:
+            a, b, c, d = stack[-4:]
+            inner = abs(c - b)
+            if inner > abs(b - a) or inner > abs(d - c):
+                break
+            cycles.append((inner, (b + c) / 2, 1.0))
+            del stack[-3:-1]
+    cycles += [(abs(b - a), (a + b) / 2, 0.5) for a, b in zip(stack[:-1], stack[1:])]
+    return sorted(cycles)
+
+
+def as_sorted(count):
+    return sorted(zip(count.depths.tolist(), count.means.tolist(), count.counts.tolist()))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rainflow_matches_sequential_four_point(seed):
+    rng = np.random.default_rng(seed)
+    soc = np.clip(50 + np.cumsum(rng.normal(0, 4, 3000)), 0, 100)
+    expected = sequential_four_point(soc)
+    counted = as_sorted(rainflow(soc))
+    assert len(counted) == len(expected)
+    np.testing.assert_allclose(counted, expected, atol=1e-9)
+
+
+def test_rainflow_of_nested_cycles():
+    soc = [50, 90, 10, 70, 30, 60, 40, 95, 5, 50]
+    np.testing.assert_allclose(as_sorted(rainflow(soc)), sequential_four_point(soc), atol=1e-12)
+
+
+def test_flat_stretches_are_one_turning_point():
+    np.testing.assert_array_equal(turning_points([10, 10, 20, 20, 20, 5, 5, 30]), [10, 20, 5, 30])
+
+
+def test_short_traces():
+    assert rainflow([]).cycles == 0
+    assert rainflow([40]).cycles == 0
+    count = rainflow([40, 60])
+    assert count.cycles == 0.5
+    np.testing.assert_allclose(count.depths, [20])
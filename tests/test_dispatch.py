@@ -0,0 +1,97 @@
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig, simulate
+
+
+def reference_soc(config, load_kw=None):
+    """Step-by-step loop over the dispatch rules, independent of the vectorised engine."""
+    to_percent = 100 * config.step_hours / config.capacity_kwh
+    start = datetime.strptime(config.start_time, "%I:%M %p")
+    end = datetime.strptime(config.end_time, "%I:%M %p")
+    window = (start.hour * 60 + start.minute, end.hour * 60 + end.minute)
+    target = min(max(config.soc_target, config.min_soc), config.max_soc)
+    rate = config.power_setpoint * to_percent
+    soc = config.initial_soc
+    out = []
+    for step in range(config.steps):
+        minute = step * config.timestep_minutes % (24 * 60)
+        if config.steer_enabled and window[0] <= minute < window[1]:
+            soc += min(max(target - soc, -rate), rate)
+        else:
+            load = 0.0 if load_kw is None else load_kw[step]
+            soc = min(max(soc - load * to_percent, config.min_soc), config.max_soc)
+        out.append(soc)
+    return np.array(out)
+
+
+def make_config(**values):
+    return replace(DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=14), **values)
+
+
+def make_load(config, seed=0, scale=150.0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, scale, config.steps) + scale * np.sin(np.arange(config.steps) * 2 * np.pi / 96)
+
+
+CONFIGS = {
+    "free": make_config(),
+    "steer_up": make_config(steer_enabled=True, start_time="01:00 AM", end_time="05:00 AM",
+                            soc_target=85, power_setpoint=200),
+    "steer_down": make_config(steer_enabled=True, start_time="05:00 PM", end_time="09:15 PM",
+                              soc_target=15, power_setpoint=400),
+    "target_outside_limits": make_config(steer_enabled=True, start_time="10:00 AM", end_time="02:00 PM",
+                                         soc_target=100, power_setpoint=1000),
+    "hourly": make_config(timestep_minutes=60, steer_enabled=True, start_time="06:00 AM",
+                          end_time="08:00 AM", soc_target=70, power_setpoint=100),
+}
+
+
+@pytest.mark.parametrize("name", CONFIGS)
+def test_simulate_matches_reference_loop(name):
+    config = CONFIGS[name]
+    load_kw = make_load(config)
+    result = simulate(config, load_kw)
+    np.testing.assert_allclose(result.soc, reference_soc(config, load_kw), atol=1e-9)
+
+
+def test_simulate_without_load_holds_soc_outside_windows():
+    config = CONFIGS["steer_up"]
+    np.testing.assert_allclose(simulate(config).soc, reference_soc(config), atol=1e-9)
+
+
+def test_power_is_the_soc_change():
+    config = CONFIGS["steer_down"]
+    result = simulate(config, make_load(config))
+    previous = np.concatenate(([config.initial_soc], result.soc[:-1]))
+    np.testing.assert_allclose(result.power_kw, (previous - result.soc) * config.capacity_kwh
+                               / (100 * config.step_hours), atol=1e-9)
+
+
+def test_chunks_cover_the_horizon_in_order():
+    config = replace(CONFIGS["steer_up"], days=70)
+    load_kw = make_load(config)
+    chunks = []
+    result = simulate(config, load_kw, on_chunk=lambda start, stop, columns: chunks.append((start, stop, columns)))
+    assert [start for start, _, _ in chunks] == [0] + [stop for _, stop, _ in chunks[:-1]]
+    assert chunks[-1][1] == config.steps
+    for start, stop, columns in chunks:
+        for name, values in columns.items():
+            np.testing.assert_allclose(values, getattr(result, name)[start:stop], atol=1e-12)
+
+
+@pytest.mark.parametrize("text, expected", [("false", False), ("0", False), ("", False), ("True", True),
+                                            ("yes", True), (1, True), (False, False)])
+def test_from_dict_reads_boolean_text(text, expected):
+    config = DispatchConfig.from_dict({"min_soc": 10, "max_soc": 90, "initial_soc": 50,
+                                       "steer_enabled": text, "optimal": text})
+    assert config.steer_enabled is expected
+    assert config.optimal is expected
+
+
+def test_from_dict_rejects_unknown_boolean_text():
+    with pytest.raises(ValueError, match="steer_enabled must be true or false"):
+        DispatchConfig.from_dict({"min_soc": 10, "max_soc": 90, "initial_soc": 50, "steer_enabled": "maybe"})
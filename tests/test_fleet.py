@@ -0,0 +1,65 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.fleet import Asset, Fleet, simulate_fleet
+from engine.schedule import Schedule
+
+
+def make_fleet():
+    common = dict(days=40, start_date="2024-01-20")
+    configs = [
+        DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, **common),
+        DispatchConfig(min_soc=20, max_soc=80, initial_soc=30, capacity_kwh=500, steer_enabled=True,
+                       start_time="05:00 PM", end_time="08:00 PM", soc_target=25, power_setpoint=150, **common),
+        DispatchConfig(min_soc=5, max_soc=95, initial_soc=90, capacity_kwh=2000, steer_enabled=True,
+                       start_time="05:00 PM", end_time="08:00 PM", soc_target=95, power_setpoint=600, **common),
+        DispatchConfig(min_soc=0, max_soc=100, initial_soc=60, steer_enabled=True,
+                       start_time="01:00 AM", end_time="04:30 AM", soc_target=100, power_setpoint=250, **common),
+    ]
+    return Fleet(assets=[Asset(name=f"site{index}", config=config) for index, config in enumerate(configs)])
+
+
+def test_fleet_matches_per_asset_runs():
+    fleet = make_fleet()
+    steps = fleet.config.steps
+    load_kw = np.random.default_rng(3).normal(0, 150, (len(fleet.assets), steps))
+    result = simulate_fleet(fleet, load_kw)
+    for index, asset in enumerate(fleet.assets):
+        single = simulate(asset.config, load_kw[index])
+        np.testing.assert_allclose(result.soc[index], single.soc, atol=1e-9)
+        np.testing.assert_allclose(result.power_kw[index], single.power_kw, atol=1e-6)
+        np.testing.assert_allclose(result.setpoint_kw[index], single.setpoint_kw, atol=1e-6)
+
+
+def test_shared_load_and_schedules_match_per_asset_runs():
+    fleet = make_fleet()
+    schedule = Schedule.from_dict({
+        "rules": [
+            {"days": ["weekday"], "windows": [
+                {"start_time": "06:00 AM", "end_time": "07:00 AM", "soc_target": 70, "power_setpoint": 300},
+                {"start_time": "06:00 PM", "end_time": "09:00 PM", "soc_target": 30, "power_setpoint": 200}]},
+            {"days": ["sat"], "windows": [
+                {"start_time": "12:00 PM", "end_time": "01:00 PM", "soc_target": 50, "power_setpoint": 100}]},
+        ],
+        "holidays": ["2024-02-19"],
+    })
+    for index in (1, 3):
+        asset = fleet.assets[index]
+        fleet.assets[index] = replace(asset, config=replace(asset.config, schedule=schedule))
+    load_kw = np.random.default_rng(4).normal(0, 100, fleet.config.steps)
+    result = simulate_fleet(fleet, load_kw)
+    for index, asset in enumerate(fleet.assets):
+        np.testing.assert_allclose(result.soc[index], simulate(asset.config, load_kw).soc, atol=1e-9)
+
+
+def test_summary_columns_match_asset_summaries():
+    fleet = make_fleet()
+    load_kw = np.random.default_rng(5).normal(0, 150, fleet.config.steps)
+    result = simulate_fleet(fleet, load_kw)
+    for index, asset in enumerate(fleet.assets):
+        expected = simulate(asset.config, load_kw).summary()
+        summary = result.asset_summaries()[index]
+        assert summary == pytest.approx(expected, abs=1e-6)
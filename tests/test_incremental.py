@@ -0,0 +1,63 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.incremental import resimulate
+
+
+def make_config(**values):
+    return replace(DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=14, steer_enabled=True,
+                                  start_time="01:00 AM", end_time="05:00 AM", soc_target=85,
+                                  power_setpoint=200), **values)
+
+
+def make_load(config, seed=0):
+    return np.random.default_rng(seed).normal(0, 150, config.steps)
+
+
+@pytest.mark.parametrize("change", [{"soc_target": 60}, {"initial_soc": 30}, {"power_setpoint": 50}])
+def test_resimulate_matches_simulate(change):
+    config = make_config()
+    load_kw = make_load(config)
+    previous = simulate(config, load_kw)
+    changed = replace(config, **change)
+    result, _ = resimulate(previous, changed, load_kw)
+    np.testing.assert_allclose(result.soc, simulate(changed, load_kw).soc, atol=1e-9)
+
+
+def test_local_load_change_recomputes_a_short_span():
+    config = make_config()
+    load_kw = make_load(config)
+    previous = simulate(config, load_kw)
+    changed = load_kw.copy()
+    changed[500:510] += 80
+    result, (start, stop) = resimulate(previous, config, changed)
+    assert start <= 500 and stop - start < config.steps // 2
+    np.testing.assert_allclose(result.soc, simulate(config, changed).soc, atol=1e-9)
+
+
+def test_unchanged_inputs_reuse_the_previous_run():
+    config = make_config()
+    load_kw = make_load(config)
+    previous = simulate(config, load_kw)
+    result, span = resimulate(previous, config, load_kw)
+    assert span == (0, 0)
+    np.testing.assert_array_equal(result.soc, previous.soc)
+
+
+def test_chunks_of_a_resumed_run_cover_the_horizon_in_order():
+    config = make_config()
+    load_kw = make_load(config)
+    previous = simulate(config, load_kw)
+    changed = load_kw.copy()
+    changed[700:720] -= 60
+    chunks = []
+    result, _ = resimulate(previous, config, changed,
+                           on_chunk=lambda start, stop, columns: chunks.append((start, stop, columns)))
+    assert [start for start, _, _ in chunks] == [0] + [stop for _, stop, _ in chunks[:-1]]
+    assert chunks[-1][1] == config.steps
+    for start, stop, columns in chunks:
+        for name, values in columns.items():
+            np.testing.assert_allclose(values, getattr(result, name)[start:stop], atol=1e-9)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig
+from engine.optimal import TOLERANCE, simulate_optimal, solve_window
+
+
+def best_value(price, initial, lo, hi, rate, grid):
+    """Optimum of the window's linear program by dynamic programming over a SoC grid.
+
+    With ``initial``, ``lo``, ``hi`` and ``rate`` multiples of ``grid`` every
+    vertex of the feasible set has its SoC path on the grid, so the best path
+    on the grid is the optimum.
+    """
+    levels = np.arange(lo, hi + grid / 2, grid)
+    moves = np.arange(-rate, rate + grid / 2, grid)
+    value = np.where(np.isclose(levels, initial), 0.0, -np.inf)
+    for step_price in price:
+        best = np.full(levels.size, -np.inf)
+        for move in moves:
+            # Discharging ``move`` % takes the SoC from level + move down to level and earns price * move / rate.
+            source = np.searchsorted(levels, levels + move - grid / 2)
+            inside = (source < levels.size) & np.isclose(levels[np.minimum(source, levels.size - 1)], levels + move)
+            candidate = np.where(inside, value[np.minimum(source, levels.size - 1)], -np.inf) + step_price * move / rate
+            best = np.maximum(best, candidate)
+        value = best
+    return value.max()
+
+
+@pytest.mark.parametrize("initial, lo, hi, rate, grid", [
+    (50, 10, 90, 20, 10),
+    (45, 10, 90, 20, 5),
+    (30, 0, 100, 35, 5),
+    (80, 20, 80, 15, 5),
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_solve_window_reaches_the_optimum(initial, lo, hi, rate, grid, seed):
+    price = np.random.default_rng(seed).uniform(-20, 120, 12)
+    solution = solve_window(price, initial, lo, hi, rate)
+    soc = initial - rate * np.cumsum(solution.x)
+    assert np.all(np.abs(solution.x) <= 1 + 1e-6)
+    assert np.all((soc >= lo - 1e-4) & (soc <= hi + 1e-4))
+    assert price @ solution.x == pytest.approx(best_value(price, initial, lo, hi, rate, grid), abs=1e-3)
+
+
+def test_solve_window_follows_the_price_sign_when_limits_do_not_bind():
+    price = np.array([30.0, -10.0, 55.0, -5.0, 12.0, -40.0])
+    solution = solve_window(price, 50, 0, 100, 1)
+    np.testing.assert_allclose(solution.x, np.sign(price), atol=1e-5)
+
+
+def make_run(days=5, seed=7):
+    config = DispatchConfig(min_soc=15, max_soc=85, initial_soc=40, days=days, optimal=True)
+    steps = np.arange(config.steps)
+    rng = np.random.default_rng(seed)
+    price = 60 + 40 * np.sin(steps * 2 * np.pi / config.steps_per_day) + rng.normal(0, 15, config.steps)
+    return config, price
+
+
+def test_soc_and_power_stay_within_limits():
+    config, price = make_run()
+    max_power = 400.0
+    result = simulate_optimal(config, price=price, max_power=max_power)
+    assert result.soc.min() >= config.min_soc
+    assert result.soc.max() <= config.max_soc
+    # Snapping the SoC onto a limit may move either end of a step by TOLERANCE of a full-power step.
+    assert np.abs(result.power_kw).max() <= max_power * (1 + 2 * TOLERANCE)
+    assert np.abs(result.setpoint_kw).max() <= max_power * (1 + 1e-9)
+    assert result.summary()["revenue"] > 0
+
+
+def test_warm_and_cold_starts_earn_the_same():
+    config, price = make_run()
+    warm = simulate_optimal(config, price=price, max_power=300.0).summary()["revenue"]
+    cold = simulate_optimal(config, price=price, max_power=300.0, warm_start=False).summary()["revenue"]
+    assert warm == pytest.approx(cold, rel=1e-5)
@@ -0,0 +1,24 @@
+import numpy as np
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.parallel import MIN_CHUNK_STEPS, simulate_parallel
+
+
+def test_simulate_parallel_matches_simulate():
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=365, timestep_minutes=1,
+                            steer_enabled=True, start_time="05:00 PM", end_time="08:00 PM",
+                            soc_target=20, power_setpoint=300)
+    assert config.steps >= 2 * MIN_CHUNK_STEPS
+    rng = np.random.default_rng(1)
+    load_kw = rng.normal(0, 120, config.steps) + 100 * np.sin(np.arange(config.steps) * 2 * np.pi / 1440)
+    serial = simulate(config, load_kw)
+    parallel = simulate_parallel(config, load_kw, max_workers=2, chunks=4)
+    np.testing.assert_allclose(parallel.soc, serial.soc, atol=1e-9)
+    np.testing.assert_allclose(parallel.power_kw, serial.power_kw, atol=1e-6)
+
+
+def test_short_horizons_run_serially():
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=30)
+    load_kw = np.random.default_rng(2).normal(0, 100, config.steps)
+    np.testing.assert_array_equal(simulate_parallel(config, load_kw, max_workers=2).soc,
+                                  simulate(config, load_kw).soc)
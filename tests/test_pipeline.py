@@ -0,0 +1,75 @@
+import threading
+
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.export import write_csv
+from engine.pipeline import Consumer, export_result, fan_out
+from engine.report import write_report
+from engine.runner import RunCancelled
+
+
+def make_result():
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=20, steer_enabled=True,
+                            start_time="05:00 PM", end_time="08:00 PM", soc_target=20, power_setpoint=300)
+    rng = np.random.default_rng(8)
+    return simulate(config, rng.normal(0, 150, config.steps), rng.uniform(20, 120, config.steps))
+
+
+class Recorder(Consumer):
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.failed = threading.Event()
+        self.blocks = []
+        self.closed = False
+
+    def consume(self, start, stop, columns):
+        if start == self.fail_at:
+            self.failed.set()
+            raise OSError("disk full")
+        self.blocks.append((start, stop))
+
+    def finish(self):
+        return self.blocks
+
+    def close(self):
+        self.closed = True
+
+
+def test_export_matches_the_separate_writers(tmp_path):
+    result = make_result()
+    write_csv(result, tmp_path / "alone.csv", block_rows=500)
+    write_report(result, tmp_path / "alone.txt", "Site")
+    outputs = export_result(result, tmp_path / "fan.csv", tmp_path / "fan.txt", "Site", envelopes=True,
+                            block_rows=333)
+    assert (tmp_path / "fan.csv").read_bytes() == (tmp_path / "alone.csv").read_bytes()
+    assert (tmp_path / "fan.txt").read_bytes() == (tmp_path / "alone.txt").read_bytes()
+    assert set(outputs["envelopes"]) == {"soc", "power_kw", "setpoint_kw"}
+
+
+def test_every_consumer_sees_every_block_in_order():
+    result = make_result()
+    outputs = fan_out(result, {"a": Recorder(), "b": Recorder()}, block_rows=700)
+    expected = [(start, min(start + 700, result.steps)) for start in range(0, result.steps, 700)]
+    assert outputs == {"a": expected, "b": expected}
+
+
+def test_a_failing_consumer_stops_the_export_and_closes_the_others():
+    consumers = {"ok": Recorder(), "bad": Recorder(fail_at=700), "other": Recorder()}
+    with pytest.raises(OSError, match="disk full"):
+        fan_out(make_result(), consumers, block_rows=700)
+    assert all(consumer.closed for consumer in consumers.values())
+
+
+def test_a_cancel_is_not_replaced_by_a_consumer_error():
+    consumers = {"ok": Recorder(), "bad": Recorder(fail_at=0)}
+
+    def progress(done, total):
+        # Cancel only once the consumer has failed, so both errors are pending.
+        consumers["bad"].failed.wait()
+        raise RunCancelled()
+
+    with pytest.raises(RunCancelled):
+        fan_out(make_result(), consumers, progress=progress, block_rows=700)
+    assert all(consumer.closed for consumer in consumers.values())
@@ -0,0 +1,31 @@
+import os
+
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.project import form_from_dict, form_to_dict, read_project, run_is_current, run_reference, save_project
+from engine.store import save_result
+
+
+def make_project(tmp_path):
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=2)
+    store = save_result(simulate(config, np.zeros(config.steps)), str(tmp_path / "runs" / "abc"))
+    return form_to_dict("Site", "", config.to_dict(), run_reference(store))
+
+
+def test_embedded_run_is_copied_next_to_the_project(tmp_path):
+    path = save_project(make_project(tmp_path), tmp_path / "site.json", embed_run=True)
+    _, _, values, run = form_from_dict(read_project(path), str(tmp_path))
+    assert run["path"] == str(tmp_path / "site_run")
+    assert run_is_current(run)
+    assert values["min_soc"] == 10
+
+
+def test_failed_embed_leaves_no_staging_directory(tmp_path):
+    data = make_project(tmp_path)
+    data["run"]["path"] = str(tmp_path / "runs" / "missing")
+    with pytest.raises(OSError):
+        save_project(data, tmp_path / "site.json", embed_run=True)
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".tmp-")]
+    assert not os.path.exists(tmp_path / "site.json")
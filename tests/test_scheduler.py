@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from engine.cache import ResultCache
+from engine.dispatch import DispatchConfig
+from engine.scheduler import PRIORITIES, RunScheduler
+
+
+def make_config(initial_soc=50, days=30):
+    return DispatchConfig(min_soc=10, max_soc=90, initial_soc=initial_soc, days=days)
+
+
+def wait_for(scheduler, timeout=120):
+    deadline = time.monotonic() + timeout
+    while any(job.status in ("queued", "running") for job in scheduler.jobs):
+        assert time.monotonic() < deadline, "the queue did not finish in time"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    scheduler = RunScheduler(ResultCache(str(tmp_path)), max_workers=1)
+    scheduler.listening = True
+    yield scheduler
+    scheduler.shutdown(wait=True)
+
+
+def test_higher_priorities_start_first(scheduler):
+    first, _ = scheduler.submit(make_config(40))
+    low, _ = scheduler.submit(make_config(41), priority=PRIORITIES["Low"])
+    normal, _ = scheduler.submit(make_config(42), priority=PRIORITIES["Normal"])
+    high, _ = scheduler.submit(make_config(43), priority=PRIORITIES["High"])
+    wait_for(scheduler)
+    assert all(job.status == "done" for job in scheduler.jobs)
+    started = sorted(scheduler.jobs, key=lambda job: job.started)
+    assert started == [first, high, normal, low]
+    assert all(job.key in scheduler.cache for job in started)
+
+
+def test_identical_runs_are_queued_once(scheduler):
+    scheduler.submit(make_config(40))
+    queued, added = scheduler.submit(make_config(41), priority=PRIORITIES["Low"])
+    again, added_again = scheduler.submit(make_config(41), priority=PRIORITIES["High"])
+    assert added and not added_again and again is queued
+    assert queued.priority == PRIORITIES["High"]
+    wait_for(scheduler)
+    assert len(scheduler.jobs) == 2
+    cached, added = scheduler.submit(make_config(41))
+    assert added and cached.status == "done" and cached.key == queued.key
+
+
+def test_only_queued_jobs_can_be_cancelled(scheduler):
+    running, _ = scheduler.submit(make_config(40, days=120))
+    queued, _ = scheduler.submit(make_config(41))
+    assert running.status == "running"
+    assert scheduler.cancel(queued)
+    assert not scheduler.cancel(running)
+    assert not scheduler.cancel(queued)
+    wait_for(scheduler)
+    assert (running.status, queued.status) == ("done", "cancelled")
+    assert queued.started is None and queued.key not in scheduler.cache
+
+
+def test_failed_runs_keep_their_error(scheduler, tmp_path):
+    job, _ = scheduler.submit(make_config(), data_file=str(tmp_path / "missing.csv"))
+    wait_for(scheduler)
+    assert job.status == "failed" and "missing.csv" in job.error
+
+
+def test_status_changes_are_only_queued_while_listening(tmp_path):
+    scheduler = RunScheduler(ResultCache(str(tmp_path)), max_workers=1)
+    try:
+        job, _ = scheduler.submit(make_config())
+        scheduler.cancel(scheduler.submit(make_config(41))[0])
+        wait_for(scheduler)
+        assert scheduler.drain() == []
+        scheduler.listening = True
+        scheduler.submit(make_config(42))
+        assert scheduler.drain()
+    finally:
+        scheduler.shutdown(wait=True)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig, simulate
+from engine.sweep import build_grid, iter_sweep
+
+
+def test_one_point_sweep_matches_simulate():
+    config = DispatchConfig(min_soc=10, max_soc=90, initial_soc=50, days=10, steer_enabled=True,
+                            start_time="05:00 PM", end_time="08:00 PM", soc_target=20, power_setpoint=300)
+    rng = np.random.default_rng(6)
+    load_kw = rng.normal(0, 150, config.steps)
+    price = rng.uniform(20, 120, config.steps)
+    configs = build_grid(config, min_soc=[10])
+    assert configs == [config]
+    [(index, swept, summary)] = list(iter_sweep(configs, load_kw, price, max_workers=1))
+    assert (index, swept) == (0, config)
+    assert summary == pytest.approx(simulate(config, load_kw, price).summary(), rel=1e-12)
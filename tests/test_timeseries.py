@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from engine.dispatch import DispatchConfig
+from engine.timeseries import TimeSeries, align, load_timeseries, parse_delimited
+
+
+def write(tmp_path, text, name="data.csv"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_us_timestamps_with_empty_cell(tmp_path):
+    path = write(tmp_path, "time,load_kw\n01/15/2024 08:00,1.5\n01/15/2024 08:15,\n01/15/2024 08:30,2\n")
+    timestamps, columns, skipped = parse_delimited(path)
+    assert timestamps.tolist() == np.array(["2024-01-15T08:00", "2024-01-15T08:15", "2024-01-15T08:30"],
+                                           dtype="datetime64[m]").tolist()
+    np.testing.assert_array_equal(columns["load_kw"], [1.5, np.nan, 2.0])
+    assert skipped == []
+
+
+def test_us_timestamps_without_empty_cell(tmp_path):
+    path = write(tmp_path, "time,load_kw\n01/15/2024 08:00,1.5\n01/15/2024 08:15,2\n")
+    timestamps, columns, _ = parse_delimited(path)
+    assert timestamps[1] == np.datetime64("2024-01-15T08:15")
+    np.testing.assert_array_equal(columns["load_kw"], [1.5, 2.0])
+
+
+def test_semicolon_delimiter_bom_and_crlf(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes("﻿time;load_kw;price\r\n2024-01-01T00:00;1.5;30\r\n2024-01-01T00:15;2;31\r\n".encode("utf-8"))
+    timestamps, columns, _ = parse_delimited(str(path))
+    assert list(columns) == ["load_kw", "price"]
+    assert timestamps[1] == np.datetime64("2024-01-01T00:15")
+    np.testing.assert_array_equal(columns["price"], [30, 31])
+
+
+def test_quoted_cells_and_text_columns(tmp_path):
+    path = write(tmp_path, 'time\t"site"\t"load_kw"\n"2024-01-01 00:00"\t"north"\t"1.25"\n"2024-01-01 00:15"\tsouth\t3\n')
+    timestamps, columns, skipped = parse_delimited(path)
+    assert skipped == ["site"]
+    np.testing.assert_array_equal(columns["load_kw"], [1.25, 3])
+    assert timestamps[0] == np.datetime64("2024-01-01T00:00")
+
+
+def test_ragged_row_reports_its_line(tmp_path):
+    path = write(tmp_path, "time,load_kw\n2024-01-01T00:00,1\n2024-01-01T00:15,2,3\n")
+    with pytest.raises(ValueError, match="line 3"):
+        parse_delimited(path)
+
+
+def test_header_only_and_text_only_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="no data rows"):
+        parse_delimited(write(tmp_path, "time,load_kw\n", "empty.csv"))
+    with pytest.raises(ValueError, match="no numeric columns"):
+        parse_delimited(write(tmp_path, "site,owner\nnorth,a\n", "text.csv"))
+
+
+def test_small_blocks_parse_like_one_block(tmp_path):
+    rows = "".join(f"01/{day:02d}/2024 {hour:02d}:00,{day * 24 + hour},{'' if hour == 5 else hour}\n"
+                   for day in range(1, 11) for hour in range(24))
+    path = write(tmp_path, "time,load_kw,price\n" + rows)
+    whole = parse_delimited(path)
+    blocks = parse_delimited(path, chunk_bytes=64)
+    np.testing.assert_array_equal(blocks[0], whole[0])
+    for name in whole[1]:
+        np.testing.assert_array_equal(blocks[1][name], whole[1][name])
+    assert np.isnan(whole[1]["price"][5])
+
+
+def test_sidecar_is_reused_and_rebuilt_when_the_file_changes(tmp_path):
+    path = write(tmp_path, "time,load_kw\n2024-01-01T00:00,1\n")
+    assert load_timeseries(path).columns["load_kw"].tolist() == [1.0]
+    assert isinstance(load_timeseries(path).columns["load_kw"], np.memmap)
+    write(tmp_path, "time,load_kw\n2024-01-01T00:00,1\n2024-01-01T00:15,7\n")
+    assert load_timeseries(path).columns["load_kw"].tolist() == [1.0, 7.0]
+
+
+def test_align_averages_finer_data_and_holds_gaps():
+    config = DispatchConfig(min_soc=0, max_soc=100, initial_soc=50, days=1, timestep_minutes=60)
+    timestamps = np.array(["2024-01-01T01:00", "2024-01-01T01:30", "2024-01-01T04:00"], dtype="datetime64[m]")
+    series = TimeSeries(path="", timestamps=timestamps, columns={"load_kw": np.array([2.0, 4.0, 10.0])})
+    aligned = align(series, config, "load_kw")
+    np.testing.assert_array_equal(aligned[:6], [3, 3, 3, 3, 10, 10])
+    assert aligned[-1] == 10
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+from config.constants import Constants
+
+_shared = None
+
+
+def shared_assets(widget):
+    """Return the application's ImageAssets, creating it on first use."""
+    global _shared
+    if _shared is None:
+        _shared = ImageAssets(widget.nametowidget("."))
+    return _shared
+
+
+class ImageAssets:
+    """Images decoded once, off the Tk thread, and shared by every frame.
+
+    Pillow images are decoded and resized on a worker thread and kept in an LRU
+    keyed by ``(path, size)``; ``size`` None is the image as stored. The Tk
+    images built from them live in a second LRU that only the Tk thread
+    touches, since only that thread may create them.
+    """
+
+    def __init__(self, widget, max_entries=Constants.ASSET_CACHE_ENTRIES):
+        self.widget = widget
+        self.max_entries = max_entries
+        self._images = OrderedDict()
+        self._tk_images = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+
+    def preload(self, path, size=None):
+        """Start decoding ``path`` at ``size`` in the background; returns a Future of the Pillow image."""
+        key = (path, size)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                future = Future()
+                future.set_result(image)
+                return future
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._executor.submit(self._load, key)
+            return future
+
+    def image(self, path, size=None):
+        """Return the decoded Pillow image, waiting for the worker if it is still busy."""
+        return self.preload(path, size).result()
+
+    def when_ready(self, path, size, callback):
+        """Call ``callback()`` on the Tk thread once ``path`` at ``size`` is decoded (or has failed)."""
+        if self.preload(path, size).done():
+            callback()
+        else:
+            self.widget.after(Constants.UI_POLL_MS, self.when_ready, path, size, callback)
+
+    def photo(self, path, size=None):
+        """Return a shared ``ImageTk.PhotoImage``; Tk thread only."""
+        return self._tk_image("photo", path, size)
+
+    def ctk_image(self, path, size=None):
+        """Return a shared ``CTkImage``; Tk thread only."""
+        return self._tk_image("ctk", path, size)
+
+    def _tk_image(self, kind, path, size):
+        key = (kind, path, size)
+        tk_image = self._tk_images.get(key)
+        if tk_image is None:
+            image = self.image(path, size)
+            if kind == "photo":
+                from PIL import ImageTk
+
+                tk_image = ImageTk.PhotoImage(image, master=self.widget)
+            else:
+                import customtkinter as ctk
+
+                tk_image = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+            self._tk_images[key] = tk_image
+        self._tk_images.move_to_end(key)
+        while len(self._tk_images) > self.max_entries:
+            self._tk_images.popitem(last=False)
+        return tk_image
+
+    def _load(self, key):
+        # A failed decode stays pending so later requests see the same error.
+        image = self._decode(*key)
+        with self._lock:
+            self._pending.pop(key, None)
+        return image
+
+    def _decode(self, path, size):
+        from PIL import Image
+
+        with self._lock:
+            image = self._images.get((path, size))
+        if image is not None:
+            return image
+        if size is None:
+            with Image.open(path) as source:
+                image = source.convert("RGBA")
+        else:
+            original = self._decode(path, None)
+            image = original if original.size == size else original.resize(size, Image.LANCZOS)
+        with self._lock:
+            self._images[(path, size)] = image
+            self._images.move_to_end((path, size))
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return image
@@ -0,0 +1,87 @@
+from collections import Counter
+
+
+class FormState:
+    """Parsed form values, revalidated once per idle cycle however many edits arrive.
+
+    Widgets call ``changed(name)`` from their traces and bindings. That only
+    records the field and schedules a single ``after_idle`` flush; the flush
+    re-reads and parses just the fields that changed, keeps the parsed values
+    in ``values`` for everyone else to reuse, and calls the listeners once with
+    the names whose parsed value actually differs. ``counters`` tallies every
+    step so the cost of a keystroke can be measured.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.readers = {}
+        self.parsers = {}
+        self.raw = {}
+        self.values = {}
+        self.listeners = []
+        self.counters = Counter()
+        self._dirty = set()
+        self._idle_id = None
+
+    def add_field(self, name, read, parse=None):
+        """Register a field; ``read()`` returns its raw value and ``parse`` turns it into ``values[name]``."""
+        self.readers[name] = read
+        self.parsers[name] = parse
+        self._dirty.add(name)
+        self._schedule()
+
+    def add_listener(self, listener):
+        """``listener(form, changed_names)`` runs after each flush that changed something."""
+        self.listeners.append(listener)
+
+    def changed(self, name, *args):
+        self.counters["changed"] += 1
+        self._dirty.add(name)
+        self._schedule()
+
+    def flush(self):
+        """Apply pending changes now instead of waiting for the idle callback."""
+        if self._idle_id is not None:
+            self.widget.after_cancel(self._idle_id)
+        self._flush()
+
+    def _schedule(self):
+        if self._idle_id is None:
+            self._idle_id = self.widget.after_idle(self._flush)
+            self.counters["scheduled"] += 1
+
+    def _flush(self):
+        self._idle_id = None
+        self.counters["flush"] += 1
+        changed = set()
+        for name in self._dirty:
+            raw = self.readers[name]()
+            if name in self.raw and raw == self.raw[name]:
+                continue
+            self.counters["parsed"] += 1
+            self.raw[name] = raw
+            parse = self.parsers[name]
+            try:
+                value = parse(raw) if parse else raw
+            except ValueError:
+                value = None
+            if name in self.values and self.values[name] == value:
+                continue
+            self.values[name] = value
+            changed.add(name)
+        self._dirty.clear()
+        if not changed:
+            return
+        for listener in self.listeners:
+            self.counters["listener"] += 1
+            listener(self, changed)
+
+
+def parse_number(text):
+    """Parse an entry's text; empty text means 'not set yet'."""
+    return float(text) if text.strip() else None
+
+
+def format_number(value):
+    """Inverse of parse_number for filling an entry."""
+    return "" if value is None else f"{value:g}"
@@ -1,13 +1,24 @@
 from datetime import datetime, timedelta
+import os
 import re
 from tkinter import ttk,Tk 
+from tkinter import filedialog, messagebox
 import customtkinter as ctk
 import tkinter as tk
+from .assets import shared_assets
 from .base import BaseFrame  
+from .form import FormState, format_number, parse_number
+from .viewer import DiagramViewer
 from config.constants import Constants 
-import time
-import threading
-from PIL import Image, ImageTk
+from engine.dispatch import DispatchConfig, simulate, time_options
+from engine.export import write_csv
+from engine.incremental import resimulate
+from engine.pipeline import export_result
+from engine.report import write_report
+from engine.runner import RunController
+from engine.cache import ResultCache, run_key
+from engine.store import open_result
+from engine.timeseries import load_timeseries, profiles
 
 class ProjectInfoFrame(BaseFrame):
     def __init__(self, master, **kwargs):
@@ -54,12 +65,26 @@ class ProjectInfoFrame(BaseFrame):
         self.file_name_entry.grid(row=1, column=3, padx=(0, 0),
                                 pady=Constants.PAD_Y, ipady=3, sticky='ew')
 
+    def get_values(self):
+        return {
+            "project_name": self.project_name_entry.get().strip(),
+            "data_file": self.file_name_entry.get().strip(),
+        }
+
+    def set_values(self, project_name, data_file):
+        for entry, value in ((self.project_name_entry, project_name), (self.file_name_entry, data_file)):
+            entry.delete(0, "end")
+            if value:
+                entry.insert(0, value)
+
 class OperationalLimitsFrame(BaseFrame):
     def __init__(self, master, parent_frame, **kwargs):
+        self.parent_frame = parent_frame
+        self.form_state = parent_frame.form_state
+        self._initial_soc_valid = None
         super().__init__(master, **kwargs)
         self._create_section_header("Operational Limits")
-        self.parent_frame = parent_frame
-        self._create_widgets()
+        self.form_state.add_listener(self._on_form_change)
 
     def _create_widgets(self):
         self._create_max_soc_field()
@@ -70,22 +95,22 @@ class OperationalLimitsFrame(BaseFrame):
         self.initial_soc_var = ctk.StringVar()
 
         fields = [
-            ("Max SoC:", self.max_soc_var, 2),
-            ("Initial SoC:", self.initial_soc_var, 3)
+            ("Max SoC:", "max_soc", self.max_soc_var, 2),
+            ("Initial SoC:", "initial_soc", self.initial_soc_var, 3)
         ]
 
-        for label_text, var, row in fields:
+        for label_text, name, var, row in fields:
             self._create_entry_field(label_text, row, 0, 1, var)
-            var.trace_add('write', self._validate_numeric_input)
-            var.trace_add('write', self._validate_initial_soc)
-            var.trace_add('write', self._notify_parent)
+            self._track_field(name, var)
 
     def _create_min_soc_field(self):
         self.min_soc_var = ctk.StringVar()
         self._create_entry_field("Min SoC:", 1, 0, 1, self.min_soc_var)
-        self.min_soc_var.trace_add('write', self._validate_numeric_input)
-        self.min_soc_var.trace_add('write', self._validate_initial_soc)
-        self.min_soc_var.trace_add('write', self._notify_parent)
+        self._track_field("min_soc", self.min_soc_var)
+
+    def _track_field(self, name, var):
+        var.trace_add('write', lambda *args: self._on_field_write(name, var))
+        self.form_state.add_field(name, var.get, parse_number)
 
     def _create_entry_field(self, label_text, row, col, span, var):
         """Creates an entry field with a placeholder and numeric validation."""
@@ -121,43 +146,49 @@ class OperationalLimitsFrame(BaseFrame):
 
         return entry
 
-    def _validate_numeric_input(self, *args):
-        """Ensure only numeric input (integers or floats) is entered."""
-        for var in [self.min_soc_var, self.max_soc_var, self.initial_soc_var]:
-            value = var.get()
-
-        
-            if not re.fullmatch(r"^\d*\.?\d*$", value) and value != "":
-                var.set(re.sub(r"[^0-9.]", "", value))  
-
-        
-            if value.count('.') > 1:
-                var.set(value[:value.rfind('.')])  
-
-
-    def _validate_initial_soc(self, *args):
-        """Ensure Initial SoC is within the Min/Max SoC range."""
-        try:
-            min_soc = float(self.min_soc_var.get()) if self.min_soc_var.get() else 0
-            max_soc = float(self.max_soc_var.get()) if self.max_soc_var.get() else 100
-            initial_soc = float(self.initial_soc_var.get()) if self.initial_soc_var.get() else None
-
-            if initial_soc is None:
-                return  
-
-            if min_soc <= initial_soc <= max_soc:
-                self.initial_soc_entry.configure(border_color=Constants.BORDER_COLOR)  
-                return True
-            else:
-                self.initial_soc_entry.configure(border_color="red") 
-                return False 
-        except ValueError:
-            pass  
-
-    def _notify_parent(self, *args):
-        """Notify the parent frame when values change."""
-        if self.parent_frame and hasattr(self.parent_frame, '_update_run_button'):
-            self.parent_frame._update_run_button()
+    def _on_field_write(self, name, var):
+        """Keep only numeric input in the edited field, then hand the change to the form state."""
+        value = var.get()
+        cleaned = re.sub(r"[^0-9.]", "", value)
+        if cleaned.count('.') > 1:
+            cleaned = cleaned[:cleaned.rfind('.')]
+        if cleaned != value:
+            var.set(cleaned)
+            return
+        self.form_state.changed(name)
+
+    @staticmethod
+    def initial_soc_in_range(values):
+        """True/False once Initial SoC is set, None while it is empty."""
+        initial_soc = values.get("initial_soc")
+        if initial_soc is None:
+            return None
+        min_soc = values.get("min_soc")
+        max_soc = values.get("max_soc")
+        min_soc = 0 if min_soc is None else min_soc
+        max_soc = 100 if max_soc is None else max_soc
+        return min_soc <= initial_soc <= max_soc
+
+    def _on_form_change(self, form, changed):
+        """Recolour the Initial SoC border only when its validity flips."""
+        if not changed & {"min_soc", "max_soc", "initial_soc"}:
+            return
+        valid = self.initial_soc_in_range(form.values)
+        if valid == self._initial_soc_valid:
+            return
+        self._initial_soc_valid = valid
+        self.initial_soc_entry.configure(border_color="red" if valid is False else Constants.BORDER_COLOR)
+
+    def get_values(self):
+        """Return the parsed SoC limits (None while a field is empty), keyed like DispatchConfig."""
+        values = self.form_state.values
+        return {name: values.get(name) for name in ("min_soc", "max_soc", "initial_soc")}
+
+    def set_values(self, values):
+        """Fill the entries from values keyed like DispatchConfig; the traces report the edits."""
+        for name, var in (("min_soc", self.min_soc_var), ("max_soc", self.max_soc_var),
+                          ("initial_soc", self.initial_soc_var)):
+            var.set(format_number(values.get(name)))
 
 
 
@@ -166,10 +197,12 @@ class DispatchControlFrame(BaseFrame):
         self.entries = []  
         self.labels = []   
         self.dropdowns = []  
-        super().__init__(master, **kwargs)
         self.parent_frame = parent_frame
+        self.form_state = parent_frame.form_state
+        self._fields_enabled = None
+        self.schedule = None
+        super().__init__(master, **kwargs)
         self._create_section_header("Dispatch Control")
-        self._create_widgets()
 
     def _create_widgets(self):
         self._create_daily_soc_steer_fields()
@@ -177,6 +210,8 @@ class DispatchControlFrame(BaseFrame):
     def _create_daily_soc_steer_fields(self):
         self.soc_steer_var = ctk.BooleanVar() 
         self.soc_steer_var.trace_add('write', self._update_fields_state)
+        self.soc_steer_var.trace_add('write', lambda *args: self.form_state.changed("steer_enabled"))
+        self.soc_steer_var.trace_add('write', self._on_steer_toggle)
          
 
         chk_soc_steer = ctk.CTkCheckBox(
@@ -215,7 +250,40 @@ class DispatchControlFrame(BaseFrame):
             else:
                 
                 entry = self._create_entry_field(label_text, row, 0, 1)
-                entry.bind('<KeyRelease>', self._notify_parent)
+                name = "soc_target" if label_text == "SoC Target:" else "power_setpoint"
+                entry.bind('<KeyRelease>', lambda event, name=name: self.form_state.changed(name))
+                self.form_state.add_field(name, entry.get, parse_number)
+                if label_text == "SoC Target:":
+                    self.soc_target_entry = entry
+                else:
+                    self.power_setpoint_entry = entry
+
+        self.form_state.add_field("steer_enabled", self.soc_steer_var.get)
+        self.form_state.add_field("start_time", self.start_time_dropdown.get)
+        self.form_state.add_field("end_time", self.end_time_dropdown.get)
+
+        self.schedule_label = ttk.Label(self, text="", style='Section.TLabel',
+                                        font=Constants.LABEL_FONT, background=Constants.SECTION_BG)
+        self.schedule_label.grid(row=6, column=0, columnspan=2, padx=(Constants.PAD_X, 0),
+                                 pady=Constants.PAD_Y, sticky='w')
+
+        self.optimal_var = ctk.BooleanVar()
+        self.optimal_var.trace_add('write', self._on_optimal_toggle)
+        chk_optimal = ctk.CTkCheckBox(
+            self, text="Price-Optimal Dispatch",
+            variable=self.optimal_var,
+            font=(Constants.FONT_NAME, Constants.LABEL_FONT[1]),
+            fg_color="white",
+            bg_color=Constants.SECTION_BG,
+            border_color=Constants.BORDER_COLOR,
+            text_color=Constants.TEXT_COLOR,
+            hover_color="white",
+            corner_radius=7,
+            checkmark_color=Constants.ACCENT_COLOR,
+            checkbox_height=20, checkbox_width=20
+        )
+        chk_optimal.grid(row=7, column=0, columnspan=2, padx=(0, 0), pady=Constants.PAD_Y, sticky='w')
+        self.form_state.add_field("optimal", self.optimal_var.get)
 
         
         self._update_fields_state()
@@ -266,18 +334,7 @@ class DispatchControlFrame(BaseFrame):
     
 
     def _generate_time_options(self, start_time, end_time, interval_minutes):
-        from datetime import datetime, timedelta
-
-        start = datetime.strptime(start_time, "%I:%M %p")
-        end = datetime.strptime(end_time, "%I:%M %p")
-        current = start
-        options = []
-
-        while current <= end:
-            options.append(current.strftime("%I:%M %p"))
-            current += timedelta(minutes=interval_minutes)
-
-        return options
+        return time_options(start_time, end_time, interval_minutes)
 
     def _update_end_time_options(self, *args):
         """Update End Time dropdown options based on the selected Start Time."""
@@ -296,6 +353,7 @@ class DispatchControlFrame(BaseFrame):
 
         
         self._validate_end_time()
+        self.form_state.changed("start_time")
 
     def _validate_end_time(self, *args):
         """Validate that the End Time is after the Start Time."""
@@ -311,6 +369,8 @@ class DispatchControlFrame(BaseFrame):
             self.end_time_dropdown.set(next_valid_time)
             print("Error: End Time cannot precede Start Time. Resetting to the next valid time.")
 
+        self.form_state.changed("end_time")
+
     def _create_entry_field(self, label_text, row, col, span):
         placeholder_texts = {
         "SoC Target:": "Desired State of Charge (0-100)%",
@@ -342,8 +402,21 @@ class DispatchControlFrame(BaseFrame):
 
         return entry
 
+    def _on_steer_toggle(self, *args):
+        """The steer and optimal dispatch exclude each other; switching one on switches the other off."""
+        if self.soc_steer_var.get() and self.optimal_var.get():
+            self.optimal_var.set(False)
+
+    def _on_optimal_toggle(self, *args):
+        if self.optimal_var.get() and self.soc_steer_var.get():
+            self.soc_steer_var.set(False)
+        self.form_state.changed("optimal")
+
     def _update_fields_state(self, *args):
         enabled = self.soc_steer_var.get()
+        if enabled == self._fields_enabled:
+            return
+        self._fields_enabled = enabled
 
         
         label_color = Constants.TEXT_COLOR if enabled else Constants.TEXT_COLOR_DISABLED
@@ -364,43 +437,71 @@ class DispatchControlFrame(BaseFrame):
         for label in self.labels:
             label.configure(foreground=label_color)
 
-    def _notify_parent(self, *args):
-        if self.parent_frame and hasattr(self.parent_frame, '_update_run_button'):
-            self.parent_frame._update_run_button()
+    def get_values(self):
+        """Return the steer settings keyed like DispatchConfig (None while a needed entry is empty)."""
+        values = self.form_state.values
+        enabled = bool(values.get("steer_enabled"))
+        settings = {
+            "steer_enabled": enabled,
+            "start_time": values.get("start_time"),
+            "end_time": values.get("end_time"),
+            "soc_target": values.get("soc_target") if enabled else 0.0,
+            "power_setpoint": values.get("power_setpoint") if enabled else 0.0,
+            "optimal": bool(values.get("optimal")),
+        }
+        if self.schedule is not None:
+            settings["schedule"] = self.schedule
+        return settings
+
+    def set_values(self, values):
+        """Fill the steer fields from values keyed like DispatchConfig."""
+        # Disabled entries ignore inserts, so fill them with the steer switched on.
+        self.soc_steer_var.set(True)
+        self.start_time_dropdown.set(values.get("start_time") or "12:00 AM")
+        self._update_end_time_options()
+        self.end_time_dropdown.set(values.get("end_time") or "12:15 AM")
+        self._validate_end_time()
+        for name, entry in (("soc_target", self.soc_target_entry), ("power_setpoint", self.power_setpoint_entry)):
+            entry.delete(0, "end")
+            text = format_number(values.get(name))
+            if text:
+                entry.insert(0, text)
+            self.form_state.changed(name)
+        self.soc_steer_var.set(bool(values.get("steer_enabled")))
+        self.optimal_var.set(bool(values.get("optimal")))
+        self.set_schedule(values.get("schedule"))
+
+    def set_schedule(self, schedule):
+        """Keep a project file's calendar schedule, which replaces the single window above when set."""
+        self.schedule = schedule
+        text = ""
+        if schedule is not None:
+            windows = sum(len(rule.windows) for rule in schedule.rules)
+            text = f"Calendar schedule: {len(schedule.rules)} rule(s), {windows} window(s) from the project file"
+        self.schedule_label.configure(text=text)
+        self.form_state.changed("steer_enabled")
 
 
 
 
 class SystemConfigurationFrame(BaseFrame):
     def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
-        self._create_widgets()
         self.thumbnail = None  
-        self.full_image = None  
+        self.popup = None  
+        super().__init__(master, **kwargs)
 
     def _create_widgets(self):
         
         self._create_section_header("System Configuration")
 
-        
-        self._create_thumbnail()
+        # The icon decodes on the asset thread; the label appears when it is ready.
+        shared_assets(self).when_ready(Constants.ICON_IMAGE, Constants.ICON_SIZE, self._create_thumbnail)
 
 
     def _create_thumbnail(self):
         """Add a thumbnail with an icon to the frame."""
         try:
-            
-            icon_image = Image.open("imgs/ico.png").convert("RGBA")  
-            icon_size = (50, 50)  
-            icon_image.thumbnail(icon_size)
-
-            
-            self.thumbnail = ctk.CTkImage(
-                light_image=icon_image,
-                dark_image=icon_image,
-                size=icon_size
-                
-            )
+            self.thumbnail = shared_assets(self).ctk_image(Constants.ICON_IMAGE, Constants.ICON_SIZE)
 
             
             self.thumbnail_label = ctk.CTkLabel(self, image=self.thumbnail, text="")
@@ -412,42 +513,51 @@ class SystemConfigurationFrame(BaseFrame):
             print(f"Error loading icon: {e}")
 
     def _open_full_image(self, event):
-        """Open a popup to display the full-sized image fitting the window size."""
-        try:
-            
-            image = Image.open("imgs/system.png")  
-            width, height = image.size
+        """Open the system diagram in a pan-and-zoom viewer, reusing the one already open."""
+        if self.popup is not None and self.popup.winfo_exists():
+            self.popup.lift()
+            return
+        self.popup = DiagramViewer(self, Constants.SYSTEM_IMAGE, title="System Diagram")
 
-            
-            self.popup = tk.Toplevel(self)
-            self.popup.title("Full Image")
-            self.popup.geometry("800x600")  
-            self.popup.resizable(True, True)
-
-            
-            resized_image = image.resize((800, 600), Image.ANTIALIAS)
-            self.full_image = ImageTk.PhotoImage(resized_image)
-
-            
-            self.full_image_label = tk.Label(self.popup, image=self.full_image)
-            self.full_image_label.pack(fill="both", expand=True, padx=10, pady=10)
-        except Exception as e:
-            print(f"Error opening full image: {e}")
 
 
 
 class ActionFrame(BaseFrame):
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
-        self._create_widgets()
+        self.form_state = FormState(self)
+        self.form_state.add_listener(self._on_form_change)
+        self._run_enabled = None
+        self.columnconfigure(4, weight=2)
+        self.project_info_frame = None
         self.operational_limits_frame = None
         self.dispatch_control_frame = None
+        self.result = None
+        self.result_path = None
+        self.result_cache = ResultCache(Constants.RUNS_DIR, Constants.CACHE_MEMORY_ENTRIES, Constants.CACHE_MAX_BYTES)
+        self.run_controller = RunController()
+        self.csv_controller = RunController()
+        self.report_controller = RunController()
+        self.data_controller = RunController()
+        self.export_controller = RunController()
+        self.run_scheduler = None
+        self.queue_dialog = None
+        self.result_envelopes = None
+        self.pilot_viewer = None
+        self.live_config = None
+        self.live_chunks = []
+        self.bind("<Destroy>", self._on_destroy, add="+")
 
     def _create_widgets(self):
         self._create_run_button()
+        self._create_sweep_button()
+        self._create_scenarios_button()
+        self._create_tune_button()
         self._create_gen_report_button()
         self._create_gen_csvs_button()
         self._create_pilot_viewer_button()
+        self._create_export_all_button()
+        self._create_queue_button()
 
     def _create_run_button(self):
         self.run_button = ctk.CTkButton(
@@ -463,6 +573,48 @@ class ActionFrame(BaseFrame):
         )
         self.run_button.grid(row=0, column=0, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew',)
 
+    def _create_sweep_button(self):
+        self.sweep_button = ctk.CTkButton(
+            self, text="Sweep",
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            state='disabled',
+            hover=False,
+            command=self._open_sweep
+        )
+        self.sweep_button.grid(row=0, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+    def _create_scenarios_button(self):
+        self.scenarios_button = ctk.CTkButton(
+            self, text="Scenarios",
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            state='disabled',
+            hover=False,
+            command=self._open_scenarios
+        )
+        self.scenarios_button.grid(row=0, column=5, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+    def _create_tune_button(self):
+        self.tune_button = ctk.CTkButton(
+            self, text="Tune",
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            state='disabled',
+            hover=False,
+            command=self._open_tuning
+        )
+        self.tune_button.grid(row=0, column=6, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
     def _create_gen_report_button(self):
         self.gen_report_button = ctk.CTkButton(
             self, text="Gen Report",
@@ -472,9 +624,10 @@ class ActionFrame(BaseFrame):
             text_color=Constants.TEXT_COLOR,
             corner_radius=7,
             hover=False,
-            state='disabled'  
+            state='disabled',
+            command=self._generate_report
         )
-        self.gen_report_button.grid(row=0, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.gen_report_button.grid(row=0, column=2, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
 
     def _create_gen_csvs_button(self):
         self.gen_csvs_button = ctk.CTkButton(
@@ -485,9 +638,10 @@ class ActionFrame(BaseFrame):
             bg_color=Constants.SECTION_BG,
             corner_radius=7,
             hover=False,
-            state='disabled'  
+            state='disabled',
+            command=self._generate_csvs
         )
-        self.gen_csvs_button.grid(row=0, column=2, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.gen_csvs_button.grid(row=0, column=3, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
 
     def _create_pilot_viewer_button(self):
         self.pilot_viewer_button = ctk.CTkButton(
@@ -498,9 +652,51 @@ class ActionFrame(BaseFrame):
             text_color=Constants.TEXT_COLOR,
             corner_radius=7,
             hover=False,
-            state='disabled'  
+            state='disabled',
+            command=self._open_pilot_viewer
         )
-        self.pilot_viewer_button.grid(row=0, column=3, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.pilot_viewer_button.grid(row=0, column=4, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+    def _create_export_all_button(self):
+        self.export_all_button = ctk.CTkButton(
+            self, text="Export All",
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            hover=False,
+            state='disabled',
+            command=self._export_all
+        )
+        self.export_all_button.grid(row=0, column=7, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+    def _create_queue_button(self):
+        self.queue_button = ctk.CTkButton(
+            self, text="Queue",
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.ACCENT_COLOR,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            hover=False,
+            command=self._open_queue
+        )
+        self.queue_button.grid(row=0, column=8, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+    def set_project_info_frame(self, frame):
+        self.project_info_frame = frame
+        for name, entry in (("project_name", frame.project_name_entry), ("data_file", frame.file_name_entry)):
+            self.form_state.add_field(name, lambda entry=entry: entry.get().strip())
+            entry.bind("<KeyRelease>", lambda event, name=name: self.form_state.changed(name), add="+")
+        frame.file_name_entry.bind("<FocusOut>", self._prefetch_data_file, add="+")
+        frame.file_name_entry.bind("<Return>", self._prefetch_data_file, add="+")
+
+    def _prefetch_data_file(self, event=None):
+        """Parse the data file into its sidecar cache in the background, so Run only memory-maps it."""
+        path = self.project_info_frame.get_values()["data_file"]
+        if path and os.path.isfile(path) and not self.data_controller.running:
+            self.data_controller.start(lambda reporter: load_timeseries(path))
 
     def set_operational_limits_frame(self, frame):
         self.operational_limits_frame = frame
@@ -512,70 +708,393 @@ class ActionFrame(BaseFrame):
         if not self.operational_limits_frame or not self.dispatch_control_frame:
             return False
 
-        
-        operational_fields = [
-            self.operational_limits_frame.max_soc_var,
-            self.operational_limits_frame.min_soc_var,
-            self.operational_limits_frame.initial_soc_var
-        ]
-
-        for field in operational_fields:
-            if not field.get():
-                return False
-            
-        if not self.operational_limits_frame._validate_initial_soc():
+        try:
+            self._collect_config().validate()
+        except ValueError:
             return False
 
-        
-        if self.dispatch_control_frame.soc_steer_var.get():
-            dispatch_fields = [
-                entry.get() for entry in self.dispatch_control_frame.entries
-            ]
-            dispatch_fields.pop(0)
-            dispatch_fields.pop(0)
-            for field in dispatch_fields:
-                if not field:
-                    return False
-
         return True
 
+    def _collect_config(self):
+        """Build the engine configuration from the parsed form values."""
+        values = {
+            **self.operational_limits_frame.get_values(),
+            **self.dispatch_control_frame.get_values()
+        }
+        missing = [name for name, value in values.items() if value is None]
+        if missing:
+            raise ValueError(f"Missing value for {', '.join(missing)}")
+        return DispatchConfig(**values)
+
+    def _on_form_change(self, form, changed):
+        self._update_run_button()
+
     def _update_run_button(self):
-        if self._validate_fields():
+        enabled = not self.run_controller.running and self._validate_fields()
+        if enabled == self._run_enabled:
+            return
+        self._run_enabled = enabled
+        if enabled:
             self.run_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR, bg_color=Constants.SECTION_BG)
+            self.sweep_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
+            self.scenarios_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
+            self.tune_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
         else:
             self.run_button.configure(state='disabled', fg_color=Constants.FIELD_COLOR_DISABLED)
+            self.sweep_button.configure(state='disabled', fg_color=Constants.FIELD_COLOR_DISABLED)
+            self.scenarios_button.configure(state='disabled', fg_color=Constants.FIELD_COLOR_DISABLED)
+            self.tune_button.configure(state='disabled', fg_color=Constants.FIELD_COLOR_DISABLED)
+
+    def _open_sweep(self):
+        """Open the parameter sweep dialog seeded with the current form values and data file."""
+        from .sweep import SweepDialog
+
+        self.form_state.flush()
+        data_file = self.project_info_frame.get_values()["data_file"] if self.project_info_frame else ""
+        SweepDialog(self, self._collect_config(), data_file)
+
+    def _open_scenarios(self):
+        """Open the scenario dialog on the current form values and data file."""
+        from .scenarios import ScenarioDialog
+
+        self.form_state.flush()
+        info = self.project_info_frame.get_values()
+        if not info["data_file"]:
+            messagebox.showerror("Scenarios", "Scenarios perturb the data file's load profile; set a data file first.")
+            return
+        ScenarioDialog(self, self._collect_config(), info["project_name"], info["data_file"])
+
+    def _open_tuning(self):
+        """Open the dispatch tuner on the current form values; it writes its winner back to the steer fields."""
+        from .tuning import TuningDialog
+
+        self.form_state.flush()
+        data_file = self.project_info_frame.get_values()["data_file"] if self.project_info_frame else ""
+        TuningDialog(self, self._collect_config(), data_file, self.dispatch_control_frame.set_values)
+
+    def _open_queue(self):
+        """Show the run queue; it keeps running in the background when closed."""
+        from engine.scheduler import RunScheduler
+        from .run_queue import RunQueueDialog
+
+        if self.run_scheduler is None:
+            self.run_scheduler = RunScheduler(self.result_cache)
+        if self.queue_dialog is not None and self.queue_dialog.winfo_exists():
+            self.queue_dialog.lift()
+            return
+        self.queue_dialog = RunQueueDialog(self, self.run_scheduler, self._queue_entry, self.show_queued_result)
+
+    def _queue_entry(self):
+        """Return ``(config, data_file, project_name)`` of the current form for the run queue."""
+        self.form_state.flush()
+        config = self._collect_config()
+        config.validate()
+        info = self.project_info_frame.get_values() if self.project_info_frame else {"project_name": "", "data_file": ""}
+        return config, info["data_file"], info["project_name"]
+
+    def show_queued_result(self, job):
+        """Make the stored run of a finished queue job the last result, as if it had just been run."""
+        if self.run_controller.running:
+            messagebox.showerror("Run Queue", "Wait for the current run to finish, or cancel it, first.")
+            return
+        result = self.result_cache.get(job.key)
+        if result is None:
+            messagebox.showerror("Run Queue", f"The run of job #{job.number} is no longer in the cache.")
+            return
+        self.result = result
+        self.result_path = self.result_cache.path_for(job.key)
+        self.result_envelopes = None
+        self.event_generate("<<ResultChanged>>")
+        self._enable_result_buttons()
+        if self._pilot_viewer_open() and not self.pilot_viewer.streaming:
+            self.pilot_viewer.show_result(result)
+
+    def _on_destroy(self, event):
+        if event.widget is self and self.run_scheduler is not None:
+            self.run_scheduler.shutdown()
 
     def _run_process(self):
-        """Simulate the run process and show a success popup."""
-        
-        self.run_button.configure(state='disabled')
-
-        
-        self.progress_bar = ctk.CTkProgressBar(self, mode='indeterminate',fg_color=Constants.ACCENT_COLOR,progress_color=Constants.TEXT_COLOR)
-        self.progress_bar.grid(row=1, column=0, columnspan=4, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
-        self.progress_bar.start()
+        """Start the run on the run controller; the worker serves it from the result cache when it can."""
+        self.form_state.flush()
+        config = self._collect_config()
+        data_file = self.project_info_frame.get_values()["data_file"] if self.project_info_frame else ""
+
+        self.progress_bar = ctk.CTkProgressBar(self, mode='determinate',fg_color=Constants.ACCENT_COLOR,progress_color=Constants.TEXT_COLOR)
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=1, column=0, columnspan=8, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.cancel_button = ctk.CTkButton(
+            self, text="Cancel",
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            hover=False,
+            command=self.run_controller.cancel
+        )
+        self.cancel_button.grid(row=1, column=8, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.status_label = ttk.Label(self, text="Starting...", font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+                                      background=Constants.SECTION_BG)
+        self.status_label.grid(row=2, column=0, columnspan=9, padx=Constants.PAD_X, sticky='w')
+
+        # The Pilot Viewer follows the run live; an open one starts over on the new run.
+        self.live_config = config
+        self.live_chunks = []
+        self.pilot_viewer_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
+        if self._pilot_viewer_open():
+            self.pilot_viewer.begin_stream(config)
 
         
-        threading.Thread(target=self._simulate_process, daemon=True).start()
-
-    def _simulate_process(self):
-        """Simulate a process with a delay and show the success popup."""
-        time.sleep(3)  
+        self.run_controller.start(self._run_job, config, self.result, data_file)
+        self._update_run_button()
+        self.after(Constants.UI_POLL_MS, self._poll_run_events)
+
+    def _run_job(self, reporter, config, previous, data_file):
+        """Worker thread: look the run up in the cache, else load the data file, simulate and cache it.
+
+        The cache key hashes the whole data file, so it is computed here rather
+        than on the Tk thread. Talks to the UI only through the reporter.
+        """
+        reporter.stage("Checking cache")
+        key = run_key(config, data_file)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached, self.result_cache.path_for(key)
+
+        load_kw = price = None
+        if data_file:
+            reporter.stage("Loading data")
+            load_kw, price = profiles(load_timeseries(data_file, progress=reporter.progress), config)
+
+        reporter.stage("Simulating")
+        on_chunk = lambda start, stop, columns: reporter.post("chunk", (start, stop, columns))
+        if previous is not None:
+            result, _ = resimulate(previous, config, load_kw, price, progress=reporter.progress, on_chunk=on_chunk)
+        else:
+            result = simulate(config, load_kw, price, progress=reporter.progress, on_chunk=on_chunk)
 
-        
-        self.progress_bar.stop()
+        reporter.stage("Saving")
+        try:
+            return self.result_cache.put(key, result), self.result_cache.path_for(key)
+        except OSError as e:
+            print(f"Error saving run: {e}")
+            return result, None
+
+    def _poll_run_events(self):
+        """Apply queued run events on the Tk thread, then reschedule until the run ends."""
+        for event in self.run_controller.drain():
+            if event.kind == "chunk":
+                self.live_chunks.append(event.payload)
+                if self._pilot_viewer_open():
+                    self.pilot_viewer.append(*event.payload)
+                continue
+            if event.kind == "done":
+                self.result, self.result_path = event.payload
+                self.result_envelopes = None
+                self.event_generate("<<ResultChanged>>")
+                self._finish_run()
+                if self._pilot_viewer_open():
+                    self.pilot_viewer.show_result(self.result)
+                self._show_success_popup()
+                self._enable_result_buttons()
+                return
+            if event.kind == "error":
+                self._finish_run("Failed")
+                messagebox.showerror("Run", f"Run failed: {event.payload}")
+                return
+            if event.kind == "cancelled":
+                self._finish_run("Cancelled")
+                return
+
+        controller = self.run_controller
+        self.progress_bar.set(controller.fraction)
+        status = f"{controller.stage or 'Starting'}... {controller.fraction:.0%}"
+        eta = controller.eta()
+        if eta is not None and controller.fraction < 1:
+            status += f" - about {eta:.0f} s left"
+        if controller.cancelled:
+            status = "Cancelling..."
+        self.status_label.configure(text=status)
+        self.after(Constants.UI_POLL_MS, self._poll_run_events)
+
+    def _finish_run(self, outcome=None):
         self.progress_bar.grid_forget()
+        self.cancel_button.grid_forget()
+        self.status_label.grid_forget()
+        self._run_enabled = None
+        self._update_run_button()
+        self.live_chunks = []
+        if outcome is not None:
+            if self._pilot_viewer_open() and self.pilot_viewer.streaming:
+                self.pilot_viewer.end_stream(outcome)
+            if self.result is None:
+                self.pilot_viewer_button.configure(state='disabled', fg_color=Constants.FIELD_COLOR_DISABLED, hover=False)
+
+    def _pilot_viewer_open(self):
+        return self.pilot_viewer is not None and self.pilot_viewer.winfo_exists()
+
+    def _open_pilot_viewer(self):
+        """Show the Pilot Viewer: live on the current run while one is going, else on the last result."""
+        from .pilot import PilotViewer
+
+        if self._pilot_viewer_open():
+            self.pilot_viewer.lift()
+            return
+        running = self.run_controller.running
+        if not running and self.result is None:
+            return
+        name = self.project_info_frame.get_values()["project_name"] if self.project_info_frame else ""
+        config = self.live_config if running else self.result.config
+        self.pilot_viewer = PilotViewer(self, config, title=f"Pilot Viewer - {name}" if name else "Pilot Viewer")
+        if running:
+            self.pilot_viewer.begin_stream(config)
+            for chunk in self.live_chunks:
+                self.pilot_viewer.append(*chunk)
+        else:
+            self.pilot_viewer.show_result(self.result, self.result_envelopes)
 
-        
-        self._show_success_popup()
+    def matching_result_path(self):
+        """Return the stored run of the last result if it was run with the current inputs, else None."""
+        if self.result is None or not self.result_path:
+            return None
+        try:
+            config = self._collect_config()
+        except ValueError:
+            return None
+        return self.result_path if config == self.result.config else None
+
+    def restore_result(self, path):
+        """Show a stored run as the last result (from an opened project), or clear it with None."""
+        self.result = self.result_path = self.result_envelopes = None
+        if path:
+            try:
+                self.result = open_result(path)
+                self.result_path = path
+            except (OSError, ValueError) as e:
+                print(f"Error opening stored run {path}: {e}")
+        if self.result is not None:
+            self._enable_result_buttons()
+        else:
+            for button in (self.gen_report_button, self.gen_csvs_button, self.pilot_viewer_button,
+                           self.export_all_button):
+                button.configure(state='disabled', fg_color=Constants.FIELD_COLOR_DISABLED, hover=False)
 
-        
+    def _enable_result_buttons(self):
         self.gen_report_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
         self.gen_csvs_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
         self.pilot_viewer_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
-
-        
-        self.run_button.configure(state='normal')
+        self.export_all_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR, hover=True, hover_color=Constants.ACCENT_COLOR)
+
+        self._run_enabled = None
+        self._update_run_button()
+
+    def _generate_report(self):
+        """Write the text report of the last run, with its cycling and degradation, on a worker thread."""
+        if self.result is None:
+            return
+        project_name = self.project_info_frame.get_values()["project_name"] if self.project_info_frame else ""
+        path = filedialog.asksaveasfilename(
+            title="Save report", defaultextension=".txt",
+            initialfile=f"{project_name or 'battery'}_report.txt",
+            filetypes=[("Text files", "*.txt")]
+        )
+        if not path:
+            return
+        self.gen_report_button.configure(state='disabled')
+        self.report_controller.start(self._write_report, self.result, path, project_name)
+        self.after(Constants.UI_POLL_MS, self._poll_report)
+
+    def _write_report(self, reporter, result, path, project_name):
+        """Worker thread: count cycles and write the report."""
+        write_report(result, path, project_name)
+
+    def _poll_report(self):
+        for event in self.report_controller.drain():
+            if event.kind in ("done", "error", "cancelled"):
+                self.gen_report_button.configure(state='normal')
+                if event.kind == "error":
+                    messagebox.showerror("Gen Report", f"Could not write report: {event.payload}")
+                return
+        self.after(Constants.UI_POLL_MS, self._poll_report)
+
+    def _generate_csvs(self):
+        """Stream the last run to a CSV file on a worker thread with a progress bar."""
+        if self.result is None:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save results CSV", defaultextension=".csv",
+            initialfile="results.csv", filetypes=[("CSV files", "*.csv")]
+        )
+        if not path:
+            return
+
+        self.gen_csvs_button.configure(state='disabled')
+        self.csv_progress_bar = ctk.CTkProgressBar(self, mode='determinate', progress_color=Constants.ACCENT_COLOR)
+        self.csv_progress_bar.set(0)
+        self.csv_progress_bar.grid(row=3, column=0, columnspan=9, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+        self.csv_controller.start(self._write_csvs, self.result, path)
+        self.after(Constants.UI_POLL_MS, self._poll_csv_progress)
+
+    def _write_csvs(self, reporter, result, path):
+        """Worker thread: write the CSV, reporting progress after every block."""
+        write_csv(result, path, progress=reporter.progress)
+
+    def _poll_csv_progress(self):
+        for event in self.csv_controller.drain():
+            if event.kind in ("done", "error", "cancelled"):
+                self.csv_progress_bar.grid_forget()
+                self.gen_csvs_button.configure(state='normal')
+                if event.kind == "error":
+                    messagebox.showerror("Gen CSVs", f"Could not write CSV: {event.payload}")
+                return
+        self.csv_progress_bar.set(self.csv_controller.fraction)
+        self.after(Constants.UI_POLL_MS, self._poll_csv_progress)
+
+    def _export_all(self):
+        """Write the report and CSV of the last run and build its Pilot Viewer envelopes in one pass over it."""
+        if self.result is None:
+            return
+        directory = filedialog.askdirectory(title="Export report and CSV to")
+        if not directory:
+            return
+        project_name = self.project_info_frame.get_values()["project_name"] if self.project_info_frame else ""
+        stem = project_name or "battery"
+        report_path = os.path.join(directory, f"{stem}_report.txt")
+        csv_path = os.path.join(directory, f"{stem}_results.csv")
+        existing = [os.path.basename(path) for path in (report_path, csv_path) if os.path.exists(path)]
+        if existing and not messagebox.askyesno(
+                "Export All", f"{directory} already has {' and '.join(existing)}. Replace?"):
+            return
+
+        self.export_all_button.configure(state='disabled')
+        self.export_progress_bar = ctk.CTkProgressBar(self, mode='determinate', progress_color=Constants.ACCENT_COLOR)
+        self.export_progress_bar.set(0)
+        self.export_progress_bar.grid(row=4, column=0, columnspan=9, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+        self.export_controller.start(self._export_job, self.result, report_path, csv_path, project_name)
+        self.after(Constants.UI_POLL_MS, self._poll_export)
+
+    def _export_job(self, reporter, result, report_path, csv_path, project_name):
+        """Worker thread: fan the result out to the report, the CSV and the viewer envelopes."""
+        outputs = export_result(result, csv_path, report_path, project_name, envelopes=True, progress=reporter.progress)
+        return result, outputs["envelopes"]
+
+    def _poll_export(self):
+        for event in self.export_controller.drain():
+            if event.kind in ("done", "error", "cancelled"):
+                self.export_progress_bar.grid_forget()
+                self.export_all_button.configure(state='normal')
+                if event.kind == "done":
+                    result, envelopes = event.payload
+                    # The Pilot Viewer reuses the envelopes unless another run replaced the result meanwhile.
+                    if result is self.result:
+                        self.result_envelopes = envelopes
+                if event.kind == "error":
+                    messagebox.showerror("Export All", f"Could not export: {event.payload}")
+                return
+        self.export_progress_bar.set(self.export_controller.fraction)
+        self.after(Constants.UI_POLL_MS, self._poll_export)
 
     def _show_success_popup(self):
         
@@ -594,9 +1113,7 @@ class ActionFrame(BaseFrame):
 
         
         try:
-            image = Image.open("imgs/success.png")  
-            image = image.resize((50, 50), Image.ANTIALIAS)
-            photo = ImageTk.PhotoImage(image)
+            photo = shared_assets(self).photo(Constants.SUCCESS_IMAGE, Constants.SUCCESS_SIZE)
             image_label = tk.Label(popup, image=photo)
             image_label.image = photo  
             image_label.pack(pady=10)
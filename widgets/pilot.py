@@ -0,0 +1,344 @@
+from datetime import datetime, timedelta
+import time
+import tkinter as tk
+
+import numpy as np
+
+from config.constants import Constants
+from engine.envelope import Envelope
+from engine.scenarios import PERCENTILES
+
+PANELS = (("soc", "SoC (%)"), ("power", "Power (kW)"))
+SERIES = (
+    ("soc", "soc", "SoC", "#1E90FF"),
+    ("power_kw", "power", "Power", "#00B050"),
+    ("setpoint_kw", "power", "Setpoint", "#FFA500"),
+)
+SCENARIO_PANELS = (("soc", "SoC (%)"), ("energy", "Energy discharged (kWh)"))
+SCENARIO_BANDS = (
+    ("soc", "soc", "SoC", ("#8EC8FF", "#1E90FF", "#8EC8FF")),
+    ("energy_discharged_kwh", "energy", "Energy", ("#80D8A8", "#00B050", "#80D8A8")),
+)
+SCENARIO_SERIES = tuple(
+    (f"{band}_p{percentile}", panel, f"{label} P{percentile}", color)
+    for band, panel, label, colors in SCENARIO_BANDS for percentile, color in zip(PERCENTILES, colors)
+)
+MARGIN_LEFT = 70
+MARGIN_RIGHT = 15
+MARGIN_TOP = 20
+MARGIN_BOTTOM = 40
+PANEL_GAP = 30
+TIME_TICKS = 6
+ZOOM_STEP = 1.25
+MIN_WINDOW = 10
+
+
+class PilotViewer(tk.Toplevel):
+    """Plot SoC, power and setpoint for a run of any length, finished or still streaming in.
+
+    Each series gets an ``Envelope`` pyramid. A full redraw asks it for at most
+    one min/max pair per pixel column in the visible window and rewrites the
+    coordinates of one canvas line per series, so the cost of a frame depends
+    on the canvas width, not on the run length. Drag to pan, scroll (or +/-) to
+    zoom around the cursor, 0 to show the whole run.
+
+    While a run streams in, ``append`` folds each chunk into the envelopes and
+    at most one frame per ``PILOT_FRAME_MS`` draws only the stretch that
+    arrived since the last one as new line items; a full redraw happens only
+    when the view or a panel's range has to change.
+
+    ``show_scenarios`` swaps the panels for the P10/P50/P90 bands of a
+    scenario run: SoC, and the energy discharged so far.
+    """
+
+    def __init__(self, master, config, title="Pilot Viewer"):
+        super().__init__(master)
+        self.title(title)
+        self.geometry(Constants.PILOT_SIZE)
+        self.configure(bg=Constants.BG_COLOR)
+        self.run_config = None
+        self.total = 0
+        self.envelopes = {}
+        self.view = (0.0, 1.0)
+        self.ranges = {}
+        self.streaming = False
+        self.drawn = 0
+        self.state_text = ""
+        self.last_render_ms = 0.0
+        self._render_id = None
+        self._frame_id = None
+        self._last_frame = 0.0
+        self._drag = None
+
+        self.canvas = tk.Canvas(self, bg=Constants.SECTION_BG, highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.status = tk.Label(self, anchor="w", bg=Constants.BG_COLOR, fg=Constants.TEXT_COLOR,
+                               font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE - 2))
+        self.status.pack(fill="x", padx=Constants.PAD_X)
+        self.panels, self.series = PANELS, SERIES
+        self._create_items()
+
+        self.canvas.bind("<Configure>", lambda event: self._schedule_render(Constants.VIEWER_RESIZE_MS))
+        self.canvas.bind("<ButtonPress-1>", lambda event: setattr(self, "_drag", event.x))
+        self.canvas.bind("<B1-Motion>", self._drag_to)
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom(ZOOM_STEP if event.delta > 0 else 1 / ZOOM_STEP, event.x))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(ZOOM_STEP, event.x))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(1 / ZOOM_STEP, event.x))
+        self.bind("<plus>", lambda event: self.zoom(ZOOM_STEP))
+        self.bind("<equal>", lambda event: self.zoom(ZOOM_STEP))
+        self.bind("<minus>", lambda event: self.zoom(1 / ZOOM_STEP))
+        self.bind("<Key-0>", lambda event: self.show_all())
+        self._reset(config)
+
+    def _reset(self, config):
+        self.run_config = config
+        self.total = config.steps
+        self.envelopes = {}
+        self.ranges = {}
+        self.drawn = 0
+        self.view = (0.0, float(self.total))
+
+    def show_result(self, result, envelopes=None):
+        """Plot a finished run; ``envelopes`` already built for it (by ``export_result``) are reused."""
+        self._use_layout(PANELS, SERIES)
+        self._reset(result.config)
+        self.streaming = False
+        self.state_text = "Building envelopes..."
+        self.status.configure(text=self.state_text)
+        self.update_idletasks()
+        for name, _, _, _ in self.series:
+            values = getattr(result, name)
+            if envelopes and name in envelopes:
+                self.envelopes[name] = envelopes[name]
+            elif values is not None and np.ndim(values) == 1:
+                self.envelopes[name] = Envelope(values)
+        self.state_text = ""
+        self._schedule_render()
+
+    def begin_stream(self, config):
+        """Start plotting a run of ``config`` whose chunks will arrive through ``append``."""
+        self._use_layout(PANELS, SERIES)
+        self._reset(config)
+        self.streaming = True
+        self.state_text = "Live"
+        for name, _, _, _ in self.series:
+            self.envelopes[name] = Envelope(np.full(self.total, np.nan), length=0)
+        self._schedule_render()
+
+    def show_scenarios(self, result):
+        """Plot the percentile bands of a ``ScenarioResult``."""
+        self._use_layout(SCENARIO_PANELS, SCENARIO_SERIES)
+        self._reset(result.config)
+        self.streaming = False
+        for band, _, _, _ in SCENARIO_BANDS:
+            for percentile in PERCENTILES:
+                self.envelopes[f"{band}_p{percentile}"] = Envelope(result.band(band, percentile))
+        self.state_text = f"{result.scenarios:,} scenarios"
+        self._schedule_render()
+
+    def _use_layout(self, panels, series):
+        """Switch to another set of panels and series, rebuilding the canvas items if it changes."""
+        if (panels, series) == (self.panels, self.series):
+            return
+        self.panels, self.series = panels, series
+        self.canvas.delete("all")
+        self._create_items()
+
+    def append(self, start, stop, columns):
+        """Add steps [start, stop) of the streamed run; chunks must arrive in order."""
+        for name, values in columns.items():
+            envelope = self.envelopes.get(name)
+            if envelope is None or np.ndim(values) != 1:
+                continue
+            envelope.values[start:stop] = values
+            envelope.extend(stop)
+        if self._frame_id is None:
+            wait = Constants.PILOT_FRAME_MS - (time.perf_counter() - self._last_frame) * 1000
+            self._frame_id = self.after(max(0, int(wait)), self._draw_new)
+
+    def end_stream(self, state_text):
+        """Stop streaming, keeping what was drawn; ``state_text`` says how the run ended."""
+        self.streaming = False
+        self.state_text = state_text
+        self._schedule_render()
+
+    def _create_items(self):
+        self.frames = {}
+        self.labels = {}
+        for panel, title in self.panels:
+            self.frames[panel] = self.canvas.create_rectangle(0, 0, 0, 0, outline=Constants.BORDER_COLOR)
+            self.labels[panel] = (
+                self.canvas.create_text(0, 0, anchor="e", fill=Constants.TEXT_COLOR, text=""),
+                self.canvas.create_text(0, 0, anchor="e", fill=Constants.TEXT_COLOR, text=""),
+                self.canvas.create_text(0, 0, anchor="w", fill=Constants.TEXT_COLOR, text=title),
+            )
+        self.lines = {name: self.canvas.create_line(0, 0, 0, 0, fill=color, width=1) for name, _, _, color in self.series}
+        self.colors = {name: color for name, _, _, color in self.series}
+        legend_x = MARGIN_LEFT + 120
+        for name, _, label, color in self.series:
+            self.canvas.create_text(legend_x, MARGIN_TOP // 2, anchor="w", fill=color, text=label, tags="legend")
+            legend_x += 80
+        self.ticks = [self.canvas.create_text(0, 0, anchor="n", fill=Constants.TEXT_COLOR, text="") for _ in range(TIME_TICKS)]
+
+    def show_all(self):
+        self.view = (0.0, float(self.total))
+        self._schedule_render()
+
+    def zoom(self, factor, x=None):
+        start, stop = self.view
+        width = self._plot_width()
+        fraction = 0.5 if x is None else min(max((x - MARGIN_LEFT) / width, 0.0), 1.0)
+        anchor = start + (stop - start) * fraction
+        span = min(max((stop - start) / factor, MIN_WINDOW), self.total)
+        start = anchor - span * fraction
+        self._set_view(start, start + span)
+
+    def _drag_to(self, event):
+        if self._drag is None:
+            return
+        start, stop = self.view
+        shift = (self._drag - event.x) * (stop - start) / self._plot_width()
+        self._drag = event.x
+        self._set_view(start + shift, stop + shift)
+
+    def _set_view(self, start, stop):
+        span = stop - start
+        start = min(max(start, 0.0), self.total - span)
+        self.view = (start, start + span)
+        self._schedule_render()
+
+    def _plot_width(self):
+        return max(1, self.canvas.winfo_width() - MARGIN_LEFT - MARGIN_RIGHT)
+
+    def _panel_boxes(self):
+        """Return {panel: (left, top, right, bottom)} for the current canvas size."""
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        panel_height = max(1, (height - MARGIN_TOP - MARGIN_BOTTOM - PANEL_GAP * (len(self.panels) - 1)) / len(self.panels))
+        boxes = {}
+        top = MARGIN_TOP
+        for panel, _ in self.panels:
+            boxes[panel] = (MARGIN_LEFT, top, width - MARGIN_RIGHT, top + panel_height)
+            top += panel_height + PANEL_GAP
+        return boxes
+
+    def _schedule_render(self, delay=0):
+        """Coalesce full redraws into one per idle cycle; resizes wait until the window settles."""
+        if self._render_id is not None:
+            self.after_cancel(self._render_id)
+        if delay:
+            self._render_id = self.after(delay, self._render)
+        else:
+            self._render_id = self.after_idle(self._render)
+
+    def _data_range(self, panel):
+        """Return the (low, high) the panel needs to show every valid sample."""
+        if panel == "soc":
+            return 0.0, 100.0
+        bounds = [self.envelopes[name].bounds() for name, series_panel, _, _ in self.series
+                  if series_panel == panel and name in self.envelopes]
+        bounds = [bound for bound in bounds if bound is not None]
+        if not bounds:
+            return -1.0, 1.0
+        return min(b[0] for b in bounds), max(b[1] for b in bounds)
+
+    def _panel_range(self, panel):
+        # Streamed runs get extra headroom so a slowly growing range does not force a full redraw per chunk.
+        low, high = self._data_range(panel)
+        if panel == "soc":
+            return low, high
+        pad = (high - low) * (0.25 if self.streaming else 0.05) or 1.0
+        return low - pad, high + pad
+
+    def _coords(self, name, panel, start, stop, pixels, boxes):
+        """Return flat canvas coordinates for ``name`` over [start, stop), one min/max pair per column."""
+        view_start, view_stop = self.view
+        x, lows, highs = self.envelopes[name].query(start, stop, pixels)
+        if not len(x):
+            return []
+        left, top, right, bottom = boxes[panel]
+        low, high = self.ranges[panel]
+        y_scale = (bottom - top) / (high - low)
+        coords = np.empty((len(x), 4))
+        coords[:, 0] = coords[:, 2] = left + (x - view_start) * (right - left) / (view_stop - view_start)
+        coords[:, 1] = bottom - (lows - low) * y_scale
+        coords[:, 3] = bottom - (highs - low) * y_scale
+        return coords.ravel().tolist()
+
+    def _render(self):
+        """Redraw everything for the current view."""
+        self._render_id = None
+        began = time.perf_counter()
+        start, stop = self.view
+        boxes = self._panel_boxes()
+        pixels = self._plot_width()
+        points = 0
+        self.canvas.delete("segment")
+
+        for panel, _ in self.panels:
+            left, top, right, bottom = boxes[panel]
+            low, high = self.ranges[panel] = self._panel_range(panel)
+            self.canvas.coords(self.frames[panel], left, top, right, bottom)
+            high_label, low_label, title = self.labels[panel]
+            self.canvas.coords(high_label, left - 5, top)
+            self.canvas.itemconfigure(high_label, text=f"{high:,.0f}")
+            self.canvas.coords(low_label, left - 5, bottom)
+            self.canvas.itemconfigure(low_label, text=f"{low:,.0f}")
+            self.canvas.coords(title, left + 5, top + 8)
+
+        for name, panel, _, _ in self.series:
+            coords = self._coords(name, panel, start, stop, pixels, boxes) if name in self.envelopes else []
+            if len(coords) < 4:
+                coords = [0, 0, 0, 0]
+            self.canvas.coords(self.lines[name], coords)
+            points += len(coords) // 2
+        self.drawn = min(self._length(), int(np.ceil(stop)))
+
+        bottom = boxes[self.panels[-1][0]][3]
+        origin = datetime.strptime(self.run_config.start_date, "%Y-%m-%d")
+        for index, tick in enumerate(self.ticks):
+            fraction = index / (TIME_TICKS - 1)
+            step = start + (stop - start) * fraction
+            stamp = origin + timedelta(minutes=step * self.run_config.timestep_minutes)
+            self.canvas.coords(tick, MARGIN_LEFT + fraction * pixels, bottom + 4)
+            self.canvas.itemconfigure(tick, text=stamp.strftime("%Y-%m-%d\n%H:%M"),
+                                      anchor="nw" if index == 0 else "ne" if index == TIME_TICKS - 1 else "n")
+
+        self.last_render_ms = (time.perf_counter() - began) * 1000
+        self._update_status(f"{points:,} points drawn in {self.last_render_ms:.1f} ms")
+
+    def _draw_new(self):
+        """Draw only the streamed steps that arrived since the last frame."""
+        self._frame_id = None
+        self._last_frame = time.perf_counter()
+        if self._render_id is not None:
+            return
+        for panel, _ in self.panels:
+            low, high = self._data_range(panel)
+            shown = self.ranges.get(panel)
+            if shown is None or low < shown[0] or high > shown[1]:
+                self._render()
+                return
+
+        start, stop = self.view
+        length = self._length()
+        first, last = max(self.drawn - 1, int(start)), min(length, int(np.ceil(stop)))
+        if last - first < 2:
+            self.drawn = max(self.drawn, last)
+            return
+        boxes = self._panel_boxes()
+        pixels = max(1, int(self._plot_width() * (last - first) / (stop - start)))
+        for name, panel, _, _ in self.series:
+            coords = self._coords(name, panel, first, last, pixels, boxes)
+            if len(coords) >= 4:
+                self.canvas.create_line(coords, fill=self.colors[name], width=1, tags="segment")
+        self.drawn = last
+        self._update_status(f"{length:,} of {self.total:,} steps streamed")
+
+    def _length(self):
+        return min((envelope.length for envelope in self.envelopes.values()), default=0)
+
+    def _update_status(self, detail):
+        start, stop = self.view
+        parts = [self.state_text] if self.state_text else []
+        parts += [f"Steps {start:,.0f}-{stop:,.0f} of {self.total:,}", detail]
+        self.status.configure(text="  |  ".join(parts))
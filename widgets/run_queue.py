@@ -0,0 +1,229 @@
+from datetime import datetime
+import os
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+import customtkinter as ctk
+
+from config.constants import Constants
+from engine.project import load_project
+from engine.runner import RunController
+from engine.scheduler import PRIORITIES
+
+from .session import PROJECT_FILETYPES
+
+
+class RunQueueDialog(tk.Toplevel):
+    """Live view of the run scheduler: add the current form or saved projects, watch and manage the queue.
+
+    The dialog only talks to the ``RunScheduler`` owned by the ActionFrame, so
+    closing it leaves queued and running jobs going; reopening shows them.
+    Adding runs goes through a worker thread, since the scheduler hashes each
+    data file to key the run.
+    """
+
+    COLUMNS = (
+        ("number", "#", 40),
+        ("project", "Project", 180),
+        ("priority", "Priority", 80),
+        ("submitted", "Submitted", 90),
+        ("status", "Status", 200),
+        ("time", "Time", 80),
+    )
+
+    def __init__(self, master, scheduler, collect, open_result):
+        super().__init__(master)
+        self.title("Run Queue")
+        self.geometry("760x460")
+        self.configure(bg=Constants.SECTION_BG)
+        self.scheduler = scheduler
+        self.collect = collect
+        self.open_result = open_result
+        self.priority_labels = {value: label for label, value in PRIORITIES.items()}
+        self.note = ""
+        self.submit_controller = RunController()
+        self._closed = False
+        self._create_widgets()
+        self.scheduler.listening = True
+        self._refresh_all()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(Constants.UI_POLL_MS, self._poll_jobs)
+
+    def _create_widgets(self):
+        form = ttk.Frame(self, style='Custom.TFrame', padding=10)
+        form.pack(fill='x')
+
+        lbl = ttk.Label(form, text="Priority:", font=Constants.LABEL_FONT, background=Constants.SECTION_BG)
+        lbl.grid(row=0, column=0, padx=(Constants.PAD_X, 0), pady=Constants.PAD_Y, sticky='w')
+        self.priority_dropdown = ctk.CTkComboBox(
+            form,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR,
+            border_color=Constants.BORDER_COLOR,
+            text_color="black",
+            bg_color=Constants.SECTION_BG,
+            corner_radius=10,
+            state="readonly",
+            values=list(PRIORITIES),
+            button_color=Constants.FIELD_COLOR_DISABLED
+        )
+        self.priority_dropdown.set("Normal")
+        self.priority_dropdown.grid(row=0, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+        self.add_form_button = self._create_button(form, "Add Current Form", self._add_form, enabled=True)
+        self.add_form_button.grid(row=0, column=2, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.add_files_button = self._create_button(form, "Add Project Files...", self._add_files, enabled=True)
+        self.add_files_button.grid(row=0, column=3, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.cancel_button = self._create_button(form, "Cancel Selected", self._cancel_selected, enabled=True)
+        self.cancel_button.grid(row=1, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.open_button = self._create_button(form, "Open Result", self._open_selected, enabled=True)
+        self.open_button.grid(row=1, column=2, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.clear_button = self._create_button(form, "Clear Finished", self._clear_finished, enabled=True)
+        self.clear_button.grid(row=1, column=3, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        for column in (1, 2, 3):
+            form.columnconfigure(column, weight=1)
+
+        self.status_label = ttk.Label(self, text="", font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+                                      background=Constants.SECTION_BG)
+        self.status_label.pack(fill='x', padx=Constants.PAD_X)
+
+        self.table = ttk.Treeview(self, columns=[name for name, _, _ in self.COLUMNS], show='headings')
+        for name, heading, width in self.COLUMNS:
+            self.table.heading(name, text=heading)
+            self.table.column(name, width=width, anchor='w' if name in ("project", "status") else 'center')
+        self.table.pack(fill='both', expand=True, padx=Constants.PAD_X, pady=Constants.PAD_Y)
+        self.table.bind("<Double-1>", lambda event: self._open_selected())
+
+    def _create_button(self, master, text, command, enabled=False):
+        return ctk.CTkButton(
+            master, text=text,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.ACCENT_COLOR if enabled else Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            hover=False,
+            state='normal' if enabled else 'disabled',
+            command=command
+        )
+
+    def _priority(self):
+        return PRIORITIES[self.priority_dropdown.get()]
+
+    def _add_form(self):
+        try:
+            entry = self.collect()
+        except ValueError as e:
+            messagebox.showerror("Run Queue", f"Cannot queue the form: {e}", parent=self)
+            return
+        self._submit([("the form", entry)])
+
+    def _add_files(self):
+        paths = filedialog.askopenfilenames(parent=self, title="Queue projects", filetypes=PROJECT_FILETYPES)
+        if paths:
+            self._submit([(os.path.basename(path), path) for path in paths])
+
+    def _submit(self, entries):
+        """Queue ``(label, entry)`` pairs on the worker; an entry is ``(config, data_file, project_name)`` or a project path."""
+        self._set_adding(False)
+        self.submit_controller.start(self._submit_job, entries, self._priority())
+
+    def _submit_job(self, reporter, entries, priority):
+        """Worker thread: load the projects and hand them to the scheduler; returns ``(submitted, failed)``."""
+        submitted = []
+        failed = []
+        for label, entry in entries:
+            reporter.check()
+            try:
+                if isinstance(entry, str):
+                    project = load_project(entry)
+                    entry = (project.config, project.data_file,
+                             project.project_name or os.path.splitext(os.path.basename(entry))[0])
+                submitted.append(self.scheduler.submit(*entry, priority))
+            except (OSError, ValueError) as e:
+                failed.append(f"{label}: {e}")
+        return submitted, failed
+
+    def _finish_submit(self, event):
+        self._set_adding(True)
+        if event.kind == "error":
+            messagebox.showerror("Run Queue", f"Could not queue: {event.payload}", parent=self)
+            return
+        submitted, failed = event.payload
+        for job, added in submitted:
+            self.note = "" if added else f"same inputs as #{job.number}, not queued again"
+            self._show(job)
+        if failed:
+            messagebox.showerror("Run Queue", "Could not queue:\n" + "\n".join(failed), parent=self)
+
+    def _set_adding(self, enabled):
+        for button in (self.add_form_button, self.add_files_button):
+            button.configure(state='normal' if enabled else 'disabled',
+                             fg_color=Constants.ACCENT_COLOR if enabled else Constants.FIELD_COLOR_DISABLED)
+
+    def _selected_jobs(self):
+        numbers = {int(item) for item in self.table.selection()}
+        return [job for job in self.scheduler.jobs if job.number in numbers]
+
+    def _cancel_selected(self):
+        for job in self._selected_jobs():
+            self.scheduler.cancel(job)
+
+    def _open_selected(self):
+        done = [job for job in self._selected_jobs() if job.status == "done"]
+        if done:
+            self.open_result(done[-1])
+
+    def _clear_finished(self):
+        self.scheduler.remove_finished()
+        self._refresh_all()
+
+    def _poll_jobs(self):
+        if self._closed:
+            return
+        for event in self.submit_controller.drain():
+            if event.kind in ("done", "error"):
+                self._finish_submit(event)
+        for job in self.scheduler.drain():
+            self._show(job)
+        for job in self.scheduler.jobs:
+            if job.status == "running":
+                self._show(job)
+        self._update_status()
+        self.after(Constants.UI_POLL_MS, self._poll_jobs)
+
+    def _refresh_all(self):
+        self.scheduler.drain()
+        self.table.delete(*self.table.get_children())
+        for job in self.scheduler.jobs:
+            self._show(job)
+        self._update_status()
+
+    def _show(self, job):
+        """Insert or update the row of ``job``; jobs cleared from the scheduler are left out."""
+        if job not in self.scheduler.jobs:
+            return
+        status = f"failed: {job.error}" if job.status == "failed" else job.status
+        elapsed = job.elapsed
+        values = (job.number, job.project or "(unnamed)", self.priority_labels.get(job.priority, job.priority),
+                  datetime.fromtimestamp(job.submitted).strftime("%H:%M:%S"), status,
+                  "" if elapsed is None else f"{elapsed:.0f} s")
+        item = str(job.number)
+        if self.table.exists(item):
+            self.table.item(item, values=values)
+        else:
+            self.table.insert('', 'end', iid=item, values=values)
+
+    def _update_status(self):
+        counts = self.scheduler.counts()
+        text = (f"{counts['running']} running, {counts['queued']} queued, {counts['done']} done, "
+                f"{counts['failed']} failed on {self.scheduler.max_workers} worker(s)")
+        self.status_label.configure(text=f"{text} - {self.note}" if self.note else text)
+
+    def _on_close(self):
+        self._closed = True
+        # Nothing drains the events while the dialog is closed; reopening reads the jobs instead.
+        self.scheduler.listening = False
+        while self.scheduler.drain():
+            pass
+        self.destroy()
@@ -0,0 +1,230 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+import customtkinter as ctk
+
+from config.constants import Constants
+from engine.report import write_scenario_report
+from engine.runner import RunController
+from engine.scenarios import PERCENTILES, Perturbation, simulate_scenarios, write_bands
+from engine.timeseries import load_timeseries, profiles
+
+
+class ScenarioDialog(tk.Toplevel):
+    """Monte Carlo runs of the current configuration over perturbed copies of the data file."""
+
+    RESULT_COLUMNS = (
+        ("final_soc", "Final SoC (%)"),
+        ("mean_soc", "Mean SoC (%)"),
+        ("energy_discharged_kwh", "Energy discharged (kWh)"),
+        ("equivalent_cycles", "Equivalent cycles"),
+        ("hours_at_min_soc", "Hours at Min SoC"),
+        ("revenue", "Revenue"),
+    )
+    PERTURBATION_FIELDS = (
+        ("load_scale", "Load scale (sd):"),
+        ("load_daily", "Load daily (sd):"),
+        ("load_noise", "Load per step (sd):"),
+        ("price_daily", "Price daily (sd):"),
+        ("price_noise", "Price per step (sd):"),
+    )
+
+    def __init__(self, master, base_config, project_name, data_file):
+        super().__init__(master)
+        self.title("Scenarios")
+        self.geometry("760x480")
+        self.configure(bg=Constants.SECTION_BG)
+        self.base_config = base_config
+        self.project_name = project_name
+        self.data_file = data_file
+        self.controller = RunController()
+        self.result = None
+        self.pilot_viewer = None
+        self._closed = False
+        self._create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _create_widgets(self):
+        form = ttk.Frame(self, style='Custom.TFrame', padding=10)
+        form.pack(fill='x')
+
+        self._create_label(form, "Scenarios:", 0, 0)
+        self.count_entry = self._create_entry(form, "1000")
+        self.count_entry.grid(row=0, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self._create_label(form, "Seed:", 1, 0)
+        self.seed_entry = self._create_entry(form, "0")
+        self.seed_entry.grid(row=1, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+        defaults = Perturbation().to_dict()
+        self.perturbation_entries = {}
+        for row, (name, label_text) in enumerate(self.PERTURBATION_FIELDS):
+            self._create_label(form, label_text, row, 2)
+            entry = self._create_entry(form, f"{defaults[name]:g}")
+            entry.grid(row=row, column=3, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+            self.perturbation_entries[name] = entry
+
+        form.columnconfigure(1, weight=1)
+        form.columnconfigure(3, weight=1)
+
+        self.start_button = self._create_button(form, "Start", self._start, enabled=True)
+        self.start_button.grid(row=2, column=0, columnspan=2, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.report_button = self._create_button(form, "Save Report", self._save_report)
+        self.report_button.grid(row=3, column=0, columnspan=2, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.bands_button = self._create_button(form, "Save Bands CSV", self._save_bands)
+        self.bands_button.grid(row=4, column=0, columnspan=2, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.viewer_button = self._create_button(form, "Pilot Viewer", self._open_pilot_viewer)
+        self.viewer_button.grid(row=5, column=0, columnspan=4, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+        self.status_label = ttk.Label(self, text="Each scenario perturbs the load and price of the data file.",
+                                      font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+                                      background=Constants.SECTION_BG)
+        self.status_label.pack(fill='x', padx=Constants.PAD_X)
+
+        self.progress_bar = ctk.CTkProgressBar(self, mode='determinate', progress_color=Constants.ACCENT_COLOR)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill='x', padx=Constants.PAD_X, pady=Constants.PAD_Y)
+
+        columns = ["figure"] + [f"p{percentile}" for percentile in PERCENTILES]
+        self.table = ttk.Treeview(self, columns=columns, show='headings')
+        self.table.heading("figure", text="")
+        self.table.column("figure", width=200, anchor='w')
+        for percentile in PERCENTILES:
+            self.table.heading(f"p{percentile}", text=f"P{percentile}")
+            self.table.column(f"p{percentile}", width=120, anchor='center')
+        self.table.pack(fill='both', expand=True, padx=Constants.PAD_X, pady=Constants.PAD_Y)
+
+    def _create_label(self, master, text, row, column):
+        lbl = ttk.Label(master, text=text, font=Constants.LABEL_FONT, background=Constants.SECTION_BG)
+        lbl.grid(row=row, column=column, padx=(Constants.PAD_X, 0), pady=Constants.PAD_Y, sticky='w')
+        return lbl
+
+    def _create_entry(self, master, value):
+        entry = ctk.CTkEntry(
+            master,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR,
+            border_color=Constants.BORDER_COLOR,
+            text_color="black",
+            bg_color=Constants.SECTION_BG,
+            corner_radius=10
+        )
+        entry.insert(0, value)
+        return entry
+
+    def _create_button(self, master, text, command, enabled=False):
+        return ctk.CTkButton(
+            master, text=text,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.ACCENT_COLOR if enabled else Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            hover=False,
+            state='normal' if enabled else 'disabled',
+            command=command
+        )
+
+    def _set_result_buttons(self, enabled):
+        for button in (self.report_button, self.bands_button, self.viewer_button):
+            button.configure(state='normal' if enabled else 'disabled',
+                             fg_color=Constants.ACCENT_COLOR if enabled else Constants.FIELD_COLOR_DISABLED)
+
+    def _start(self):
+        if self.controller.running:
+            self.controller.cancel()
+            self.status_label.configure(text="Cancelling...")
+            return
+        try:
+            count = int(self.count_entry.get())
+            seed = int(self.seed_entry.get())
+            perturbation = Perturbation(**{name: float(entry.get())
+                                           for name, entry in self.perturbation_entries.items()})
+            perturbation.validate()
+        except ValueError as e:
+            messagebox.showerror("Scenarios", f"Invalid scenario settings: {e}", parent=self)
+            return
+
+        self.table.delete(*self.table.get_children())
+        self.progress_bar.set(0)
+        self._set_result_buttons(False)
+        self.start_button.configure(text="Cancel", fg_color=Constants.FIELD_COLOR_DISABLED)
+        self.status_label.configure(text=f"Running {count:,} scenarios...")
+        self.controller.start(self._run_scenarios, count, seed, perturbation)
+        self.after(Constants.UI_POLL_MS, self._poll_results)
+
+    def _run_scenarios(self, reporter, count, seed, perturbation):
+        """Worker thread: load the data file and simulate the scenarios in batches."""
+        reporter.stage("Loading data")
+        load_kw, price = profiles(load_timeseries(self.data_file), self.base_config)
+        reporter.stage("Simulating")
+        return simulate_scenarios(self.base_config, load_kw, price, scenarios=count, seed=seed,
+                                  perturbation=perturbation, progress=reporter.progress)
+
+    def _poll_results(self):
+        if self._closed:
+            return
+        for event in self.controller.drain():
+            if event.kind == "done":
+                self.result = event.payload
+                self._show_summary()
+                self._finish(f"{self.result.scenarios:,} scenarios finished")
+                self._set_result_buttons(True)
+                if self.pilot_viewer is not None and self.pilot_viewer.winfo_exists():
+                    self.pilot_viewer.show_scenarios(self.result)
+                return
+            if event.kind == "error":
+                self._finish(f"Scenarios failed: {event.payload}")
+                return
+            if event.kind == "cancelled":
+                self._finish("Scenarios cancelled")
+                return
+        self.progress_bar.set(self.controller.fraction)
+        self.status_label.configure(text=f"{self.controller.stage or 'Starting'}... {self.controller.fraction:.0%}")
+        self.after(Constants.UI_POLL_MS, self._poll_results)
+
+    def _show_summary(self):
+        summary = self.result.summary()
+        for name, heading in self.RESULT_COLUMNS:
+            if name in summary:
+                self.table.insert('', 'end', values=[heading] + [f"{value:,.2f}" for value in summary[name]])
+
+    def _finish(self, message):
+        self.progress_bar.set(1 if self.result is not None else 0)
+        self.status_label.configure(text=message)
+        self.start_button.configure(text="Start", fg_color=Constants.ACCENT_COLOR)
+
+    def _save_report(self):
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Save scenario report", defaultextension=".txt",
+            initialfile=f"{self.project_name or 'battery'}_scenario_report.txt", filetypes=[("Text files", "*.txt")]
+        )
+        if path:
+            self._write(write_scenario_report, path, self.project_name)
+
+    def _save_bands(self):
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Save scenario bands", defaultextension=".csv",
+            initialfile=f"{self.project_name or 'battery'}_bands.csv", filetypes=[("CSV files", "*.csv")]
+        )
+        if path:
+            self._write(write_bands, path)
+
+    def _write(self, writer, path, *args):
+        try:
+            writer(self.result, path, *args)
+        except OSError as e:
+            messagebox.showerror("Scenarios", f"Could not write {path}: {e}", parent=self)
+
+    def _open_pilot_viewer(self):
+        from .pilot import PilotViewer
+
+        if self.pilot_viewer is not None and self.pilot_viewer.winfo_exists():
+            self.pilot_viewer.lift()
+            return
+        self.pilot_viewer = PilotViewer(self, self.result.config, title="Pilot Viewer - Scenarios")
+        self.pilot_viewer.show_scenarios(self.result)
+
+    def _on_close(self):
+        self._closed = True
+        self.controller.cancel()
+        self.destroy()
@@ -0,0 +1,154 @@
+import json
+import os
+from tkinter import filedialog, messagebox
+
+from config.constants import Constants
+from engine.project import (
+    form_from_dict, form_to_dict, read_project, run_is_current, run_reference, save_project,
+)
+from engine.runner import RunController
+
+PROJECT_FILETYPES = [("Battery projects", "*.json"), ("All files", "*.*")]
+
+
+class ProjectSession:
+    """Open/Save for the input frames, plus a background autosave once edits go quiet.
+
+    The project file uses the ``engine.project`` layout and references the
+    stored run of the last result when it matches the saved inputs, so
+    reopening restores the outputs without re-simulating. Every write goes
+    through ``save_project`` (temporary file, then rename) on a worker thread,
+    so typing never waits on the disk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.path = None
+        self.saved = None
+        self._autosave_id = None
+        self._queued_save = None
+        self.save_controller = RunController()
+
+    @property
+    def action_frame(self):
+        return self.app.action_frame
+
+    def attach(self):
+        """Start watching the form for edits; call once the frames exist."""
+        self.action_frame.form_state.add_listener(lambda form, changed: self.schedule_autosave())
+        self.action_frame.bind("<<ResultChanged>>", lambda event: self.schedule_autosave(), add="+")
+
+    def collect(self):
+        """Return the project layout for the current form, with the last run when it matches the inputs."""
+        info = self.app.project_info_frame.get_values()
+        values = {
+            **self.app.operational_limits_frame.get_values(),
+            **self.app.dispatch_control_frame.get_values(),
+        }
+        store_path = self.action_frame.matching_result_path()
+        run = run_reference(store_path, info["data_file"]) if store_path else None
+        return form_to_dict(info["project_name"], info["data_file"], values, run)
+
+    def open(self):
+        path = filedialog.askopenfilename(title="Open project", filetypes=PROJECT_FILETYPES)
+        if not path:
+            return
+        try:
+            data = read_project(path)
+            project_name, data_file, values, run = form_from_dict(data, os.path.dirname(os.path.abspath(path)))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Open", f"Could not open {path}: {e}")
+            return
+
+        self._cancel_autosave()
+        self.app.project_info_frame.set_values(project_name, data_file)
+        self.app.operational_limits_frame.set_values(values)
+        self.app.dispatch_control_frame.set_values(values)
+        self.action_frame.form_state.flush()
+        self.action_frame.restore_result(run["path"] if run_is_current(run, data_file) else None)
+        self.path = path
+        self.saved = self._serialise(self.collect())
+        self._update_title()
+
+    def save(self, save_as=False, embed_run=False):
+        """Save now (asking for a path the first time or with ``save_as``)."""
+        self.action_frame.form_state.flush()
+        path = self.path
+        if save_as or embed_run or path is None:
+            name = self.app.project_info_frame.get_values()["project_name"] or "project"
+            path = filedialog.asksaveasfilename(title="Save project", defaultextension=".json",
+                                                initialfile=f"{name}.json", filetypes=PROJECT_FILETYPES)
+            if not path:
+                return
+        self.path = path
+        self._cancel_autosave()
+        self._write(embed_run, force=True)
+        self._update_title()
+
+    def schedule_autosave(self):
+        """Restart the quiet-period timer; only projects that have a file are autosaved."""
+        if self.path is None:
+            return
+        self._cancel_autosave()
+        self._autosave_id = self.app.after(Constants.AUTOSAVE_IDLE_MS, self._autosave)
+
+    def _autosave(self):
+        self._autosave_id = None
+        if self.save_controller.running:
+            self.schedule_autosave()
+            return
+        self._write()
+
+    def _write(self, embed_run=False, force=False):
+        """Hand the current layout to the save worker unless it is unchanged since the last save.
+
+        While the worker is busy an autosave is put off; an explicit save is
+        queued instead and written as soon as the current one finishes.
+        """
+        if self.save_controller.running:
+            if force:
+                self._queued_save = embed_run or bool(self._queued_save)
+            else:
+                self.schedule_autosave()
+            return
+        data = self.collect()
+        serialised = self._serialise(data)
+        if serialised == self.saved and not force:
+            return
+        self.saved = serialised
+        path = self.path
+        self.save_controller.start(lambda reporter: save_project(data, path, embed_run))
+        self.app.after(Constants.UI_POLL_MS, self._poll_save)
+
+    def _poll_save(self):
+        for event in self.save_controller.drain():
+            if event.kind == "error":
+                self.saved = None
+                messagebox.showerror("Save", f"Could not save {self.path}: {event.payload}")
+                self._write_queued()
+                return
+            if event.kind == "done":
+                self._write_queued()
+                return
+        self.app.after(Constants.UI_POLL_MS, self._poll_save)
+
+    def _write_queued(self):
+        """Write the explicit save that came in while the last one was still writing, if any."""
+        if self._queued_save is not None:
+            embed_run, self._queued_save = self._queued_save, None
+            self._write(embed_run, force=True)
+
+    def _cancel_autosave(self):
+        if self._autosave_id is not None:
+            self.app.after_cancel(self._autosave_id)
+            self._autosave_id = None
+
+    def _update_title(self):
+        title = "Battery System Modeler"
+        if self.path:
+            title += f" - {os.path.basename(self.path)}"
+        self.app.title(title)
+
+    @staticmethod
+    def _serialise(data):
+        return json.dumps(data, sort_keys=True)
@@ -0,0 +1,245 @@
+from contextlib import closing
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+import customtkinter as ctk
+
+from config.constants import Constants
+from engine.dispatch import time_options
+from engine.runner import RunController
+from engine.sweep import build_grid, iter_sweep, write_summary
+from engine.timeseries import load_timeseries, profiles
+
+
+class SweepDialog(tk.Toplevel):
+    """Parameter sweep over the operational limits and steer settings of a base configuration.
+
+    Every combination runs on the load and price profiles of ``data_file``, as
+    Run does, so a row matches the Run of the same settings.
+    """
+
+    RESULT_COLUMNS = (
+        ("run", "Run"),
+        ("min_soc", "Min SoC"),
+        ("max_soc", "Max SoC"),
+        ("soc_target", "SoC Target"),
+        ("power_setpoint", "Power"),
+        ("start_time", "Start"),
+        ("end_time", "End"),
+        ("final_soc", "Final SoC"),
+        ("equivalent_cycles", "Cycles"),
+        ("hours_at_min_soc", "Hours at Min"),
+    )
+    WINDOW_STEPS = ("15", "30", "60", "120", "240")
+
+    def __init__(self, master, base_config, data_file=""):
+        super().__init__(master)
+        self.title("Parameter Sweep")
+        self.geometry("900x520")
+        self.configure(bg=Constants.SECTION_BG)
+        self.base_config = base_config
+        self.data_file = data_file
+        self.controller = RunController()
+        self.rows = []
+        self.total = 0
+        self.summary_path = None
+        self._closed = False
+        self._create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _create_widgets(self):
+        form = ttk.Frame(self, style='Custom.TFrame', padding=10)
+        form.pack(fill='x')
+        config = self.base_config
+
+        self.value_entries = {}
+        numeric_fields = [
+            ("min_soc", "Min SoC values:", config.min_soc),
+            ("max_soc", "Max SoC values:", config.max_soc),
+            ("soc_target", "SoC Target values:", config.soc_target),
+            ("power_setpoint", "Power Setpoint values:", config.power_setpoint),
+        ]
+        for row, (name, label_text, value) in enumerate(numeric_fields):
+            self._create_label(form, label_text, row, 0)
+            entry = self._create_entry(form, f"{value:g}")
+            entry.grid(row=row, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+            self.value_entries[name] = entry
+
+        self.time_dropdowns = {}
+        time_fields = [
+            ("start_from", "Start Time from:", "12:00 AM", "11:45 PM", config.start_time),
+            ("start_to", "Start Time to:", "12:00 AM", "11:45 PM", config.start_time),
+            ("end_from", "End Time from:", "12:15 AM", "11:59 PM", config.end_time),
+            ("end_to", "End Time to:", "12:15 AM", "11:59 PM", config.end_time),
+        ]
+        for row, (name, label_text, first, last, value) in enumerate(time_fields):
+            self._create_label(form, label_text, row, 2)
+            dropdown = self._create_dropdown(form, time_options(first, last), value)
+            dropdown.grid(row=row, column=3, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+            self.time_dropdowns[name] = dropdown
+
+        self._create_label(form, "Window step (min):", len(time_fields), 2)
+        self.window_step_dropdown = self._create_dropdown(form, self.WINDOW_STEPS, "60")
+        self.window_step_dropdown.grid(row=len(time_fields), column=3, padx=Constants.PAD_X,
+                                       pady=Constants.PAD_Y, sticky='ew')
+
+        form.columnconfigure(1, weight=1)
+        form.columnconfigure(3, weight=1)
+
+        self.start_button = ctk.CTkButton(
+            form, text="Start Sweep",
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.ACCENT_COLOR,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            hover=False,
+            command=self._start
+        )
+        self.start_button.grid(row=len(time_fields), column=0, columnspan=2, padx=Constants.PAD_X,
+                               pady=Constants.PAD_Y, sticky='ew')
+
+        self.status_label = ttk.Label(self, text="Enter comma-separated values to sweep.",
+                                      font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+                                      background=Constants.SECTION_BG)
+        self.status_label.pack(fill='x', padx=Constants.PAD_X)
+
+        self.progress_bar = ctk.CTkProgressBar(self, mode='determinate', progress_color=Constants.ACCENT_COLOR)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill='x', padx=Constants.PAD_X, pady=Constants.PAD_Y)
+
+        self.table = ttk.Treeview(self, columns=[name for name, _ in self.RESULT_COLUMNS], show='headings')
+        for name, heading in self.RESULT_COLUMNS:
+            self.table.heading(name, text=heading)
+            self.table.column(name, width=80, anchor='center')
+        self.table.pack(fill='both', expand=True, padx=Constants.PAD_X, pady=Constants.PAD_Y)
+
+    def _create_label(self, master, text, row, column):
+        lbl = ttk.Label(master, text=text, font=Constants.LABEL_FONT, background=Constants.SECTION_BG)
+        lbl.grid(row=row, column=column, padx=(Constants.PAD_X, 0), pady=Constants.PAD_Y, sticky='w')
+        return lbl
+
+    def _create_entry(self, master, value):
+        entry = ctk.CTkEntry(
+            master,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR,
+            border_color=Constants.BORDER_COLOR,
+            text_color="black",
+            bg_color=Constants.SECTION_BG,
+            corner_radius=10
+        )
+        entry.insert(0, value)
+        return entry
+
+    def _create_dropdown(self, master, values, value):
+        dropdown = ctk.CTkComboBox(
+            master,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR,
+            border_color=Constants.BORDER_COLOR,
+            text_color="black",
+            bg_color=Constants.SECTION_BG,
+            corner_radius=10,
+            state="readonly",
+            values=list(values),
+            button_color=Constants.FIELD_COLOR_DISABLED
+        )
+        dropdown.set(value)
+        return dropdown
+
+    def _collect_grid(self):
+        """Parse the form into the sweep grid."""
+        values = {}
+        for name, entry in self.value_entries.items():
+            values[name] = [float(part) for part in entry.get().split(",") if part.strip()]
+        step = int(self.window_step_dropdown.get())
+        values["start_time"] = time_options(self.time_dropdowns["start_from"].get(),
+                                            self.time_dropdowns["start_to"].get(), step)
+        values["end_time"] = time_options(self.time_dropdowns["end_from"].get(),
+                                          self.time_dropdowns["end_to"].get(), step)
+        if not self.base_config.steer_enabled:
+            values = {"min_soc": values["min_soc"], "max_soc": values["max_soc"]}
+        return build_grid(self.base_config, **values)
+
+    def _start(self):
+        if self.controller.running:
+            self.controller.cancel()
+            self.status_label.configure(text="Cancelling...")
+            return
+        try:
+            configs = self._collect_grid()
+        except ValueError as e:
+            messagebox.showerror("Sweep", f"Invalid sweep values: {e}", parent=self)
+            return
+        if not configs:
+            messagebox.showerror("Sweep", "No valid combinations to run.", parent=self)
+            return
+
+        self.summary_path = filedialog.asksaveasfilename(
+            parent=self, title="Save sweep summary", defaultextension=".csv",
+            initialfile="sweep_summary.csv", filetypes=[("CSV files", "*.csv")]
+        )
+        if not self.summary_path:
+            return
+
+        self.rows = []
+        self.total = len(configs)
+        self.table.delete(*self.table.get_children())
+        self.progress_bar.set(0)
+        self.start_button.configure(text="Cancel", fg_color=Constants.FIELD_COLOR_DISABLED)
+        self.status_label.configure(text=f"Running {self.total} combinations...")
+        self.controller.start(self._run_sweep, configs)
+        self.after(Constants.UI_POLL_MS, self._poll_results)
+
+    def _run_sweep(self, reporter, configs):
+        """Worker thread: load the profiles, then forward finished runs to the UI through the reporter."""
+        load_kw = price = None
+        if self.data_file:
+            reporter.stage("Loading data")
+            load_kw, price = profiles(load_timeseries(self.data_file), self.base_config)
+        reporter.check()
+        with closing(iter_sweep(configs, load_kw, price)) as rows:
+            for row in rows:
+                reporter.post("row", row)
+
+    def _poll_results(self):
+        """Move finished runs from the controller queue into the table."""
+        if self._closed:
+            return
+        for event in self.controller.drain():
+            if event.kind == "row":
+                self._add_row(*event.payload)
+            elif event.kind == "error":
+                self._finish(f"Sweep failed: {event.payload}")
+                return
+            elif event.kind in ("done", "cancelled"):
+                self._finish("Sweep cancelled" if event.kind == "cancelled" else "Sweep finished")
+                return
+        self.after(Constants.UI_POLL_MS, self._poll_results)
+
+    def _add_row(self, index, config, summary):
+        self.rows.append((index, config, summary))
+        values = {"run": index, **config.to_dict(), **summary}
+        display = [f"{values[name]:.2f}" if isinstance(values[name], float) else values[name]
+                   for name, _ in self.RESULT_COLUMNS]
+        self.table.insert('', 'end', values=display)
+        self.progress_bar.set(len(self.rows) / self.total)
+        self.status_label.configure(text=f"{len(self.rows)}/{self.total} combinations finished")
+
+    def _finish(self, message):
+        """Write the summary of every finished combination, even after a cancel or failure."""
+        self.start_button.configure(text="Start Sweep", fg_color=Constants.ACCENT_COLOR)
+        status = f"{message}: {len(self.rows)}/{self.total} combinations."
+        if self.rows:
+            try:
+                write_summary(self.rows, self.summary_path)
+                status += f" Summary written to {self.summary_path}"
+            except OSError as e:
+                status += f" Could not write the summary: {e}"
+        self.status_label.configure(text=status)
+
+    def _on_close(self):
+        self._closed = True
+        self.controller.cancel()
+        self.destroy()
@@ -0,0 +1,171 @@
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+import customtkinter as ctk
+
+from config.constants import Constants
+from engine.runner import RunController
+from engine.timeseries import load_timeseries, profiles
+from engine.tuning import OBJECTIVES, Tuner
+
+
+class TuningDialog(tk.Toplevel):
+    """Search the steer settings for the best objective and write the winner back into the form."""
+
+    SUMMARY_FIELDS = (
+        ("revenue", "Revenue"),
+        ("equivalent_cycles", "Equivalent cycles"),
+        ("hours_at_min_soc", "Hours at Min SoC"),
+        ("hours_at_max_soc", "Hours at Max SoC"),
+        ("final_soc", "Final SoC (%)"),
+    )
+
+    def __init__(self, master, base_config, data_file, apply):
+        super().__init__(master)
+        self.title("Tune Dispatch")
+        self.geometry("520x420")
+        self.configure(bg=Constants.SECTION_BG)
+        self.base_config = base_config
+        self.data_file = data_file
+        self.apply = apply
+        self.controller = RunController()
+        self.tuner = None
+        self.result = None
+        self._closed = False
+        self._create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _create_widgets(self):
+        form = ttk.Frame(self, style='Custom.TFrame', padding=10)
+        form.pack(fill='x')
+
+        lbl = ttk.Label(form, text="Objective:", font=Constants.LABEL_FONT, background=Constants.SECTION_BG)
+        lbl.grid(row=0, column=0, padx=(Constants.PAD_X, 0), pady=Constants.PAD_Y, sticky='w')
+        self.objective_labels = {label: name for name, label in OBJECTIVES.items()}
+        self.objective_dropdown = ctk.CTkComboBox(
+            form,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.FIELD_COLOR,
+            border_color=Constants.BORDER_COLOR,
+            text_color="black",
+            bg_color=Constants.SECTION_BG,
+            corner_radius=10,
+            state="readonly",
+            values=list(self.objective_labels),
+            button_color=Constants.FIELD_COLOR_DISABLED
+        )
+        self.objective_dropdown.set(OBJECTIVES["revenue"])
+        self.objective_dropdown.grid(row=0, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        form.columnconfigure(1, weight=1)
+
+        self.start_button = self._create_button(form, "Start", self._start, enabled=True)
+        self.start_button.grid(row=1, column=0, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+        self.apply_button = self._create_button(form, "Apply to Form", self._apply)
+        self.apply_button.grid(row=1, column=1, padx=Constants.PAD_X, pady=Constants.PAD_Y, sticky='ew')
+
+        self.status_label = ttk.Label(self, text="Searches SoC Target, Power Setpoint and the steer window.",
+                                      font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+                                      background=Constants.SECTION_BG)
+        self.status_label.pack(fill='x', padx=Constants.PAD_X)
+
+        self.progress_bar = ctk.CTkProgressBar(self, mode='determinate', progress_color=Constants.ACCENT_COLOR)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill='x', padx=Constants.PAD_X, pady=Constants.PAD_Y)
+
+        self.table = ttk.Treeview(self, columns=("setting", "value"), show='headings')
+        self.table.heading("setting", text="Best settings")
+        self.table.heading("value", text="")
+        self.table.column("setting", width=200, anchor='w')
+        self.table.column("value", width=200, anchor='center')
+        self.table.pack(fill='both', expand=True, padx=Constants.PAD_X, pady=Constants.PAD_Y)
+
+    def _create_button(self, master, text, command, enabled=False):
+        return ctk.CTkButton(
+            master, text=text,
+            font=(Constants.FONT_NAME, Constants.BASE_FONT_SIZE),
+            fg_color=Constants.ACCENT_COLOR if enabled else Constants.FIELD_COLOR_DISABLED,
+            text_color=Constants.TEXT_COLOR,
+            bg_color=Constants.SECTION_BG,
+            corner_radius=7,
+            hover=False,
+            state='normal' if enabled else 'disabled',
+            command=command
+        )
+
+    def _start(self):
+        if self.controller.running:
+            self.controller.cancel()
+            self.status_label.configure(text="Cancelling...")
+            return
+        self.result = None
+        self.table.delete(*self.table.get_children())
+        self.progress_bar.set(0)
+        self.apply_button.configure(state='disabled', fg_color=Constants.FIELD_COLOR_DISABLED)
+        self.start_button.configure(text="Cancel", fg_color=Constants.FIELD_COLOR_DISABLED)
+        objective = self.objective_labels[self.objective_dropdown.get()]
+        self.controller.start(self._run_search, objective)
+        self.after(Constants.UI_POLL_MS, self._poll_results)
+
+    def _run_search(self, reporter, objective):
+        """Worker thread: load the profiles once, then search; the tuner keeps its runs for the next objective."""
+        if self.tuner is None:
+            load_kw = price = None
+            if self.data_file:
+                reporter.stage("Loading data")
+                load_kw, price = profiles(load_timeseries(self.data_file), self.base_config)
+            self.tuner = Tuner(self.base_config, load_kw, price)
+        reporter.stage("Searching")
+        return self.tuner.tune(objective, progress=reporter.progress)
+
+    def _poll_results(self):
+        if self._closed:
+            return
+        for event in self.controller.drain():
+            if event.kind == "done":
+                self.result = event.payload
+                self._show_result()
+                self._finish(f"Best of {self.result.evaluated:,} runs "
+                             f"({self.result.cached:,} more served from the cache)")
+                self.apply_button.configure(state='normal', fg_color=Constants.ACCENT_COLOR)
+                return
+            if event.kind == "error":
+                self._finish(f"Search failed: {event.payload}")
+                return
+            if event.kind == "cancelled":
+                self._finish("Search cancelled")
+                return
+        self.progress_bar.set(self.controller.fraction)
+        self.status_label.configure(text=f"{self.controller.stage or 'Starting'}... {self.controller.fraction:.0%}")
+        self.after(Constants.UI_POLL_MS, self._poll_results)
+
+    def _show_result(self):
+        config = self.result.config
+        rows = [
+            ("Start Time", config.start_time),
+            ("End Time", config.end_time),
+            ("SoC Target", f"{config.soc_target:g} %"),
+            ("Power Setpoint", f"{config.power_setpoint:g} kW"),
+        ]
+        rows += [(label, f"{self.result.summary[name]:,.2f}")
+                 for name, label in self.SUMMARY_FIELDS if name in self.result.summary]
+        for row in rows:
+            self.table.insert('', 'end', values=row)
+
+    def _finish(self, message):
+        self.progress_bar.set(1 if self.result is not None else 0)
+        self.status_label.configure(text=message)
+        self.start_button.configure(text="Start", fg_color=Constants.ACCENT_COLOR)
+
+    def _apply(self):
+        if self.result is None:
+            return
+        if self.base_config.schedule is not None and not messagebox.askyesno(
+                "Tune Dispatch", "The tuned single window replaces the calendar schedule. Apply?", parent=self):
+            return
+        self.apply(self.result.form_values())
+        self.status_label.configure(text="Settings written to the Dispatch Control form.")
+
+    def _on_close(self):
+        self._closed = True
+        self.controller.cancel()
+        self.destroy()
@@ -0,0 +1,175 @@
+from collections import OrderedDict
+import math
+import tkinter as tk
+
+from .assets import shared_assets
+from config.constants import Constants
+
+ZOOM_STEP = 1.25
+
+
+def pyramid_sizes(size, tile_size=Constants.VIEWER_TILE_SIZE):
+    """Return the size of each pyramid level, halving from ``size`` until one tile holds the whole image."""
+    width, height = size
+    sizes = [(width, height)]
+    while width > tile_size or height > tile_size:
+        width, height = max(1, width // 2), max(1, height // 2)
+        sizes.append((width, height))
+    return sizes
+
+
+class DiagramViewer(tk.Toplevel):
+    """Pan-and-zoom viewer for a large image, drawn from a tile pyramid on a canvas.
+
+    Each pyramid level is a half-size copy of the one below, built once on the
+    asset thread. A render picks the level just above the current zoom, works
+    out which tiles intersect the canvas and only turns those into Tk images,
+    so the cost of a frame depends on the window size rather than the image
+    size. Drag to pan, scroll (or +/-) to zoom, 0 to fit.
+    """
+
+    def __init__(self, master, path, title="Full Image"):
+        super().__init__(master)
+        self.title(title)
+        self.geometry(Constants.VIEWER_SIZE)
+        self.resizable(True, True)
+        self.path = path
+        self.assets = shared_assets(self)
+        self.levels = None
+        self.scale = None
+        self.origin = (0.0, 0.0)
+        self.items = {}
+        self.tiles = OrderedDict()
+        self._render_id = None
+        self._drag = None
+
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True, padx=10, pady=10)
+        self.canvas.create_text(10, 10, text="Loading...", anchor="nw", tags="status")
+
+        self.canvas.bind("<Configure>", lambda event: self._schedule_render(Constants.VIEWER_RESIZE_MS))
+        self.canvas.bind("<ButtonPress-1>", self._start_drag)
+        self.canvas.bind("<B1-Motion>", self._drag_to)
+        self.canvas.bind("<MouseWheel>", lambda event: self._zoom(ZOOM_STEP if event.delta > 0 else 1 / ZOOM_STEP, event.x, event.y))
+        self.canvas.bind("<Button-4>", lambda event: self._zoom(ZOOM_STEP, event.x, event.y))
+        self.canvas.bind("<Button-5>", lambda event: self._zoom(1 / ZOOM_STEP, event.x, event.y))
+        self.bind("<plus>", lambda event: self._zoom(ZOOM_STEP))
+        self.bind("<equal>", lambda event: self._zoom(ZOOM_STEP))
+        self.bind("<minus>", lambda event: self._zoom(1 / ZOOM_STEP))
+        self.bind("<Key-0>", lambda event: self.fit())
+
+        self.assets.when_ready(path, None, self._on_image_ready)
+
+    def _on_image_ready(self):
+        try:
+            size = self.assets.image(self.path).size
+        except Exception as e:
+            self.canvas.itemconfigure("status", text=f"Error opening image: {e}")
+            return
+        self.levels = pyramid_sizes(size)
+        for level_size in self.levels[1:]:
+            self.assets.preload(self.path, level_size)
+        self.canvas.delete("status")
+        self.fit()
+
+    def fit(self):
+        """Zoom so the whole image fits the canvas, centred."""
+        if not self.levels:
+            return
+        width, height = self.levels[0]
+        canvas_width, canvas_height = self._canvas_size()
+        self.scale = min(canvas_width / width, canvas_height / height)
+        self.origin = ((canvas_width - width * self.scale) / 2, (canvas_height - height * self.scale) / 2)
+        self._schedule_render()
+
+    def _canvas_size(self):
+        return max(1, self.canvas.winfo_width()), max(1, self.canvas.winfo_height())
+
+    def _start_drag(self, event):
+        self._drag = (event.x, event.y)
+
+    def _drag_to(self, event):
+        if self._drag is None or self.scale is None:
+            return
+        dx, dy = event.x - self._drag[0], event.y - self._drag[1]
+        self._drag = (event.x, event.y)
+        self.origin = (self.origin[0] + dx, self.origin[1] + dy)
+        self.canvas.move("tile", dx, dy)
+        self._schedule_render()
+
+    def _zoom(self, factor, x=None, y=None):
+        if self.scale is None:
+            return
+        canvas_width, canvas_height = self._canvas_size()
+        x = canvas_width / 2 if x is None else x
+        y = canvas_height / 2 if y is None else y
+        width, height = self.levels[0]
+        fit = min(canvas_width / width, canvas_height / height)
+        scale = min(max(self.scale * factor, fit / 4), Constants.VIEWER_MAX_ZOOM)
+        factor = scale / self.scale
+        self.scale = scale
+        self.origin = (x - (x - self.origin[0]) * factor, y - (y - self.origin[1]) * factor)
+        self._schedule_render()
+
+    def _schedule_render(self, delay=0):
+        """Coalesce renders; resizes pass a delay so dragging the window edge renders once it settles."""
+        if self._render_id is not None:
+            self.after_cancel(self._render_id)
+        if delay:
+            self._render_id = self.after(delay, self._render)
+        else:
+            self._render_id = self.after_idle(self._render)
+
+    def _render(self):
+        self._render_id = None
+        if self.scale is None:
+            return
+        level = min(max(0, int(math.floor(math.log2(1 / self.scale)))), len(self.levels) - 1)
+        level_size = self.levels[level]
+        future = self.assets.preload(self.path, None if level == 0 else level_size)
+        if not future.done():
+            self.assets.when_ready(self.path, None if level == 0 else level_size, self._schedule_render)
+            return
+        image = future.result()
+        zoom = self.scale * 2 ** level
+        tile = Constants.VIEWER_TILE_SIZE
+        span = tile * zoom
+        ox, oy = self.origin
+        canvas_width, canvas_height = self._canvas_size()
+        columns = range(max(0, int((-ox) // span)), min(math.ceil(level_size[0] / tile), int((canvas_width - ox) // span) + 1))
+        rows = range(max(0, int((-oy) // span)), min(math.ceil(level_size[1] / tile), int((canvas_height - oy) // span) + 1))
+
+        zoom_key = round(zoom, 4)
+        visible = set()
+        for row in rows:
+            for column in columns:
+                key = (level, column, row, zoom_key)
+                visible.add(key)
+                if key not in self.items:
+                    self.items[key] = self.canvas.create_image(
+                        round(ox + column * span), round(oy + row * span), anchor="nw",
+                        image=self._tile(image, key), tags="tile",
+                    )
+        for key in set(self.items) - visible:
+            self.canvas.delete(self.items.pop(key))
+
+    def _tile(self, image, key):
+        """Return the Tk image for one tile, cropping and scaling it on first use."""
+        photo = self.tiles.get(key)
+        if photo is None:
+            from PIL import Image, ImageTk
+
+            level, column, row, zoom = key
+            tile = Constants.VIEWER_TILE_SIZE
+            box = (column * tile, row * tile, min((column + 1) * tile, image.width), min((row + 1) * tile, image.height))
+            crop = image.crop(box)
+            size = (max(1, math.ceil(crop.width * zoom)), max(1, math.ceil(crop.height * zoom)))
+            if size != crop.size:
+                crop = crop.resize(size, Image.BILINEAR)
+            photo = self.tiles[key] = ImageTk.PhotoImage(crop, master=self)
+        self.tiles.move_to_end(key)
+        while len(self.tiles) > Constants.VIEWER_TILE_CACHE:
+            evicted, _ = self.tiles.popitem(last=False)
+            if evicted in self.items:
+                self.canvas.delete(self.items.pop(evicted))
+        return photo